@@ -4,16 +4,202 @@ A Streamlit application for comprehensive exploratory data analysis
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-
-import plotly.express as px
-import plotly.graph_objects as go
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from io import BytesIO
+import bz2
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import json
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
 import warnings
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module that is imported on first attribute access
+    
+    Loading replaces the stand-in with the real module in this module's
+    globals, so later lookups are ordinary global lookups.
+    """
+    
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+    
+    def _load(self):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+    
+    def __repr__(self):
+        return f"<lazy module '{self._name}'>"
+
+
+def _optional_module(name, alias):
+    """Lazy stand-in for an optional dependency, or None when it is not installed"""
+    return _LazyModule(name, alias) if importlib.util.find_spec(name) is not None else None
+
+
+# Heavy modules are imported at first use, so the landing page renders without them
+pd = _LazyModule('pandas', 'pd')
+np = _LazyModule('numpy', 'np')
+pa = _LazyModule('pyarrow', 'pa')
+pc = _LazyModule('pyarrow.compute', 'pc')
+pq = _LazyModule('pyarrow.parquet', 'pq')
+px = _LazyModule('plotly.express', 'px')
+go = _LazyModule('plotly.graph_objects', 'go')
+plotly_subplots = _LazyModule('plotly.subplots', 'plotly_subplots')
+pl = _optional_module('polars', 'pl')  # Optional compute backend
+duckdb = _optional_module('duckdb', 'duckdb')  # Optional out-of-core engine
+zstandard = _optional_module('zstandard', 'zstandard')  # Optional zstd decompression
+
 warnings.filterwarnings('ignore')
 
+# Startup: import the parsing and plotting stacks in the background (EDA_PREWARM=1)
+PREWARM_IMPORTS = os.environ.get('EDA_PREWARM', '').lower() in ('1', 'true', 'yes')
+PREWARM_THREAD_NAME = 'eda-prewarm'
+
+# Profile artifact settings
+PROFILE_ARTIFACT_VERSION = 9
+PROFILE_ARTIFACT_EXTENSION = 'dpz'
+PROFILE_BACKEND = os.environ.get('EDA_PROFILE_BACKEND', 'pandas')
+PROFILE_CACHE_DIR = os.environ.get(
+    'EDA_PROFILE_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'data_profiling')
+)
+# Least recently used artifacts are evicted beyond this size (0 for no limit)
+PROFILE_CACHE_MAX_MB = float(os.environ.get('EDA_PROFILE_CACHE_MB', 1024))
+HISTOGRAM_BINS = 30
+TOP_CATEGORIES = 20
+PREVIEW_ROWS = 100
+
+# Compressed uploads: file extension -> codec
+DATA_FILE_TYPES = ('csv', 'xlsx', 'xls', 'parquet')
+COMPRESSION_CODECS = {'gz': 'gzip', 'bz2': 'bz2', 'xz': 'xz', 'zst': 'zstd', 'zip': 'zip'}
+
+# Mergeable sketch settings (drift comparison)
+SKETCH_CHUNK_ROWS = 200_000
+QUANTILE_SKETCH_SIZE = 200
+HLL_PRECISION = 12
+TOP_K_CAPACITY = 100
+CORRELATION_DRIFT_THRESHOLD = 0.2
+
+# Partitioned (multi-file) datasets
+PARTITION_FILE_TYPES = DATA_FILE_TYPES
+PARTITION_WORKERS = int(os.environ.get('EDA_PARTITION_WORKERS', min(8, os.cpu_count() or 1)))
+PARTITION_ROW_DEVIATION = 0.5
+
+# Memory admission control: budgets for the working memory of a loaded dataset
+SESSION_MEMORY_BUDGET_MB = float(os.environ.get('EDA_SESSION_MEMORY_MB', 2048))  # 0 disables the limit
+GLOBAL_MEMORY_BUDGET_MB = os.environ.get('EDA_GLOBAL_MEMORY_MB')  # unset: half of the physical memory
+MEMORY_SAMPLE_BYTES = 4 * 1024 * 1024
+MEMORY_SAMPLE_ROWS = 10_000
+MEMORY_LOAD_OVERHEAD = 2.0  # parsing buffers and profiling copies, relative to the loaded frame
+MEMORY_CATEGORY_RATIO = 0.5
+MEMORY_MIN_SAMPLE_ROWS = 10_000
+MEMORY_LEDGER_TTL_SECONDS = 3600
+LOAD_STRATEGY_LABELS = {
+    'full': "Full in-memory load",
+    'optimized': "Dtype-optimized load",
+    'streaming': "Out-of-core streaming profile",
+    'sampled': "Sampled profile"
+}
+
+# Large table rendering
+TABLE_PAGE_SIZE = 100
+TABLE_COLUMN_PAGE_SIZE = 50
+BROWSER_CACHED_VIEWS = 8
+
+# Missingness analysis
+NULLITY_HEATMAP_BINS = 100
+NULL_BITMAP_BLOCK_WORDS = 8192
+
+# Datetime detection and time-series profiling
+DATETIME_SAMPLE_ROWS = 1000
+DATETIME_MIN_PARSE_RATIO = 0.95
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y/%m/%d',
+    '%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M',
+    '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%d.%m.%Y', '%d %b %Y', '%b %d %Y', '%d %B %Y', '%B %d %Y'
+]
+TIME_SERIES_MAX_POINTS = 500
+TIME_SERIES_RULES = {
+    's': ('Second', 1), 'min': ('Minute', 60), 'h': ('Hour', 3600), 'D': ('Day', 86400),
+    'W': ('Week', 604800), 'MS': ('Month', 2629746), 'QS': ('Quarter', 7889238), 'YS': ('Year', 31556952)
+}
+
+# Text profiling
+TEXT_PATTERN_LENGTH = 30
+TOP_TEXT_PATTERNS = 10
+TEXT_SEMANTIC_RATIO = 0.9
+TEXT_SEMANTIC_REGEXES = {
+    'Email': r'^[^@\s]+@[^@\s]+\.[^@\s]+$',
+    'URL': r'^(?:(?:https?|ftp)://|www\.)\S+$',
+    'Numeric': r'^\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*$'
+}
+
+# Numerical-categorical association ranking
+ASSOCIATION_MAX_CATEGORIES = 100
+ASSOCIATION_CHUNK_ROWS = 65_536
+ASSOCIATION_TOP_PAIRS = 20
+
+# Categorical-categorical association matrix
+CATEGORICAL_ASSOCIATION_MAX_CATEGORIES = 50
+CATEGORICAL_ASSOCIATION_SAMPLE_ROWS = 1_000_000
+STRONG_ASSOCIATION_THRESHOLD = 0.5
+
+# Dataset-wide outlier scan
+OUTLIER_Z_THRESHOLD = 3.0
+OUTLIER_MAD_THRESHOLD = 3.5
+OUTLIER_SCAN_CHUNK_ROWS = 65_536
+OUTLIER_TOP_ROWS = 100
+
+# Numerical pair density explorer
+DENSITY_GRID_BINS = 100
+DENSITY_MAX_POINTS = 5_000
+DENSITY_CHUNK_ROWS = 1 << 20
+
+# Out-of-core profiling with DuckDB
+DUCKDB_WORK_DIR = os.environ.get('EDA_DUCKDB_WORK_DIR', os.path.join(tempfile.gettempdir(), 'eda_duckdb'))
+DUCKDB_MEMORY_LIMIT = os.environ.get('EDA_DUCKDB_MEMORY_LIMIT')
+DUCKDB_FILE_TYPES = {'csv': 'CSV', 'parquet': 'Parquet'}
+DUCKDB_CSV_CODECS = ('gzip', 'zstd')
+# Staged uploads no live session uses are deleted; sessions idle this long count as ended
+DUCKDB_STAGED_TTL_SECONDS = 3600
+DUCKDB_NUMERIC_TYPES = {
+    'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT', 'UINTEGER',
+    'UBIGINT', 'UHUGEINT', 'FLOAT', 'DOUBLE', 'BOOLEAN'
+}
+# date_trunc units matching the pandas offset aliases of TIME_SERIES_RULES
+DUCKDB_TRUNC_UNITS = {
+    's': 'second', 'min': 'minute', 'h': 'hour', 'D': 'day',
+    'W': 'week', 'MS': 'month', 'QS': 'quarter', 'YS': 'year'
+}
+
+# Replayable cleaning pipelines
+CLEANING_PIPELINE_VERSION = 1
+
 # Page configuration
 st.set_page_config(
     page_title="Universal Data Profiling & EDA",
@@ -192,50 +378,578 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def load_data(uploaded_file):
+def split_file_name(name):
     """
-    Load data from uploaded file (CSV or Excel)
+    Split a file name into its data format and compression codec
+    
+    `sales.csv.gz` is a gzip-compressed CSV; a bare `export.zip` or
+    `export.gz` is assumed to hold CSV data.
+    
+    Args:
+        name: file name or path
+        
+    Returns:
+        tuple: (data format extension, codec name or None)
+    """
+    parts = os.path.basename(name).lower().split('.')
+    codec = COMPRESSION_CODECS.get(parts[-1]) if len(parts) > 1 else None
+    if codec is None:
+        return parts[-1], None
+    return (parts[-2] if len(parts) > 2 else 'csv'), codec
+
+
+class LocalFile:
+    """
+    Minimal stand-in for a Streamlit UploadedFile backed by a path
+    
+    Lets command-line tools and the profiling service feed server-side files
+    to the same loaders as browser uploads.
+    """
+    
+    def __init__(self, path, name=None):
+        self.name = name or os.path.basename(path)
+        self.size = os.path.getsize(path)
+        self._file = open(path, 'rb')
+    
+    def __getattr__(self, attr):
+        return getattr(self._file, attr)
+    
+    def __iter__(self):
+        return iter(self._file)
+    
+    def close(self):
+        self._file.close()
+
+
+def _zip_csv_members(archive):
+    """CSV members of a zip archive, skipping folders and macOS metadata"""
+    return [info for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+            and info.filename.lower().endswith('.csv')]
+
+
+def iter_decompressed_streams(uploaded_file, codec):
+    """
+    Open the decompressed CSV streams of a compressed file
+    
+    Every stream decompresses as it is read, so the chunked CSV parser never
+    needs the inflated file in memory. Zip archives yield one stream per CSV
+    member, in archive order.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object (or binary file)
+        codec: one of COMPRESSION_CODECS values
+        
+    Yields:
+        binary file-like object
+    """
+    if codec == 'gzip':
+        yield gzip.GzipFile(fileobj=uploaded_file, mode='rb')
+    elif codec == 'bz2':
+        yield bz2.BZ2File(uploaded_file, mode='rb')
+    elif codec == 'xz':
+        yield lzma.LZMAFile(uploaded_file, mode='rb')
+    elif codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("Reading .zst files requires the zstandard package (pip install zstandard)")
+        yield zstandard.ZstdDecompressor().stream_reader(uploaded_file)
+    elif codec == 'zip':
+        with zipfile.ZipFile(uploaded_file) as archive:
+            members = _zip_csv_members(archive)
+            if not members:
+                raise ValueError("The zip archive contains no CSV files.")
+            for member in members:
+                with archive.open(member) as stream:
+                    yield stream
+    else:
+        raise ValueError(f"Unsupported compression: {codec}")
+
+
+def load_data(uploaded_file, categories=None):
+    """
+    Load data from uploaded file (CSV, Excel or Parquet, CSV optionally compressed)
     
     Args:
         uploaded_file: Streamlit UploadedFile object
+        categories: optional text columns to store as categoricals, which the
+                    CSV and Parquet readers build directly without string copies
         
     Returns:
         tuple: (DataFrame, file_type, error_message)
     """
     try:
-        file_extension = uploaded_file.name.split('.')[-1].lower()
+        file_extension, codec = split_file_name(uploaded_file.name)
+        csv_dtypes = {col: 'category' for col in categories} if categories else None
         
-        if file_extension == 'csv':
-            df = pd.read_csv(uploaded_file)
+        if codec is not None:
+            if file_extension != 'csv':
+                return None, None, "Only CSV files can be read from compressed files or zip archives."
+            # Zip members are stacked into one table, as if they were one CSV
+            frames = [pd.read_csv(stream, dtype=csv_dtypes) for stream in iter_decompressed_streams(uploaded_file, codec)]
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            file_type = f"CSV ({codec})"
+        elif file_extension == 'csv':
+            df = pd.read_csv(uploaded_file, dtype=csv_dtypes)
             file_type = "CSV"
         elif file_extension in ['xlsx', 'xls']:
             df = pd.read_excel(uploaded_file)
+            if categories:
+                df = df.astype({col: 'category' for col in categories if col in df.columns})
             file_type = "Excel"
+        elif file_extension == 'parquet':
+            if categories:
+                # Dictionary-encoded Arrow columns convert to pandas categoricals
+                schema_names = pq.ParquetFile(uploaded_file).schema_arrow.names
+                uploaded_file.seek(0)
+                df = pq.read_table(uploaded_file, read_dictionary=[col for col in categories if col in schema_names]).to_pandas()
+            else:
+                df = pd.read_parquet(uploaded_file)
+            file_type = "Parquet"
         else:
-            return None, None, "Unsupported file format. Please upload CSV or Excel files."
+            return None, None, "Unsupported file format. Please upload CSV, Excel or Parquet files."
         
         # Check if dataframe is empty
         if df.empty:
             return None, None, "The uploaded file is empty."
         
+        parse_datetime_columns(df)
+        
         return df, file_type, None
         
     except Exception as e:
         return None, None, f"Error loading file: {str(e)}"
 
 
+def iter_data_chunks(uploaded_file, chunksize=SKETCH_CHUNK_ROWS):
+    """
+    Read an uploaded file as a sequence of DataFrame chunks
+    
+    CSV and Parquet files are streamed so only one chunk is in memory at a
+    time; compressed CSV files and zip archives are decompressed as they are
+    parsed. Excel files cannot be streamed and are yielded as a single chunk.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        chunksize: rows per chunk
+        
+    Yields:
+        pandas DataFrame
+    """
+    file_extension, codec = split_file_name(uploaded_file.name)
+    uploaded_file.seek(0)
+    
+    if codec is not None and file_extension != 'csv':
+        raise ValueError("Only CSV files can be read from compressed files or zip archives.")
+    
+    if file_extension == 'csv':
+        streams = [uploaded_file] if codec is None else iter_decompressed_streams(uploaded_file, codec)
+        # Date formats are detected on the first chunk and reused for the rest
+        formats = None
+        for stream in streams:
+            for chunk in pd.read_csv(stream, chunksize=chunksize):
+                formats = parse_datetime_columns(chunk, formats)
+                yield chunk
+    elif file_extension in ['xlsx', 'xls']:
+        chunk = pd.read_excel(uploaded_file)
+        parse_datetime_columns(chunk)
+        yield chunk
+    elif file_extension == 'parquet':
+        formats = None
+        for batch in pq.ParquetFile(uploaded_file).iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            formats = parse_datetime_columns(chunk, formats)
+            yield chunk
+    else:
+        raise ValueError("Unsupported file format. Please upload CSV, Excel or Parquet files.")
+
+
+def read_data_sample(uploaded_file, sample_bytes=MEMORY_SAMPLE_BYTES, sample_rows=MEMORY_SAMPLE_ROWS):
+    """
+    Parse the head of a file and estimate how many rows the whole file holds
+    
+    CSV files are sampled by bytes: the row count is extrapolated from the
+    decompressed size (exact for zip members, from the compression ratio of
+    the head for other codecs). Parquet metadata and Excel sheet dimensions
+    give the row count directly.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        sample_bytes: bytes of CSV text to parse
+        sample_rows: rows to parse from Parquet and Excel files
+        
+    Returns:
+        tuple: (sample DataFrame, estimated number of rows, whether the count is exact)
+    """
+    file_extension, codec = split_file_name(uploaded_file.name)
+    file_size = getattr(uploaded_file, 'size', None)
+    if file_size is None:
+        file_size = uploaded_file.seek(0, os.SEEK_END)
+    uploaded_file.seek(0)
+    try:
+        if codec is not None and file_extension != 'csv':
+            raise ValueError("Only CSV files can be read from compressed files or zip archives.")
+        
+        if file_extension == 'parquet':
+            parquet_file = pq.ParquetFile(uploaded_file)
+            batch = next(parquet_file.iter_batches(batch_size=sample_rows), None)
+            sample = (batch.to_pandas() if batch is not None
+                      else parquet_file.schema_arrow.empty_table().to_pandas())
+            return sample, parquet_file.metadata.num_rows, True
+        
+        if file_extension in ['xlsx', 'xls']:
+            sample = pd.read_excel(uploaded_file, nrows=sample_rows)
+            uploaded_file.seek(0)
+            if file_extension == 'xlsx':
+                import openpyxl
+                max_row = openpyxl.load_workbook(uploaded_file, read_only=True).worksheets[0].max_row
+            else:
+                import xlrd
+                max_row = xlrd.open_workbook(file_contents=uploaded_file.read(), on_demand=True).sheet_by_index(0).nrows
+            if max_row is None:
+                return sample, len(sample), len(sample) < sample_rows
+            return sample, max(max_row - 1, len(sample)), True
+        
+        if file_extension != 'csv':
+            raise ValueError("Unsupported file format. Please upload CSV, Excel or Parquet files.")
+        
+        n_streams = 1
+        if codec is None:
+            stream, total_bytes = uploaded_file, file_size
+        elif codec == 'zip':
+            archive = zipfile.ZipFile(uploaded_file)
+            members = _zip_csv_members(archive)
+            if not members:
+                raise ValueError("The zip archive contains no CSV files.")
+            stream, total_bytes, n_streams = archive.open(members[0]), sum(m.file_size for m in members), len(members)
+        else:
+            stream, total_bytes = next(iter_decompressed_streams(uploaded_file, codec)), None
+        
+        head = stream.read(sample_bytes)
+        complete = len(head) < sample_bytes and n_streams == 1
+        if total_bytes is None:
+            # Compressed bytes read so far give the compression ratio of the head
+            total_bytes = len(head) if complete else file_size * len(head) / max(uploaded_file.tell(), 1)
+        if len(head) == sample_bytes:
+            # Drop the last, partial line
+            head = head[:head.rfind(b'\n') + 1] or head
+        sample = pd.read_csv(BytesIO(head))
+        if complete:
+            return sample, len(sample), True
+        return sample, int(round(len(sample) * total_bytes / max(len(head), 1))), False
+    finally:
+        uploaded_file.seek(0)
+
+
+def estimate_memory_usage(uploaded_file, category_ratio=MEMORY_CATEGORY_RATIO):
+    """
+    Predict the in-memory size of a file before loading it
+    
+    Per-column bytes per row are measured on a parsed sample (after date
+    detection, as load_data would convert them) and scaled to the estimated
+    row count. Text columns whose sample has few distinct values are
+    candidates for categorical storage: one small integer code per row.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        category_ratio: largest share of distinct values for a categorical candidate
+        
+    Returns:
+        dict: 'rows', 'rows_exact', 'sample_rows', 'memory_mb', 'optimized_mb',
+              'categories' (columns to load as categoricals) and 'columns'
+              (per-column estimate DataFrame)
+    """
+    sample, n_rows, rows_exact = read_data_sample(uploaded_file)
+    parse_datetime_columns(sample)
+    n_sample = max(len(sample), 1)
+    bytes_per_row = sample.memory_usage(deep=True, index=False) / n_sample
+    
+    rows = []
+    categories = []
+    for col in sample.columns:
+        series = sample[col]
+        estimated = float(bytes_per_row[col]) * n_rows
+        optimized_dtype, optimized = str(series.dtype), estimated
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            uniques = series.dropna().unique()
+            if len(uniques) <= category_ratio * n_sample:
+                code_bytes = 1 if len(uniques) < 127 else 2 if len(uniques) < 32_767 else 4
+                dictionary_bytes = pd.Series(uniques, dtype=series.dtype).memory_usage(deep=True, index=False)
+                optimized_dtype, optimized = 'category', code_bytes * n_rows + dictionary_bytes
+                categories.append(col)
+        rows.append({
+            'Column': col,
+            'Dtype': str(series.dtype),
+            'Bytes/Row': round(float(bytes_per_row[col]), 1),
+            'Estimated MB': estimated / 1024 ** 2,
+            'Optimized Dtype': optimized_dtype,
+            'Optimized MB': optimized / 1024 ** 2
+        })
+    
+    columns = pd.DataFrame(rows, columns=['Column', 'Dtype', 'Bytes/Row', 'Estimated MB', 'Optimized Dtype', 'Optimized MB'])
+    return {
+        'rows': int(n_rows),
+        'rows_exact': rows_exact,
+        'sample_rows': len(sample),
+        'memory_mb': float(columns['Estimated MB'].sum()),
+        'optimized_mb': float(columns['Optimized MB'].sum()),
+        'categories': categories,
+        'columns': columns
+    }
+
+
+@st.cache_resource
+def _memory_ledger():
+    """Memory held by every session's loaded dataset, shared by all sessions of the server process"""
+    return {'lock': threading.Lock(), 'sessions': {}}
+
+
+def update_memory_ledger(memory_mb, ttl=MEMORY_LEDGER_TTL_SECONDS):
+    """
+    Record the memory held by this session and total what the other sessions hold
+    
+    Closed sessions never report back, so entries that have not been
+    refreshed for `ttl` seconds are dropped.
+    
+    Args:
+        memory_mb: memory held by this session's loaded dataset
+        ttl: seconds after which an idle session's entry expires
+        
+    Returns:
+        float: MB held by the other live sessions
+    """
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx is not None else 'local'
+    ledger = _memory_ledger()
+    now = time.time()
+    with ledger['lock']:
+        sessions = ledger['sessions']
+        for other in [key for key, (_, seen) in sessions.items() if now - seen > ttl]:
+            del sessions[other]
+        sessions[session_id] = (memory_mb, now)
+        return sum(used for key, (used, _) in sessions.items() if key != session_id)
+
+
+def memory_budget_mb(others_mb, session_mb=SESSION_MEMORY_BUDGET_MB, global_mb=GLOBAL_MEMORY_BUDGET_MB):
+    """
+    Memory this session may use for a new dataset
+    
+    Args:
+        others_mb: MB held by the other sessions
+        session_mb: per-session budget (0 for no limit)
+        global_mb: budget shared by all sessions; None for half of the
+                   physical memory, 0 for no limit
+        
+    Returns:
+        float or None: budget in MB, or None when nothing limits it
+    """
+    if global_mb is None:
+        try:
+            global_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024 ** 2 / 2
+        except (AttributeError, ValueError, OSError):  # Not available on this platform
+            global_mb = 0
+    limits = [float(session_mb)] if float(session_mb) > 0 else []
+    if float(global_mb) > 0:
+        limits.append(max(float(global_mb) - others_mb, 0.0))
+    return min(limits) if limits else None
+
+
+def choose_load_strategy(estimate, budget_mb, streaming_available, overhead=MEMORY_LOAD_OVERHEAD,
+                         min_sample_rows=MEMORY_MIN_SAMPLE_ROWS):
+    """
+    Pick how to load a file so that its working memory fits the budget
+    
+    In order of preference: load it as is, load it with categorical text
+    columns, profile it out of core with DuckDB, or profile a random sample
+    of rows.
+    
+    Args:
+        estimate: dict returned by estimate_memory_usage
+        budget_mb: MB this session may use, or None for no limit
+        streaming_available: whether DuckDB can profile this file
+        overhead: working memory relative to the loaded frame
+        min_sample_rows: smallest sample to profile
+        
+    Returns:
+        dict: 'strategy' ('full', 'optimized', 'streaming' or 'sampled'),
+              'reason' and 'sample_fraction' (None unless sampled)
+    """
+    needed = estimate['memory_mb'] * overhead
+    needed_optimized = estimate['optimized_mb'] * overhead
+    plan = {'strategy': 'full', 'sample_fraction': None}
+    
+    if budget_mb is None:
+        plan['reason'] = "No memory budget is set"
+    elif needed <= budget_mb:
+        plan['reason'] = f"Estimated working memory of {needed:,.1f} MB fits the {budget_mb:,.1f} MB budget"
+    elif estimate['categories'] and needed_optimized <= budget_mb:
+        plan['strategy'] = 'optimized'
+        plan['reason'] = (
+            f"Estimated working memory of {needed:,.1f} MB exceeds the {budget_mb:,.1f} MB budget; storing "
+            f"{len(estimate['categories'])} repetitive text column(s) as categoricals brings it to {needed_optimized:,.1f} MB"
+        )
+    elif streaming_available:
+        plan['strategy'] = 'streaming'
+        plan['reason'] = (
+            f"Estimated working memory of {needed:,.1f} MB exceeds the {budget_mb:,.1f} MB budget; "
+            f"the file is profiled out of core with DuckDB instead of being loaded"
+        )
+    else:
+        fraction = min(1.0, max(budget_mb * 0.9 / max(needed, 1e-9), min_sample_rows / max(estimate['rows'], 1)))
+        plan['strategy'] = 'sampled'
+        plan['sample_fraction'] = fraction
+        plan['reason'] = (
+            f"Estimated working memory of {needed:,.1f} MB exceeds the {budget_mb:,.1f} MB budget and this file "
+            f"cannot be profiled out of core; profiling a random {fraction:.1%} sample of the rows"
+        )
+    return plan
+
+
+def load_sampled_data(uploaded_file, fraction, seed=42):
+    """
+    Load a random sample of rows, streaming the file chunk by chunk
+    
+    Only one chunk and the rows kept so far are in memory. Excel files cannot
+    be streamed, so their first rows are read instead.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        fraction: share of rows to keep
+        seed: random seed
+        
+    Returns:
+        tuple: (DataFrame, file_type, error_message)
+    """
+    try:
+        file_extension, codec = split_file_name(uploaded_file.name)
+        if file_extension in ['xlsx', 'xls']:
+            _, n_rows, _ = read_data_sample(uploaded_file)
+            df = pd.read_excel(uploaded_file, nrows=max(1, int(n_rows * fraction)))
+            parse_datetime_columns(df)
+            file_type = "Excel"
+        else:
+            rng = np.random.default_rng(seed)
+            kept = [chunk[rng.random(len(chunk)) < fraction] for chunk in iter_data_chunks(uploaded_file)]
+            if not kept:
+                return None, None, "The uploaded file is empty."
+            df = pd.concat(kept, ignore_index=True)
+            file_type = ("CSV" if file_extension == 'csv' else "Parquet") + (f" ({codec})" if codec else "")
+        
+        if df.empty:
+            return None, None, "The uploaded file is empty."
+        return df, file_type, None
+    
+    except Exception as e:
+        return None, None, f"Error loading file: {str(e)}"
+
+
+def detect_datetime_format(series, sample_size=DATETIME_SAMPLE_ROWS):
+    """
+    Infer the datetime format of a text column from a sample of its values
+    
+    Args:
+        series: pandas Series
+        sample_size: number of non-null values to test
+        
+    Returns:
+        str or None: strftime format that parses the sample, or None
+    """
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return None
+    
+    sample = series.dropna().head(sample_size)
+    if sample.empty:
+        return None
+    sample = sample.astype(str)
+    
+    # Cheap rejection before trying any format
+    if sample.str.contains(r'\d', regex=True).mean() < DATETIME_MIN_PARSE_RATIO:
+        return None
+    
+    candidates = list(DATETIME_FORMATS)
+    guessed = pd.tseries.api.guess_datetime_format(sample.iloc[0])
+    if guessed is not None and guessed not in candidates:
+        candidates.insert(0, guessed)
+    
+    # Formats are screened on a few values first; failed parses are slow
+    probe = sample.head(20)
+    best_format, best_ratio = None, 0.0
+    for fmt in candidates:
+        if pd.to_datetime(probe, format=fmt, errors='coerce').notna().mean() < DATETIME_MIN_PARSE_RATIO:
+            continue
+        ratio = pd.to_datetime(sample, format=fmt, errors='coerce').notna().mean()
+        if ratio > best_ratio:
+            best_format, best_ratio = fmt, ratio
+            if ratio == 1.0:
+                break
+    
+    return best_format if best_ratio >= DATETIME_MIN_PARSE_RATIO else None
+
+
+def parse_datetime_columns(df, formats=None):
+    """
+    Convert text columns holding dates to datetime64, in place
+    
+    Each column is parsed with one fixed format, which is much faster than
+    letting pandas infer the format value by value. Timezone-aware values
+    are converted to UTC.
+    
+    Args:
+        df: pandas DataFrame
+        formats: dict of column -> format to apply (detected if None); given
+                 formats are always applied, with unparseable values becoming NaT,
+                 so later chunks of a stream keep the column type of the first
+        
+    Returns:
+        dict: column -> format of the converted columns
+    """
+    detected = formats is None
+    if detected:
+        formats = {}
+        for col in df.columns:
+            fmt = detect_datetime_format(df[col])
+            if fmt is not None:
+                formats[col] = fmt
+    
+    parsed_formats = {}
+    for col, fmt in formats.items():
+        if col not in df.columns:
+            continue
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            parsed_formats[col] = fmt
+            continue
+        
+        # Parse each distinct value once; dates usually repeat across rows
+        codes, uniques = pd.factorize(df[col])
+        parsed_uniques = pd.to_datetime(uniques, format=fmt, errors='coerce', utc='%z' in fmt)
+        if isinstance(parsed_uniques.dtype, pd.DatetimeTZDtype):
+            parsed_uniques = parsed_uniques.tz_localize(None)
+        # Missing values have code -1, which picks the trailing NaT
+        lookup = np.append(parsed_uniques.to_numpy(), np.datetime64('NaT'))
+        parsed = pd.Series(lookup[codes], index=df.index, name=col)
+        
+        # Keep the original column if the sample was not representative
+        if detected and parsed.notna().sum() < df[col].notna().sum() * DATETIME_MIN_PARSE_RATIO:
+            continue
+        df[col] = parsed
+        parsed_formats[col] = fmt
+    
+    return parsed_formats
+
+
 def classify_feature_type(series):
     """
-    Classify a pandas Series as Numerical or Categorical
+    Classify a pandas Series as Numerical, Temporal or Categorical
     
     Args:
         series: pandas Series
         
     Returns:
-        str: 'Numerical' or 'Categorical'
+        str: 'Numerical', 'Temporal' or 'Categorical'
     """
     if pd.api.types.is_numeric_dtype(series):
         return 'Numerical'
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        return 'Temporal'
     else:
         return 'Categorical'
 
@@ -364,8 +1078,12 @@ def compute_correlation_analysis(df):
         return None, None, "Not enough numerical columns for correlation analysis."
     
     corr_matrix = df[numerical_cols].corr()
-    
-    # Find strong correlations (excluding diagonal)
+    strong_correlations, insights = _correlation_insights(corr_matrix)
+    return corr_matrix, strong_correlations, insights
+
+
+def _correlation_insights(corr_matrix):
+    """Collect strong correlations (excluding the diagonal) and their textual insights"""
     strong_correlations = []
     insights = []
     
@@ -385,217 +1103,4644 @@ def compute_correlation_analysis(df):
     if not insights:
         insights.append("No strong correlations (|r| > 0.7) found between numerical features.")
     
-    return corr_matrix, strong_correlations, insights
+    return strong_correlations, insights
 
 
-def plot_correlation_heatmap(corr_matrix):
-    """
-    Create correlation heatmap using plotly
-    
-    Args:
-        corr_matrix: pandas DataFrame correlation matrix
-        
-    Returns:
-        plotly figure
-    """
-    fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix.values,
-        x=corr_matrix.columns,
-        y=corr_matrix.columns,
-        colorscale='RdBu',
-        zmid=0,
-        text=corr_matrix.values.round(2),
-        texttemplate='%{text}',
-        textfont={"size": 10},
-        colorbar=dict(title="Correlation")
-    ))
-    
-    fig.update_layout(
-        title="Correlation Heatmap",
-        xaxis_title="Features",
-        yaxis_title="Features",
-        height=600,
-        width=800
-    )
-    
-    return fig
+def available_backends():
+    """Return the compute backends that can run in this environment"""
+    return ['pandas'] + (['polars'] if pl is not None else [])
 
 
-def plot_histogram(df, column):
+def compute_core_tables(df, backend='pandas', diagnostics=None):
     """
-    Create histogram with marginal box plot for numerical column
+    Compute the feature summary, quality report, statistics and correlations
     
     Args:
         df: pandas DataFrame
-        column: column name
+        backend: 'pandas' or 'polars'
+        diagnostics: optional diagnostics dict to record per-stage timings
         
     Returns:
-        plotly figure
+        tuple: (summary_df, quality_report, stats_df, corr_matrix,
+                strong_correlations, insights), identical for both backends
     """
-    fig = px.histogram(
-        df, 
-        x=column, 
-        nbins=30,
-        title=f"Distribution & Outlier Analysis: {column}",
-        labels={column: column, 'count': 'Frequency'},
-        color_discrete_sequence=['#667eea'],
-        marginal="box", # Adds the box plot above the histogram
-        height=500
-    )
+    if backend == 'polars':
+        with measure_stage(diagnostics, "Core tables (polars)"):
+            return compute_core_tables_polars(df)
     
-    fig.update_layout(
-        showlegend=False,
-        bargap=0.1
-    )
+    with measure_stage(diagnostics, "Feature summary"):
+        summary_df = create_feature_summary(df)
     
-    return fig
+    with measure_stage(diagnostics, "Quality checks"):
+        quality_report = perform_data_quality_checks(df)
+    
+    with measure_stage(diagnostics, "Descriptive statistics"):
+        stats_df = get_descriptive_statistics(df)
+    
+    with measure_stage(diagnostics, "Correlation analysis"):
+        corr_matrix, strong_corr, insights = compute_correlation_analysis(df)
+    
+    return summary_df, quality_report, stats_df, corr_matrix, strong_corr, insights
 
 
-def plot_boxplot(df, column):
+def compute_core_tables_polars(df):
     """
-    Create box plot for numerical column
+    Polars implementation of compute_core_tables
+    
+    Every per-column aggregate, the pairwise correlations and the duplicate
+    count are expressed as one lazy query, which Polars optimizes and runs
+    multi-threaded with the streaming engine. Only the single result row is
+    brought back and reshaped into the pandas tables.
     
     Args:
         df: pandas DataFrame
-        column: column name
         
     Returns:
-        plotly figure
+        tuple: same layout as compute_core_tables
     """
-    fig = px.box(
-        df, 
-        y=column,
-        title=f"Box Plot of {column}",
-        color_discrete_sequence=['#2ca02c']
-    )
+    # Positional names avoid clashes between aliases and non-string or duplicate labels
+    names = [f'c{i}' for i in range(len(df.columns))]
+    frame = df.set_axis(names, axis=1)
+    object_names = [name for name, col in zip(names, df.columns) if df[col].dtype == 'object']
+    if object_names:
+        # Mixed-type object columns have no Arrow type; compare them as text
+        frame = frame.astype({name: 'string' for name in object_names})
     
-    fig.update_layout(
+    numerical_labels = set(df.select_dtypes(include=[np.number]).columns)
+    stats_names = [name for name, col in zip(names, df.columns) if col in numerical_labels]
+    
+    exprs = []
+    for name, col in zip(names, df.columns):
+        exprs.append(pl.col(name).null_count().alias(f'{name}_nulls'))
+        exprs.append(pl.col(name).drop_nulls().n_unique().alias(f'{name}_unique'))
+        if pd.api.types.is_numeric_dtype(df[col]):
+            exprs.append((pl.col(name).cast(pl.Float64) == 0).all().alias(f'{name}_zeros'))
+        if name in object_names:
+            parsed = pl.col(name).str.strip_chars().cast(pl.Float64, strict=False)
+            exprs.append((parsed.null_count() == pl.col(name).null_count()).alias(f'{name}_numeric'))
+    
+    for name in stats_names:
+        values = pl.col(name).cast(pl.Float64)
+        exprs.extend([
+            values.count().alias(f'{name}_count'),
+            values.mean().alias(f'{name}_mean'),
+            values.median().alias(f'{name}_median'),
+            values.std().alias(f'{name}_std'),
+            values.min().alias(f'{name}_min'),
+            values.max().alias(f'{name}_max')
+        ])
+    
+    if len(stats_names) >= 2:
+        for i, name1 in enumerate(stats_names):
+            for name2 in stats_names[i + 1:]:
+                exprs.append(pl.corr(pl.col(name1).cast(pl.Float64), pl.col(name2).cast(pl.Float64))
+                             .alias(f'corr_{name1}_{name2}'))
+    
+    if names:
+        exprs.append((~pl.struct(pl.all()).is_first_distinct()).sum().alias('duplicates'))
+    
+    result = pl.from_pandas(frame).lazy().select(exprs).collect(engine='streaming').row(0, named=True) if exprs else {}
+    
+    n_rows = len(df)
+    summary_data = []
+    quality_report = {
+        'columns_with_missing': [],
+        'columns_high_missing': [],
+        'columns_all_zeros': [],
+        'constant_features': [],
+        'type_mismatch': [],
+        'duplicate_rows': int(result.get('duplicates') or 0)
+    }
+    for name, col in zip(names, df.columns):
+        null_count = np.int64(result[f'{name}_nulls'])
+        unique_count = np.int64(result[f'{name}_unique'])
+        null_percentage = (null_count / n_rows) * 100
+        
+        summary_data.append({
+            'Column Name': col,
+            'Data Type': str(df[col].dtype),
+            'Feature Type': classify_feature_type(df[col]),
+            'Unique Values': unique_count,
+            'Null Values': null_count,
+            'Null %': round(null_percentage, 2)
+        })
+        
+        if null_count > 0:
+            quality_report['columns_with_missing'].append((col, null_count, null_percentage))
+        if null_percentage > 30:
+            quality_report['columns_high_missing'].append((col, null_percentage))
+        # An all-null column counts as all zeros, as with the pandas check
+        if result.get(f'{name}_zeros'):
+            quality_report['columns_all_zeros'].append(col)
+        if unique_count == 1:
+            quality_report['constant_features'].append(col)
+        if result.get(f'{name}_numeric'):
+            quality_report['type_mismatch'].append(col)
+    
+    summary_df = pd.DataFrame(summary_data)
+    
+    if not stats_names:
+        return summary_df, quality_report, None, None, None, "Not enough numerical columns for correlation analysis."
+    
+    stats_labels = [col for name, col in zip(names, df.columns) if name in stats_names]
+    stats_df = pd.DataFrame(
+        [[result[f'{name}_{stat}'] for stat in ('count', 'mean', 'median', 'std', 'min', 'max')] for name in stats_names],
+        index=stats_labels, columns=['count', 'mean', 'median', 'std', 'min', 'max'], dtype='float64'
+    ).round(2)
+    
+    if len(stats_names) < 2:
+        return summary_df, quality_report, stats_df, None, None, "Not enough numerical columns for correlation analysis."
+    
+    # The diagonal is 1 unless the column has no spread, as in DataFrame.corr
+    corr = np.diag([1.0 if (result[f'{name}_std'] or 0) > 0 else np.nan for name in stats_names])
+    for i, name1 in enumerate(stats_names):
+        for j in range(i + 1, len(stats_names)):
+            value = result[f'corr_{name1}_{stats_names[j]}']
+            corr[i, j] = corr[j, i] = np.nan if value is None else value
+    corr_matrix = pd.DataFrame(corr, index=stats_labels, columns=stats_labels)
+    strong_correlations, insights = _correlation_insights(corr_matrix)
+    
+    return summary_df, quality_report, stats_df, corr_matrix, strong_correlations, insights
+
+
+def compute_association_ranking(df, max_categories=ASSOCIATION_MAX_CATEGORIES, chunk_rows=ASSOCIATION_CHUNK_ROWS):
+    """
+    Rank every (numerical, categorical) column pair by correlation ratio
+    
+    Per-group counts, sums and sums of squares of all numerical columns are
+    accumulated for each categorical column with np.bincount over the group
+    codes, one call per statistic column, from which eta squared and the
+    ANOVA F statistic follow for every pair at once. Values are shifted
+    by their column mean first, so the sums do not cancel when a column's
+    mean is large relative to its spread.
+    
+    Args:
+        df: pandas DataFrame
+        max_categories: categorical columns with more distinct values are skipped
+        chunk_rows: rows per batch, bounding temporary memory
+        
+    Returns:
+        tuple: (ranking DataFrame sorted by eta squared, list of skipped
+                categorical columns)
+    """
+    numerical_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    columns = ['Numerical', 'Categorical', 'Groups', 'N', 'Eta²', 'F']
+    
+    groupings = []
+    skipped = []
+    for col in df.columns:
+        if classify_feature_type(df[col]) != 'Categorical':
+            continue
+        codes, uniques = pd.factorize(df[col])
+        if len(uniques) > max_categories:
+            skipped.append(col)
+        elif len(uniques) >= 2:
+            groupings.append((col, codes, len(uniques)))
+    
+    if not numerical_cols or not groupings:
+        return pd.DataFrame(columns=columns), skipped
+    
+    values = df[numerical_cols].to_numpy(dtype='float64', na_value=np.nan)
+    n_numeric = len(numerical_cols)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # All-missing columns
+        shift = np.nan_to_num(np.nanmean(values, axis=0))
+    sums = {col: np.zeros((3 * n_numeric, n_groups + 1)) for col, _, n_groups in groupings}
+    
+    for start in range(0, len(df), chunk_rows):
+        # One contiguous row per statistic: observed counts | sums | sums of squares
+        chunk = np.ascontiguousarray(values[start:start + chunk_rows].T) - shift[:, None]
+        observed = np.isfinite(chunk)
+        chunk = np.where(observed, chunk, 0.0)
+        stacked = np.concatenate([observed, chunk, chunk * chunk])
+        for col, codes, n_groups in groupings:
+            # Missing categories (code -1) go to a spare last group that is dropped
+            group = codes[start:start + chunk_rows]
+            group = np.where(group < 0, n_groups, group)
+            for j, weights in enumerate(stacked):
+                sums[col][j] += np.bincount(group, weights=weights, minlength=n_groups + 1)
+    
+    rows = []
+    for col, _, n_groups in groupings:
+        per_group = sums[col][:, :n_groups].T
+        rows.extend(_association_rows(numerical_cols, col, *np.split(per_group, 3, axis=1)))
+    
+    ranking = pd.DataFrame(rows, columns=columns).sort_values('Eta²', ascending=False, ignore_index=True)
+    return ranking, skipped
+
+
+def _association_rows(numerical_cols, col, count, total, total_sq):
+    """
+    Compute eta squared and F for one categorical column from per-group sums
+    
+    Args:
+        numerical_cols: names of the numerical columns
+        col: name of the categorical column
+        count, total, total_sq: arrays of shape (groups, numerical columns)
+        
+    Returns:
+        list of (numerical, categorical, groups, N, eta squared, F) tuples
+    """
+    n = count.sum(axis=0)
+    k = (count > 0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grand_term = total.sum(axis=0) ** 2 / n
+        ss_total = total_sq.sum(axis=0) - grand_term
+        ss_between = np.where(count > 0, total ** 2 / count, 0.0).sum(axis=0) - grand_term
+        eta_squared = np.clip(ss_between / ss_total, 0.0, 1.0)
+        f_stat = (ss_between / (k - 1)) / ((ss_total - ss_between) / (n - k))
+    
+    return [
+        (num_col, col, int(k[j]), int(n[j]), float(eta_squared[j]), float(f_stat[j]))
+        for j, num_col in enumerate(numerical_cols)
+        if k[j] >= 2 and n[j] > k[j] and ss_total[j] > 0
+    ]
+
+
+def compute_categorical_association(df, max_categories=CATEGORICAL_ASSOCIATION_MAX_CATEGORIES,
+                                    sample_rows=CATEGORICAL_ASSOCIATION_SAMPLE_ROWS, seed=0):
+    """
+    Compute Cramér's V and Theil's U between every pair of categorical columns
+    
+    Each column is factorized once. A pair's contingency table is a single
+    bincount over the combined codes `a * n_b + b`, so no per-pair crosstab
+    is built. Columns with more categories than `max_categories` keep their
+    most frequent values and pool the rest into one bucket, and datasets
+    larger than `sample_rows` are measured on a fixed random row sample.
+    
+    Args:
+        df: pandas DataFrame
+        max_categories: maximum categories per column, including the pooled bucket
+        sample_rows: maximum number of rows used for the contingency tables
+        seed: random seed for the row sample
+        
+    Returns:
+        dict: 'cramers_v' and 'theils_u' DataFrames (None with fewer than two
+              categorical columns), 'strong' list of (col1, col2, V),
+              'insights', 'capped' columns and 'sampled_rows'
+    """
+    rows = None
+    if len(df) > sample_rows:
+        rows = np.sort(np.random.default_rng(seed).choice(len(df), size=sample_rows, replace=False))
+    
+    columns = []
+    codes_list = []
+    sizes = []
+    capped = []
+    for col in df.columns:
+        if classify_feature_type(df[col]) != 'Categorical':
+            continue
+        codes, uniques = pd.factorize(df[col])
+        n_categories = len(uniques)
+        if n_categories > max_categories:
+            # Keep the most frequent values and pool the tail into the last code
+            counts = np.bincount(codes[codes >= 0], minlength=n_categories)
+            remap = np.full(n_categories, max_categories - 1, dtype=np.int64)
+            remap[np.argsort(-counts, kind='stable')[:max_categories - 1]] = np.arange(max_categories - 1)
+            codes = np.where(codes >= 0, remap[codes], -1)
+            n_categories = max_categories
+            capped.append(col)
+        if n_categories >= 2:
+            columns.append(col)
+            codes_list.append(codes if rows is None else codes[rows])
+            sizes.append(n_categories)
+    
+    result = {'cramers_v': None, 'theils_u': None, 'strong': [], 'insights': [], 'capped': capped,
+              'sampled_rows': None if rows is None else int(sample_rows)}
+    if len(columns) < 2:
+        result['insights'].append("Not enough categorical columns for association analysis.")
+        return result
+    
+    n_columns = len(columns)
+    cramers_v = np.eye(n_columns)
+    # theils_u[i, j] = U(column i | column j): share of i's entropy explained by j
+    theils_u = np.eye(n_columns)
+    
+    for i in range(n_columns):
+        for j in range(i + 1, n_columns):
+            a, b = codes_list[i], codes_list[j]
+            valid = (a >= 0) & (b >= 0)
+            table = np.bincount(a[valid] * sizes[j] + b[valid], minlength=sizes[i] * sizes[j])
+            cramers_v[i, j], theils_u[i, j], theils_u[j, i] = _contingency_association(
+                table.reshape(sizes[i], sizes[j])
+            )
+            cramers_v[j, i] = cramers_v[i, j]
+    
+    result.update(_categorical_association_result(columns, cramers_v, theils_u))
+    return result
+
+
+def _contingency_association(table):
+    """
+    Compute Cramér's V and both Theil's U directions from a contingency table
+    
+    Args:
+        table: 2-D array of co-occurrence counts (rows: column A, columns: column B)
+        
+    Returns:
+        tuple: (V, U(A | B), U(B | A)), NaN when either side has a single category
+    """
+    table = np.asarray(table, dtype=np.float64)
+    # Drop categories that never co-occur with a non-null partner
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    if n == 0 or min(table.shape) < 2:
+        return np.nan, np.nan, np.nan
+    
+    row_totals = table.sum(axis=1)
+    col_totals = table.sum(axis=0)
+    phi_squared = (table ** 2 / np.outer(row_totals, col_totals)).sum() - 1.0
+    cramers_v = np.sqrt(max(phi_squared, 0.0) / (min(table.shape) - 1))
+    
+    joint = table[table > 0] / n
+    p_row = row_totals / n
+    p_col = col_totals / n
+    h_row = -(p_row * np.log(p_row)).sum()
+    h_col = -(p_col * np.log(p_col)).sum()
+    mutual_information = h_row + h_col + (joint * np.log(joint)).sum()
+    return cramers_v, mutual_information / h_row, mutual_information / h_col
+
+
+def _categorical_association_result(columns, cramers_v, theils_u):
+    """Wrap association matrices as DataFrames and collect strong-association insights"""
+    result = {
+        'cramers_v': pd.DataFrame(cramers_v, index=columns, columns=columns),
+        'theils_u': pd.DataFrame(np.clip(theils_u, 0.0, 1.0), index=columns, columns=columns),
+        'strong': [],
+        'insights': []
+    }
+    n_columns = len(columns)
+    
+    for i in range(n_columns):
+        for j in range(i + 1, n_columns):
+            value = cramers_v[i, j]
+            if value > STRONG_ASSOCIATION_THRESHOLD:
+                col1, col2 = columns[i], columns[j]
+                result['strong'].append((col1, col2, float(value)))
+                # Theil's U is asymmetric: report which column predicts the other better
+                if theils_u[i, j] >= theils_u[j, i]:
+                    predictor, target, u_value = col2, col1, theils_u[i, j]
+                else:
+                    predictor, target, u_value = col1, col2, theils_u[j, i]
+                result['insights'].append(
+                    f"Strong association (V = {value:.2f}) between **{col1}** and **{col2}**; "
+                    f"knowing **{predictor}** explains {u_value:.0%} of the uncertainty in **{target}**"
+                )
+    
+    if not result['insights']:
+        result['insights'].append(
+            f"No strong associations (Cramér's V > {STRONG_ASSOCIATION_THRESHOLD}) found between categorical features."
+        )
+    
+    return result
+
+
+def _select_association_pair():
+    """Point the comparison selectors at the ranked pair picked by the user"""
+    pair = st.session_state.get('association_pair')
+    if pair is not None:
+        st.session_state['num_compare'], st.session_state['cat_compare'] = pair
+
+
+def _select_density_pair():
+    """Point the density explorer at the strongly correlated pair picked by the user"""
+    pair = st.session_state.get('density_pair')
+    if pair is not None:
+        st.session_state['density_x'], st.session_state['density_y'] = pair
+
+
+def compute_outlier_scan(df, numeric_aggregates, z_threshold=OUTLIER_Z_THRESHOLD,
+                         mad_threshold=OUTLIER_MAD_THRESHOLD, chunk_rows=OUTLIER_SCAN_CHUNK_ROWS,
+                         top_rows=OUTLIER_TOP_ROWS):
+    """
+    Count IQR, z-score and MAD outliers in every numerical column at once
+    
+    Quartiles, medians, means and standard deviations are reused from the
+    profiled column aggregates; only the median absolute deviation needs a
+    new pass, made one column at a time. The flags are evaluated on the whole numerical block in row
+    chunks, and each row's score is the number of columns in which any of
+    the three methods flags it.
+    
+    Args:
+        df: pandas DataFrame
+        numeric_aggregates: dict of column -> compute_numeric_aggregates result
+        z_threshold: |z-score| above which a value is an outlier
+        mad_threshold: |modified z-score| (0.6745 * deviation / MAD) above which a value is an outlier
+        chunk_rows: rows per batch, bounding temporary memory
+        top_rows: number of highest-scoring rows to keep
+        
+    Returns:
+        dict: 'summary' DataFrame (one row per column), 'score_counts' array
+              (rows per score 0..n_columns), 'top_rows' and 'top_scores'
+              arrays of row positions and scores
+    """
+    columns = list(numeric_aggregates)
+    summary_columns = ['Column', 'IQR Outliers', 'Z-Score Outliers', 'MAD Outliers', 'Any Method', 'Any Method %']
+    if not columns or len(df) == 0:
+        return {
+            'summary': pd.DataFrame(columns=summary_columns),
+            'score_counts': np.zeros(1, dtype=np.int64),
+            'top_rows': np.zeros(0, dtype=np.int64),
+            'top_scores': np.zeros(0, dtype=np.int64)
+        }
+    
+    values = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    
+    def cached(key):
+        return np.array([numeric_aggregates[col][key] for col in columns], dtype=np.float64)
+    
+    q1, q3, median, mean, std = cached('q1'), cached('q3'), cached('median'), cached('mean'), cached('std')
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    # One column at a time, so the deviations never need a full-size temporary
+    mad = np.array([np.nanmedian(np.abs(values[:, j] - median[j])) for j in range(len(columns))])
+    # A zero spread makes the score undefined; such columns get no z/MAD flags
+    z_limit = np.where(std > 0, z_threshold * std, np.inf)
+    mad_limit = np.where(mad > 0, mad_threshold * mad / 0.6745, np.inf)
+    
+    iqr_counts = np.zeros(len(columns), dtype=np.int64)
+    z_counts = np.zeros(len(columns), dtype=np.int64)
+    mad_counts = np.zeros(len(columns), dtype=np.int64)
+    any_counts = np.zeros(len(columns), dtype=np.int64)
+    row_scores = np.empty(len(df), dtype=np.int64)
+    
+    for start in range(0, len(df), chunk_rows):
+        chunk = values[start:start + chunk_rows]
+        # Comparisons with NaN are False, so missing values are never flagged
+        iqr_flags = (chunk < lower) | (chunk > upper)
+        z_flags = np.abs(chunk - mean) > z_limit
+        mad_flags = np.abs(chunk - median) > mad_limit
+        any_flags = iqr_flags | z_flags | mad_flags
+        
+        iqr_counts += iqr_flags.sum(axis=0)
+        z_counts += z_flags.sum(axis=0)
+        mad_counts += mad_flags.sum(axis=0)
+        any_counts += any_flags.sum(axis=0)
+        row_scores[start:start + chunk_rows] = any_flags.sum(axis=1)
+    
+    summary = pd.DataFrame({
+        'Column': columns,
+        'IQR Outliers': iqr_counts,
+        'Z-Score Outliers': z_counts,
+        'MAD Outliers': mad_counts,
+        'Any Method': any_counts,
+        'Any Method %': (any_counts / len(df) * 100).round(2)
+    }).sort_values('Any Method', ascending=False, ignore_index=True)
+    
+    n_top = min(top_rows, int((row_scores > 0).sum()))
+    top = np.argsort(-row_scores, kind='stable')[:n_top]
+    
+    return {
+        'summary': summary,
+        'score_counts': np.bincount(row_scores, minlength=len(columns) + 1),
+        'top_rows': top.astype(np.int64),
+        'top_scores': row_scores[top]
+    }
+
+
+def compute_numeric_aggregates(series, bins=HISTOGRAM_BINS):
+    """
+    Compute histogram bins and box plot statistics for a numerical column
+
+    Args:
+        series: pandas Series
+        bins: number of histogram bins
+
+    Returns:
+        dict: summary statistics plus 'hist_counts' and 'hist_edges' arrays
+    """
+    values = series.to_numpy(dtype='float64', na_value=np.nan)
+    values = values[np.isfinite(values)]
+
+    if values.size == 0:
+        return {
+            'count': 0, 'mean': np.nan, 'median': np.nan, 'std': np.nan,
+            'min': np.nan, 'max': np.nan, 'q1': np.nan, 'q3': np.nan,
+            'lower_fence': np.nan, 'upper_fence': np.nan, 'outliers': 0,
+            'hist_counts': np.zeros(0, dtype=np.int64),
+            'hist_edges': np.zeros(0, dtype=np.float64)
+        }
+
+    hist_counts, hist_edges = np.histogram(values, bins=bins)
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'median': float(median),
+        'std': float(values.std(ddof=1)) if values.size > 1 else np.nan,
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'q1': float(q1),
+        'q3': float(q3),
+        'lower_fence': float(inside.min()),
+        'upper_fence': float(inside.max()),
+        'outliers': int(values.size - inside.size),
+        'hist_counts': hist_counts.astype(np.int64),
+        'hist_edges': hist_edges.astype(np.float64)
+    }
+
+
+def _density_edges(low, high, bins):
+    """Equal-width bin edges over [low, high], widened like np.histogram when the range is empty"""
+    if high <= low:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def compute_density_grid(x, y, bins=DENSITY_GRID_BINS, x_range=None, y_range=None,
+                         max_points=DENSITY_MAX_POINTS, chunk_rows=DENSITY_CHUNK_ROWS):
+    """
+    Bin two numerical columns into a 2D count grid
+    
+    Rows are binned chunk by chunk with one bincount over combined cell
+    indexes, so the grid (and the chart drawn from it) has the same size for
+    any number of rows. The raw points are kept only when at most
+    `max_points` rows fall inside the window.
+    
+    Args:
+        x: float64 array of x values (NaN for missing)
+        y: float64 array of y values, same length as x
+        bins: number of bins per axis
+        x_range: optional (low, high) window on x; defaults to the full range
+        y_range: optional (low, high) window on y; defaults to the full range
+        max_points: largest number of raw points returned
+        chunk_rows: rows binned per step
+        
+    Returns:
+        dict: 'counts' (bins x bins, indexed [y bin, x bin]), 'x_edges',
+              'y_edges', 'n_points' and 'points' ((x, y) arrays, or None when
+              the window holds more than max_points rows); None when no row
+              has finite values in both columns
+    """
+    if x_range is None or y_range is None:
+        lows, highs = np.full(2, np.inf), np.full(2, -np.inf)
+        for start in range(0, len(x), chunk_rows):
+            xs, ys = x[start:start + chunk_rows], y[start:start + chunk_rows]
+            valid = np.isfinite(xs) & np.isfinite(ys)
+            if valid.any():
+                lows = np.minimum(lows, [xs[valid].min(), ys[valid].min()])
+                highs = np.maximum(highs, [xs[valid].max(), ys[valid].max()])
+        if not np.isfinite(lows).all():
+            return None
+        x_range = x_range or (lows[0], highs[0])
+        y_range = y_range or (lows[1], highs[1])
+    
+    x_edges = _density_edges(float(x_range[0]), float(x_range[1]), bins)
+    y_edges = _density_edges(float(y_range[0]), float(y_range[1]), bins)
+    x_scale = bins / (x_edges[-1] - x_edges[0])
+    y_scale = bins / (y_edges[-1] - y_edges[0])
+    
+    counts = np.zeros(bins * bins, dtype=np.int64)
+    points, n_points = [], 0
+    for start in range(0, len(x), chunk_rows):
+        xs, ys = x[start:start + chunk_rows], y[start:start + chunk_rows]
+        # NaN compares False, so missing values drop out with the window test
+        inside = (xs >= x_edges[0]) & (xs <= x_edges[-1]) & (ys >= y_edges[0]) & (ys <= y_edges[-1])
+        xs, ys = xs[inside], ys[inside]
+        # The upper edge belongs to the last bin, as in np.histogram
+        ix = np.minimum(((xs - x_edges[0]) * x_scale).astype(np.int64), bins - 1)
+        iy = np.minimum(((ys - y_edges[0]) * y_scale).astype(np.int64), bins - 1)
+        counts += np.bincount(iy * bins + ix, minlength=bins * bins)
+        n_points += xs.size
+        if points is not None:
+            points = points + [(xs, ys)] if n_points <= max_points else None
+    
+    return {
+        'counts': counts.reshape(bins, bins),
+        'x_edges': x_edges,
+        'y_edges': y_edges,
+        'n_points': int(n_points),
+        'points': None if points is None else (
+            np.concatenate([p[0] for p in points] or [np.zeros(0)]),
+            np.concatenate([p[1] for p in points] or [np.zeros(0)])
+        )
+    }
+
+
+def compute_categorical_aggregates(series, top_n=TOP_CATEGORIES):
+    """
+    Compute value counts, mode and cardinality for a categorical column
+
+    Args:
+        series: pandas Series
+        top_n: number of most frequent values to keep
+
+    Returns:
+        dict: 'unique', 'mode', 'mode_count', 'top_values', 'top_counts' and
+              'count_error'
+    """
+    return categorical_aggregates_from_sketch(create_column_sketch(series, 'Categorical'), top_n)
+
+
+@lru_cache(maxsize=None)
+def _pattern_table():
+    """Byte lookup table mapping A-Z to 'A', a-z to 'a' and 0-9 to '9'"""
+    table = np.arange(256, dtype=np.uint8)
+    table[ord('A'):ord('Z') + 1] = ord('A')
+    table[ord('a'):ord('z') + 1] = ord('a')
+    table[ord('0'):ord('9') + 1] = ord('9')
+    return table
+
+
+def _pattern_signatures(values):
+    """
+    Map every character of an Arrow string array to its character class
+    
+    The lookup is applied to the UTF-8 data buffer in one pass; bytes of
+    multi-byte characters are all >= 128 and are left unchanged.
+    """
+    validity, offsets, data = values.buffers()
+    mapped = _pattern_table()[np.frombuffer(data, dtype=np.uint8)] if data is not None else np.empty(0, np.uint8)
+    return pa.Array.from_buffers(values.type, len(values), [validity, offsets, pa.py_buffer(mapped)],
+                                 offset=values.offset)
+
+
+def compute_text_aggregates(series, bins=HISTOGRAM_BINS, top_n=TOP_TEXT_PATTERNS):
+    """
+    Profile a text column with Arrow string kernels
+    
+    Every statistic is computed on the Arrow buffers, without a Python loop
+    over the values. Pattern signatures map uppercase letters to 'A',
+    lowercase letters to 'a' and digits to '9', so "AB-1234" becomes "AA-9999".
+    
+    Args:
+        series: pandas Series
+        bins: number of string length histogram bins
+        top_n: number of most common patterns to keep
+        
+    Returns:
+        dict: length statistics and histogram, empty/whitespace counts,
+              top patterns and email/URL/numeric matches
+    """
+    values = pa.array(series.astype('string[pyarrow]'))
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    values = pc.drop_null(values)
+    count = len(values)
+    lengths = pc.utf8_length(values)
+    length_values = lengths.to_numpy(zero_copy_only=False)
+    
+    hist_counts, hist_edges = np.histogram(length_values, bins=min(bins, max(int(length_values.max(initial=0)), 1)))
+    
+    # Pattern signatures, truncated so free text does not explode the pattern set
+    signatures = _pattern_signatures(pc.utf8_slice_codeunits(values, 0, TEXT_PATTERN_LENGTH))
+    pattern_counts = pc.value_counts(signatures)
+    pattern_frequencies = pattern_counts.field('counts').to_numpy()
+    order = np.argsort(-pattern_frequencies, kind='stable')[:top_n]
+    
+    aggregates = {
+        'count': int(count),
+        'empty': int(pc.sum(pc.equal(lengths, 0)).as_py() or 0),
+        'whitespace_only': int(pc.sum(pc.utf8_is_space(values)).as_py() or 0),
+        'padded': int(pc.sum(pc.not_equal(values, pc.utf8_trim_whitespace(values))).as_py() or 0),
+        'min_length': int(length_values.min()) if count else 0,
+        'mean_length': float(length_values.mean()) if count else 0.0,
+        'max_length': int(length_values.max()) if count else 0,
+        'length_hist_counts': hist_counts,
+        'length_hist_edges': hist_edges,
+        'pattern_count': int(len(pattern_counts)),
+        'top_patterns': pattern_counts.field('values').take(order).to_pylist(),
+        'top_pattern_counts': [int(count) for count in pattern_frequencies[order]]
+    }
+    
+    for label, regex in TEXT_SEMANTIC_REGEXES.items():
+        aggregates[label.lower()] = int(pc.sum(pc.match_substring_regex(values, regex)).as_py() or 0)
+    
+    # A column is tagged when nearly all of its values match one kind
+    aggregates['semantic_type'] = next(
+        (label for label in TEXT_SEMANTIC_REGEXES
+         if count and aggregates[label.lower()] >= TEXT_SEMANTIC_RATIO * count),
+        'Text'
+    )
+    return aggregates
+
+
+def _datetime_seconds(series):
+    """Convert a datetime Series without nulls to float seconds since the epoch"""
+    return series.to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+
+
+def choose_resample_rule(span_seconds, max_points=TIME_SERIES_MAX_POINTS):
+    """
+    Pick the finest resampling rule that keeps a time series under max_points
+
+    Args:
+        span_seconds: time between the first and last timestamp
+        max_points: maximum number of periods to plot
+
+    Returns:
+        str: pandas offset alias, one of TIME_SERIES_RULES
+    """
+    for rule, (_, rule_seconds) in TIME_SERIES_RULES.items():
+        if span_seconds / rule_seconds + 1 <= max_points:
+            return rule
+    return 'YS'
+
+
+def compute_temporal_aggregates(series, max_points=TIME_SERIES_MAX_POINTS):
+    """
+    Compute range, gaps, frequency and resampled counts for a datetime column
+
+    Args:
+        series: pandas Series of datetime64 values
+        max_points: maximum number of resampled periods
+
+    Returns:
+        dict: 'count', 'min', 'max', 'span_seconds', 'frequency',
+              'median_step_seconds', 'gap_count', 'largest_gap_seconds',
+              'largest_gap_start', 'resample_rule', 'period_starts' and
+              'period_counts'
+    """
+    values = np.sort(series.dropna().to_numpy(dtype='datetime64[ns]'))
+    aggregates = {
+        'count': int(values.size), 'min': None, 'max': None, 'span_seconds': 0.0,
+        'frequency': None, 'median_step_seconds': np.nan, 'gap_count': 0,
+        'largest_gap_seconds': np.nan, 'largest_gap_start': None, 'resample_rule': 'D',
+        'period_starts': np.array([], dtype='datetime64[ns]'), 'period_counts': np.array([], dtype=np.int64)
+    }
+    if values.size == 0:
+        return aggregates
+    
+    span_seconds = (values[-1] - values[0]) / np.timedelta64(1, 's')
+    aggregates.update({
+        'min': pd.Timestamp(values[0]).isoformat(),
+        'max': pd.Timestamp(values[-1]).isoformat(),
+        'span_seconds': float(span_seconds)
+    })
+    
+    # Steps between distinct timestamps; a gap is a step well above the usual one
+    unique_values = values[np.concatenate([[True], values[1:] != values[:-1]])]
+    if unique_values.size > 1:
+        steps = np.diff(unique_values) / np.timedelta64(1, 's')
+        median_step = float(np.median(steps))
+        gaps = steps > 1.5 * median_step
+        largest = int(np.argmax(steps))
+        aggregates.update({
+            'median_step_seconds': median_step,
+            'gap_count': int(gaps.sum()),
+            'largest_gap_seconds': float(steps[largest]) if gaps.any() else 0.0,
+            'largest_gap_start': pd.Timestamp(unique_values[largest]).isoformat() if gaps.any() else None
+        })
+    if unique_values.size >= 3:
+        aggregates['frequency'] = pd.infer_freq(pd.DatetimeIndex(unique_values[:DATETIME_SAMPLE_ROWS]))
+    
+    rule = choose_resample_rule(span_seconds, max_points)
+    counts = pd.Series(np.ones(values.size, dtype=np.int64), index=pd.DatetimeIndex(values)).resample(rule).sum()
+    aggregates.update({
+        'resample_rule': rule,
+        'period_starts': counts.index.to_numpy(dtype='datetime64[ns]'),
+        'period_counts': counts.to_numpy(dtype=np.int64)
+    })
+    return aggregates
+
+
+def aggregate_time_series(df, time_column, rule, value_column=None):
+    """
+    Resample a dataset along a datetime column
+
+    Args:
+        df: pandas DataFrame
+        time_column: datetime column to resample on
+        rule: pandas offset alias
+        value_column: numerical column to aggregate, or None to count rows
+
+    Returns:
+        pandas DataFrame indexed by period start with 'count', or 'mean',
+        'min' and 'max' of value_column
+    """
+    index = pd.DatetimeIndex(df[time_column])
+    if value_column is None:
+        series = pd.Series(np.ones(len(df), dtype=np.int64), index=index)
+        return series[index.notna()].resample(rule).sum().to_frame('count')
+    
+    series = pd.Series(df[value_column].to_numpy(), index=index)
+    return series[index.notna()].resample(rule).agg(['mean', 'min', 'max'])
+
+
+def _hash_values(values):
+    """Hash an array of values to uint64 for distinct counting"""
+    return pd.util.hash_array(values, categorize=False)
+
+
+def _hll_update(registers, hashes, precision=HLL_PRECISION):
+    """Update HyperLogLog registers in place with a batch of uint64 hashes"""
+    if hashes.size == 0:
+        return registers
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << (64 - precision)) - 1)
+    # Rank = position of the lowest set bit (trailing zeros + 1)
+    lowest_bit = remainder & (~remainder + np.uint64(1))
+    rank = np.full(hashes.size, 64 - precision + 1, dtype=np.uint8)
+    nonzero = remainder != 0
+    rank[nonzero] = np.log2(lowest_bit[nonzero].astype(np.float64)).astype(np.uint8) + 1
+    # Mark every (register, rank) pair seen, then take the highest rank per register
+    seen = np.zeros((registers.size, 66), dtype=bool)
+    seen[index, rank] = True
+    batch_max = (65 - np.argmax(seen[:, ::-1], axis=1)).astype(np.uint8)
+    batch_max[~seen.any(axis=1)] = 0
+    np.maximum(registers, batch_max, out=registers)
+    return registers
+
+
+def _hll_estimate(registers):
+    """Estimate the number of distinct values from HyperLogLog registers"""
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+def _compress_quantile_sketch(values, weights, size=QUANTILE_SKETCH_SIZE):
+    """Compress weighted values into at most `size` equal-weight centroids"""
+    order = np.argsort(values, kind='stable')
+    values, weights = values[order], weights[order]
+    if values.size <= size:
+        return values, weights
+    
+    weight_before = np.cumsum(weights) - weights
+    bucket = np.minimum((weight_before / weights.sum() * size).astype(np.int64), size - 1)
+    bucket_weights = np.bincount(bucket, weights=weights, minlength=size)
+    bucket_sums = np.bincount(bucket, weights=values * weights, minlength=size)
+    keep = bucket_weights > 0
+    return bucket_sums[keep] / bucket_weights[keep], bucket_weights[keep]
+
+
+def _merge_top_k(counts_a, counts_b, capacity=TOP_K_CAPACITY):
+    """
+    Merge two Misra-Gries frequent-item summaries
+    
+    Returns:
+        tuple: (merged counts dict, amount subtracted from every counter)
+    """
+    merged = dict(counts_a)
+    for value, count in counts_b.items():
+        merged[value] = merged.get(value, 0) + count
+    
+    if len(merged) <= capacity:
+        return merged, 0
+    
+    # Subtract the (capacity + 1)-th largest count and drop non-positive counters
+    cutoff = sorted(merged.values(), reverse=True)[capacity]
+    merged = {value: count - cutoff for value, count in merged.items() if count > cutoff}
+    return merged, cutoff
+
+
+def _string_value_counts(series):
+    """Count non-null values of a column, keyed by their string form"""
+    counts = series.value_counts()
+    # Categoricals also count their unused categories
+    counts = counts[counts > 0]
+    if not pd.api.types.is_string_dtype(counts.index):
+        # Convert only the distinct values, then fold values with the same text
+        counts.index = counts.index.astype(str)
+        if not counts.index.is_unique:
+            counts = counts.groupby(level=0).sum().sort_values(ascending=False)
+    return counts
+
+
+def create_heavy_hitters(counts, capacity=TOP_K_CAPACITY):
+    """
+    Build a frequent-item summary from exact counts of one chunk
+    
+    The `capacity` most frequent values keep their exact counts. Summaries of
+    different chunks are merged with _merge_top_k (Misra-Gries), after which
+    every kept count is a lower bound at most `error` below the true count.
+    
+    Args:
+        counts: value counts sorted in descending order
+        capacity: maximum number of values to keep
+        
+    Returns:
+        tuple: (value -> count dict, error bound)
+    """
+    top = counts.head(capacity)
+    error = int(counts.iloc[capacity]) if len(counts) > capacity else 0
+    return dict(zip(top.index.tolist(), top.to_numpy(dtype=np.int64).tolist())), error
+
+
+def categorical_aggregates_from_sketch(column_sketch, top_n=TOP_CATEGORIES):
+    """
+    Derive value counts, mode and cardinality from a categorical column sketch
+    
+    Args:
+        column_sketch: categorical sketch from create_column_sketch
+        top_n: number of most frequent values to keep
+        
+    Returns:
+        dict: 'unique', 'mode', 'mode_count', 'top_values', 'top_counts' and
+              'count_error' (maximum undercount of the counts)
+    """
+    top = sorted(column_sketch['top_k'].items(), key=lambda item: item[1], reverse=True)[:top_n]
+    # Counts are exact for a single sketch, and bounded once chunks are merged
+    unique = column_sketch.get('distinct')
+    merged = unique is None or pd.isna(unique)
+    if merged:
+        unique = _hll_estimate(column_sketch['hll'])
+    
+    return {
+        'unique': int(unique),
+        'mode': top[0][0] if top else None,
+        'mode_count': int(top[0][1]) if top else 0,
+        'top_values': [value for value, _ in top],
+        'top_counts': [int(count) for _, count in top],
+        'count_error': int(column_sketch['top_k_error']) if merged else 0
+    }
+
+
+def create_column_sketch(series, kind=None):
+    """
+    Create a mergeable summary of a single column
+    
+    Args:
+        series: pandas Series
+        kind: 'Numerical', 'Temporal' or 'Categorical' (inferred from dtype if None)
+        
+    Returns:
+        dict: counts, moments, quantile sketch, HyperLogLog registers and top-k
+    """
+    kind = kind or classify_feature_type(series)
+    registers = np.zeros(1 << HLL_PRECISION, dtype=np.uint8)
+    sketch = {'kind': kind, 'count': int(len(series)), 'nulls': int(series.isnull().sum())}
+    
+    if kind in ('Numerical', 'Temporal'):
+        if kind == 'Temporal':
+            if not pd.api.types.is_datetime64_any_dtype(series):
+                # The kind comes from another chunk or file where this column parsed as dates
+                series = pd.to_datetime(series, errors='coerce', format='mixed', utc=True).dt.tz_localize(None)
+            # Timestamps are sketched as seconds since the epoch
+            values = _datetime_seconds(series.dropna())
+        else:
+            values = pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        values = values[np.isfinite(values)]
+        quantile_values, quantile_weights = _compress_quantile_sketch(values, np.ones(values.size))
+        sketch.update({
+            'n': int(values.size),
+            'mean': float(values.mean()) if values.size else 0.0,
+            'm2': float(((values - values.mean()) ** 2).sum()) if values.size else 0.0,
+            'min': float(values.min()) if values.size else np.nan,
+            'max': float(values.max()) if values.size else np.nan,
+            'quantile_values': quantile_values,
+            'quantile_weights': quantile_weights,
+            'hll': _hll_update(registers, _hash_values(values)),
+            'top_k': {},
+            'top_k_error': 0
+        })
+    else:
+        counts = _string_value_counts(series)
+        top_k, error = create_heavy_hitters(counts)
+        sketch.update({
+            # Distinct values hash to the same registers as every row would
+            'hll': _hll_update(registers, _hash_values(counts.index.to_numpy(dtype=object))),
+            'top_k': top_k,
+            'top_k_error': error,
+            'distinct': int(len(counts))
+        })
+    
+    return sketch
+
+
+def merge_column_sketches(a, b):
+    """
+    Merge two column sketches built from disjoint sets of rows
+    
+    Args:
+        a, b: dicts returned by create_column_sketch
+        
+    Returns:
+        dict: merged column sketch
+    """
+    if a['kind'] != b['kind']:
+        raise ValueError(f"Cannot merge a {a['kind']} sketch with a {b['kind']} sketch")
+    
+    merged = {
+        'kind': a['kind'],
+        'count': a['count'] + b['count'],
+        'nulls': a['nulls'] + b['nulls'],
+        'hll': np.maximum(a['hll'], b['hll'])
+    }
+    
+    top_k, error = _merge_top_k(a['top_k'], b['top_k'])
+    merged['top_k'] = top_k
+    merged['top_k_error'] = a['top_k_error'] + b['top_k_error'] + error
+    
+    if a['kind'] in ('Numerical', 'Temporal'):
+        n = a['n'] + b['n']
+        delta = b['mean'] - a['mean']
+        quantile_values, quantile_weights = _compress_quantile_sketch(
+            np.concatenate([a['quantile_values'], b['quantile_values']]),
+            np.concatenate([a['quantile_weights'], b['quantile_weights']])
+        )
+        merged.update({
+            'n': n,
+            'mean': a['mean'] + delta * b['n'] / n if n else 0.0,
+            'm2': a['m2'] + b['m2'] + delta ** 2 * a['n'] * b['n'] / n if n else 0.0,
+            'min': np.fmin(a['min'], b['min']),
+            'max': np.fmax(a['max'], b['max']),
+            'quantile_values': quantile_values,
+            'quantile_weights': quantile_weights
+        })
+    
+    return merged
+
+
+def create_comoment_sketch(df, columns):
+    """
+    Create mergeable pairwise co-moments for numerical columns
+    
+    Entry [i, j] of every matrix covers the rows where both columns i and j
+    are present. Sums are taken after shifting each column by its mean, so
+    they do not cancel when a column's mean is large relative to its spread.
+    
+    Args:
+        df: pandas DataFrame
+        columns: numerical column names
+        
+    Returns:
+        dict: pairwise counts 'n', means of column i 'mean', centered sums of
+              squares of column i 'm2' and centered cross products 'comoment'
+    """
+    values = np.column_stack([
+        pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        for col in columns
+    ]) if columns else np.zeros((len(df), 0))
+    present = np.isfinite(values)
+    weights = present.astype(np.float64)
+    n = weights.T @ weights
+    shift = np.where(present, values, 0.0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+    filled = np.where(present, values - shift, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sums = filled.T @ weights
+        mean = np.where(n > 0, sums / n, 0.0)
+        m2 = (filled ** 2).T @ weights - np.where(n > 0, sums * mean, 0.0)
+        comoment = filled.T @ filled - np.where(n > 0, sums * sums.T / n, 0.0)
+    
+    return {
+        'columns': list(columns),
+        'n': n,
+        'mean': mean + shift[:, None],
+        'm2': np.maximum(m2, 0.0),
+        'comoment': comoment
+    }
+
+
+def merge_comoment_sketches(a, b):
+    """
+    Merge two co-moment sketches over the same columns (pairwise Chan update)
+    
+    Args:
+        a, b: dicts returned by create_comoment_sketch
+        
+    Returns:
+        dict: merged co-moment sketch
+    """
+    n = a['n'] + b['n']
+    delta = b['mean'] - a['mean']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(n > 0, a['n'] * b['n'] / n, 0.0)
+        share = np.where(n > 0, b['n'] / n, 0.0)
+    # A side without rows for a pair has a meaningless mean; it gets no weight above
+    delta = np.where(weight > 0, delta, 0.0)
+    mean = np.where(a['n'] > 0, a['mean'] + np.where(b['n'] > 0, delta * share, 0.0), b['mean'])
+    return {
+        'columns': a['columns'],
+        'n': n,
+        'mean': mean,
+        'm2': a['m2'] + b['m2'] + delta ** 2 * weight,
+        'comoment': a['comoment'] + b['comoment'] + delta * delta.T * weight
+    }
+
+
+def comoment_correlation(comoments):
+    """
+    Compute the pairwise Pearson correlation matrix from co-moments
+    
+    Args:
+        comoments: dict returned by create_comoment_sketch
+        
+    Returns:
+        pandas DataFrame correlation matrix
+    """
+    m2 = comoments['m2']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.clip(comoments['comoment'] / np.sqrt(m2 * m2.T), -1, 1)
+    return pd.DataFrame(corr, index=comoments['columns'], columns=comoments['columns'])
+
+
+def create_dataset_sketch(df, kinds=None):
+    """
+    Create a mergeable summary of a DataFrame (or one chunk of it)
+    
+    Args:
+        df: pandas DataFrame
+        kinds: optional {column: feature type} to keep types stable across chunks
+        
+    Returns:
+        dict: row count, per-column sketches and numerical co-moments
+    """
+    kinds = kinds or {col: classify_feature_type(df[col]) for col in df.columns}
+    columns = {col: create_column_sketch(df[col], kinds.get(col)) for col in df.columns}
+    numerical_cols = [col for col, sketch in columns.items() if sketch['kind'] == 'Numerical']
+    
+    return {
+        'n_rows': len(df),
+        'columns': columns,
+        'comoments': create_comoment_sketch(df, numerical_cols)
+    }
+
+
+def merge_dataset_sketches(a, b):
+    """
+    Merge two dataset sketches built from disjoint sets of rows
+    
+    Args:
+        a, b: dicts returned by create_dataset_sketch
+        
+    Returns:
+        dict: merged dataset sketch
+    """
+    columns = dict(a['columns'])
+    for col, sketch in b['columns'].items():
+        columns[col] = merge_column_sketches(columns[col], sketch) if col in columns else sketch
+    
+    if a['comoments']['columns'] == b['comoments']['columns']:
+        comoments = merge_comoment_sketches(a['comoments'], b['comoments'])
+    else:
+        # Schemas differ - keep co-moments of the larger part only
+        comoments = max(a['comoments'], b['comoments'], key=lambda c: c['n'].trace())
+    
+    return {'n_rows': a['n_rows'] + b['n_rows'], 'columns': columns, 'comoments': comoments}
+
+
+def build_dataset_sketch(chunks, kinds=None):
+    """
+    Build a dataset sketch from an iterable of DataFrame chunks
+    
+    Only one chunk is held in memory at a time. Column types are fixed by the
+    first chunk (or by `kinds`) so later chunks are coerced consistently.
+    
+    Args:
+        chunks: iterable of pandas DataFrames
+        kinds: optional {column: feature type} to use instead of the first chunk's
+        
+    Returns:
+        dict: dataset sketch, or None if there were no rows
+    """
+    sketch = None
+    kinds = dict(kinds or {})
+    for chunk in chunks:
+        # Columns without a fixed type take the one inferred from their first chunk
+        kinds.update({col: classify_feature_type(chunk[col]) for col in chunk.columns if col not in kinds})
+        chunk_sketch = create_dataset_sketch(chunk, kinds)
+        sketch = chunk_sketch if sketch is None else merge_dataset_sketches(sketch, chunk_sketch)
+    return sketch
+
+
+def _sketch_cdf(column_sketch, points):
+    """Evaluate the empirical CDF of a numerical column sketch"""
+    weights = column_sketch['quantile_weights']
+    total = weights.sum()
+    if total == 0:
+        return np.full(len(points), np.nan)
+    positions = np.concatenate([[0.0], (np.cumsum(weights) - weights / 2) / total, [1.0]])
+    values = np.concatenate([[column_sketch['min']], column_sketch['quantile_values'], [column_sketch['max']]])
+    return np.interp(points, values, positions)
+
+
+def _sketch_quantiles(column_sketch, quantiles):
+    """Estimate quantiles of a numerical column sketch"""
+    weights = column_sketch['quantile_weights']
+    total = weights.sum()
+    if total == 0:
+        return np.full(len(quantiles), np.nan)
+    positions = np.concatenate([[0.0], (np.cumsum(weights) - weights / 2) / total, [1.0]])
+    values = np.concatenate([[column_sketch['min']], column_sketch['quantile_values'], [column_sketch['max']]])
+    return np.interp(quantiles, positions, values)
+
+
+def population_stability_index(expected, actual, epsilon=1e-4):
+    """
+    Compute the Population Stability Index between two binned distributions
+    
+    Args:
+        expected: baseline bin fractions
+        actual: current bin fractions
+        
+    Returns:
+        float: PSI (< 0.1 stable, 0.1-0.2 moderate shift, > 0.2 major shift)
+    """
+    expected = np.clip(np.asarray(expected, dtype=np.float64), epsilon, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), epsilon, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _numeric_drift(base, current):
+    """Compute PSI over baseline deciles and the KS distance for numerical sketches"""
+    if base['n'] == 0 or current['n'] == 0:
+        return np.nan, np.nan
+    
+    edges = np.unique(_sketch_quantiles(base, np.linspace(0.1, 0.9, 9)))
+    base_cdf = np.concatenate([[0.0], _sketch_cdf(base, edges), [1.0]])
+    current_cdf = np.concatenate([[0.0], _sketch_cdf(current, edges), [1.0]])
+    psi = population_stability_index(np.diff(base_cdf), np.diff(current_cdf))
+    
+    grid = np.union1d(base['quantile_values'], current['quantile_values'])
+    ks = float(np.max(np.abs(_sketch_cdf(base, grid) - _sketch_cdf(current, grid))))
+    return psi, ks
+
+
+def _categorical_drift(base, current):
+    """Compute PSI over top-k categories plus new and missing categories"""
+    base_total = base['count'] - base['nulls']
+    current_total = current['count'] - current['nulls']
+    if base_total == 0 or current_total == 0:
+        return np.nan, [], []
+    
+    categories = sorted(set(base['top_k']) | set(current['top_k']))
+    base_fractions = np.array([base['top_k'].get(c, 0) for c in categories]) / base_total
+    current_fractions = np.array([current['top_k'].get(c, 0) for c in categories]) / current_total
+    # Remaining mass goes into an "other" bucket
+    base_fractions = np.append(base_fractions, max(0.0, 1 - base_fractions.sum()))
+    current_fractions = np.append(current_fractions, max(0.0, 1 - current_fractions.sum()))
+    psi = population_stability_index(base_fractions, current_fractions)
+    
+    new_categories = [c for c in current['top_k'] if c not in base['top_k']]
+    missing_categories = [c for c in base['top_k'] if c not in current['top_k']]
+    return psi, new_categories, missing_categories
+
+
+def compare_dataset_sketches(base, current, corr_threshold=CORRELATION_DRIFT_THRESHOLD):
+    """
+    Compare two dataset sketches column by column
+    
+    Args:
+        base: baseline dataset sketch
+        current: current dataset sketch
+        corr_threshold: minimum absolute change to report a correlation delta
+        
+    Returns:
+        tuple: (drift DataFrame, correlation changes DataFrame)
+    """
+    drift_rows = []
+    all_columns = list(base['columns']) + [col for col in current['columns'] if col not in base['columns']]
+    
+    for col in all_columns:
+        a = base['columns'].get(col)
+        b = current['columns'].get(col)
+        status = 'Both' if a is not None and b is not None else ('Removed' if b is None else 'Added')
+        if status == 'Both' and a['kind'] != b['kind']:
+            # Distributions of different kinds cannot be compared, and the change itself is the drift
+            status = 'Type changed'
+        row = {
+            'Column Name': col,
+            'Status': status,
+            'Feature Type': f"{a['kind']} → {b['kind']}" if status == 'Type changed' else (a or b)['kind'],
+            'Null % (Baseline)': round(a['nulls'] / a['count'] * 100, 2) if a and a['count'] else np.nan,
+            'Null % (Current)': round(b['nulls'] / b['count'] * 100, 2) if b and b['count'] else np.nan,
+            'Unique Values (Baseline)': _hll_estimate(a['hll']) if a else np.nan,
+            'Unique Values (Current)': _hll_estimate(b['hll']) if b else np.nan,
+            'Mean (Baseline)': np.nan, 'Mean (Current)': np.nan,
+            'Std (Baseline)': np.nan, 'Std (Current)': np.nan,
+            'PSI': np.nan, 'KS': np.nan,
+            'New Categories': '', 'Missing Categories': ''
+        }
+        row['Null % Change'] = round(row['Null % (Current)'] - row['Null % (Baseline)'], 2)
+        
+        for label, sketch in (('Baseline', a), ('Current', b)):
+            if sketch is not None and sketch['kind'] == 'Numerical' and sketch['n'] > 0:
+                row[f'Mean ({label})'] = round(sketch['mean'], 2)
+                row[f'Std ({label})'] = round(np.sqrt(sketch['m2'] / (sketch['n'] - 1)), 2) if sketch['n'] > 1 else np.nan
+        
+        if status == 'Both':
+            if a['kind'] in ('Numerical', 'Temporal'):
+                psi, ks = _numeric_drift(a, b)
+                row['KS'] = round(ks, 4)
+            else:
+                psi, new_categories, missing_categories = _categorical_drift(a, b)
+                row['New Categories'] = ', '.join(str(c) for c in new_categories[:10])
+                row['Missing Categories'] = ', '.join(str(c) for c in missing_categories[:10])
+            row['PSI'] = round(psi, 4)
+        
+        if status != 'Both':
+            row['Drift'] = status
+        elif row['PSI'] >= 0.2 or row['KS'] > 0.1:
+            row['Drift'] = 'High'
+        elif row['PSI'] >= 0.1 or abs(row['Null % Change']) > 5:
+            row['Drift'] = 'Moderate'
+        else:
+            row['Drift'] = 'Stable'
+        
+        drift_rows.append(row)
+    
+    drift_df = pd.DataFrame(drift_rows, columns=[
+        'Column Name', 'Status', 'Feature Type', 'Drift',
+        'Null % (Baseline)', 'Null % (Current)', 'Null % Change',
+        'Unique Values (Baseline)', 'Unique Values (Current)',
+        'Mean (Baseline)', 'Mean (Current)', 'Std (Baseline)', 'Std (Current)',
+        'PSI', 'KS', 'New Categories', 'Missing Categories'
+    ])
+    
+    # Correlation deltas over numerical columns present in both datasets
+    base_corr = comoment_correlation(base['comoments'])
+    current_corr = comoment_correlation(current['comoments'])
+    common = [col for col in base_corr.columns if col in current_corr.columns]
+    before = base_corr.loc[common, common].to_numpy()
+    after = current_corr.loc[common, common].to_numpy()
+    rows, cols = np.triu_indices(len(common), k=1)
+    changed = np.abs(after[rows, cols] - before[rows, cols]) > corr_threshold
+    rows, cols = rows[changed], cols[changed]
+    
+    corr_changes_df = pd.DataFrame({
+        'Feature 1': [common[i] for i in rows],
+        'Feature 2': [common[j] for j in cols],
+        'r (Baseline)': before[rows, cols].round(2),
+        'r (Current)': after[rows, cols].round(2),
+        'Change': (after[rows, cols] - before[rows, cols]).round(2)
+    })
+    corr_changes_df = corr_changes_df.reindex(corr_changes_df['Change'].abs().sort_values(ascending=False).index)
+    
+    return drift_df, corr_changes_df
+
+
+def list_partition_files(directory, extensions=PARTITION_FILE_TYPES):
+    """
+    List the data files under a directory, recursively and in sorted order
+    
+    Args:
+        directory: path of a local directory (e.g. a Hive-style partitioned export)
+        extensions: data file extensions to include (compressed CSV parts are included too)
+        
+    Returns:
+        list of file paths
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files)
+                     if split_file_name(name)[0] in extensions)
+    return paths
+
+
+def sketch_partition(source, kinds=None):
+    """
+    Build the dataset sketch of one partition, streaming it chunk by chunk
+    
+    Args:
+        source: file path or uploaded file object
+        kinds: optional {column: feature type} shared by all partitions
+        
+    Returns:
+        dict: dataset sketch (with zero rows for an empty partition)
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return sketch_partition(f, kinds)
+    sketch = build_dataset_sketch(iter_data_chunks(source), kinds)
+    return sketch if sketch is not None else {
+        'n_rows': 0, 'columns': {}, 'comoments': create_comoment_sketch(pd.DataFrame(), [])
+    }
+
+
+def profile_partitions(sources, workers=PARTITION_WORKERS):
+    """
+    Sketch every partition in parallel and merge the sketches into one
+    
+    The first partition fixes the column types so every partition is sketched
+    consistently; the others are sketched by a pool of worker threads. Only
+    one chunk per worker is in memory at a time and the partitions are never
+    concatenated.
+    
+    Args:
+        sources: list of file paths or uploaded file objects
+        workers: number of worker threads
+        
+    Returns:
+        tuple: (list of partition sketches, merged dataset sketch)
+    """
+    first = sketch_partition(sources[0])
+    kinds = {col: column_sketch['kind'] for col, column_sketch in first['columns'].items()}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        sketches = [first] + list(pool.map(lambda source: sketch_partition(source, kinds), sources[1:]))
+    
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged = merge_dataset_sketches(merged, sketch)
+    return sketches, merged
+
+
+def summarize_dataset_sketch(sketch):
+    """
+    Build a feature summary table from a (merged) dataset sketch
+    
+    Args:
+        sketch: dataset sketch
+        
+    Returns:
+        pandas DataFrame with one row per column; unique counts, quantiles and
+        top values are estimated from the sketches
+    """
+    rows = []
+    for col, column_sketch in sketch['columns'].items():
+        row = {
+            'Column Name': col,
+            'Feature Type': column_sketch['kind'],
+            'Null Values': column_sketch['nulls'],
+            'Null %': round(column_sketch['nulls'] / column_sketch['count'] * 100, 2) if column_sketch['count'] else np.nan,
+            'Unique Values': _hll_estimate(column_sketch['hll']),
+            'Mean': np.nan, 'Std': np.nan, 'Min': np.nan, 'Median': np.nan, 'Max': np.nan,
+            'Most Frequent': ''
+        }
+        if column_sketch['kind'] == 'Numerical' and column_sketch['n'] > 0:
+            n = column_sketch['n']
+            row.update({
+                'Mean': column_sketch['mean'],
+                'Std': np.sqrt(column_sketch['m2'] / (n - 1)) if n > 1 else np.nan,
+                'Min': column_sketch['min'],
+                'Median': _sketch_quantiles(column_sketch, [0.5])[0],
+                'Max': column_sketch['max']
+            })
+        elif column_sketch['kind'] == 'Categorical':
+            mode = categorical_aggregates_from_sketch(column_sketch, top_n=1)['mode']
+            row['Most Frequent'] = '' if mode is None else str(mode)
+        rows.append(row)
+    return pd.DataFrame(rows).round({'Mean': 2, 'Std': 2, 'Min': 2, 'Median': 2, 'Max': 2})
+
+
+def compare_partitions(names, sketches, merged, row_deviation=PARTITION_ROW_DEVIATION):
+    """
+    Compare every partition against the whole dataset and flag deviations
+    
+    Each partition sketch is compared with the merged sketch using the same
+    PSI/KS rules as the drift report. A partition is flagged when a column
+    drifts strongly, its schema differs, or its row count is far from the
+    median partition.
+    
+    Args:
+        names: partition names
+        sketches: partition sketches, aligned with names
+        merged: merged dataset sketch
+        row_deviation: relative distance from the median row count that is flagged
+        
+    Returns:
+        tuple: (partition DataFrame, {partition name: drift DataFrame})
+    """
+    median_rows = float(np.median([sketch['n_rows'] for sketch in sketches]))
+    rows = []
+    drift_tables = {}
+    for name, sketch in zip(names, sketches):
+        drift_df, corr_changes_df = compare_dataset_sketches(merged, sketch)
+        drift_tables[name] = drift_df
+        # Columns missing from a partition show up as 'Removed' relative to the whole
+        schema_changes = drift_df.loc[drift_df['Status'] != 'Both', 'Column Name'].tolist()
+        high = drift_df.loc[drift_df['Drift'] == 'High', 'Column Name'].tolist()
+        moderate = drift_df.loc[drift_df['Drift'] == 'Moderate', 'Column Name'].tolist()
+        row_change = sketch['n_rows'] / median_rows - 1 if median_rows else 0.0
+        
+        reasons = []
+        if schema_changes:
+            reasons.append(f"schema differs ({', '.join(map(str, schema_changes[:5]))})")
+        if high:
+            reasons.append(f"high drift in {', '.join(map(str, high[:5]))}")
+        if abs(row_change) > row_deviation:
+            reasons.append(f"row count {row_change:+.0%} vs median")
+        
+        rows.append({
+            'Partition': name,
+            'Rows': sketch['n_rows'],
+            'Drift': 'High' if reasons else ('Moderate' if moderate else 'Stable'),
+            'High Drift Columns': len(high),
+            'Moderate Drift Columns': len(moderate),
+            'Max PSI': drift_df['PSI'].max(),
+            'Max KS': drift_df['KS'].max(),
+            'Correlation Changes': len(corr_changes_df),
+            'Reasons': '; '.join(reasons)
+        })
+    
+    partitions_df = pd.DataFrame(rows, columns=[
+        'Partition', 'Rows', 'Drift', 'High Drift Columns', 'Moderate Drift Columns',
+        'Max PSI', 'Max KS', 'Correlation Changes', 'Reasons'
+    ])
+    return partitions_df, drift_tables
+
+
+@lru_cache(maxsize=None)
+def _popcount_table():
+    """Number of set bits for every byte value (fallback when np.bitwise_count is unavailable)"""
+    return np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_sum(words, axis=-1):
+    """Count set bits in a uint64 array, summed along an axis"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=axis, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _popcount_table()[as_bytes].sum(axis=axis, dtype=np.int64)
+
+
+def compute_null_bitmaps(df):
+    """
+    Pack the null mask of every column with missing values into bitmaps
+    
+    Each column is stored with one bit per row (padded to 64-bit words), so
+    the whole missingness matrix takes 1/8 of a boolean frame.
+    
+    Args:
+        df: pandas DataFrame
+        
+    Returns:
+        tuple: (column names, uint64 array of shape (columns, words), null counts)
+    """
+    n_words = -(-len(df) // 64)
+    columns, bitmaps, null_counts = [], [], []
+    for col in df.columns:
+        is_null = df[col].isna().to_numpy()
+        null_count = int(is_null.sum())
+        if null_count == 0:
+            continue
+        packed = np.zeros(n_words * 8, dtype=np.uint8)
+        packed[:-(-len(df) // 8)] = np.packbits(is_null, bitorder='little')
+        columns.append(col)
+        bitmaps.append(packed.view(np.uint64))
+        null_counts.append(null_count)
+    
+    bitmaps = np.vstack(bitmaps) if bitmaps else np.zeros((0, n_words), dtype=np.uint64)
+    return columns, bitmaps, np.array(null_counts, dtype=np.int64)
+
+
+def compute_null_cooccurrence(bitmaps, block_words=NULL_BITMAP_BLOCK_WORDS):
+    """
+    Count, for every pair of columns, the rows where both values are missing
+    
+    Args:
+        bitmaps: uint64 array from compute_null_bitmaps
+        block_words: words processed per block (bounds temporary memory)
+        
+    Returns:
+        numpy int64 array of shape (columns, columns)
+    """
+    n_cols, n_words = bitmaps.shape
+    counts = np.zeros((n_cols, n_cols), dtype=np.int64)
+    for start in range(0, n_words, block_words):
+        block = bitmaps[:, start:start + block_words]
+        for i in range(n_cols):
+            counts[i, i:] += _popcount_sum(block[i] & block[i:], axis=1)
+    return np.triu(counts) + np.triu(counts, 1).T
+
+
+def compute_missingness_patterns(bitmaps, n_rows, top_n=10, block_rows=1 << 20):
+    """
+    Find the most common combinations of missing columns across rows
+    
+    Args:
+        bitmaps: uint64 array from compute_null_bitmaps
+        n_rows: number of rows
+        top_n: number of patterns to return
+        block_rows: rows decoded per block
+        
+    Returns:
+        list of (pattern code, row count) where bit j of the (arbitrarily
+        wide) integer code means column j is missing
+    """
+    pattern_counts = {}
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        words = bitmaps[:, start // 64:-(-stop // 64)]
+        bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder='little')
+        bits = bits[:, start % 64:start % 64 + (stop - start)]
+        # One 64-bit code word per group of 64 columns; wide tables key rows on all of them
+        codes = np.zeros((stop - start, -(-bits.shape[0] // 64)), dtype=np.uint64)
+        for j in range(bits.shape[0]):
+            codes[:, j // 64] |= bits[j].astype(np.uint64) << np.uint64(j % 64)
+        if codes.shape[1] == 1:
+            values, counts = np.unique(codes[:, 0], return_counts=True)
+            values = values[:, None]
+        else:
+            values, counts = np.unique(codes, axis=0, return_counts=True)
+        for words, count in zip(values.tolist(), counts.tolist()):
+            code = sum(word << (64 * w) for w, word in enumerate(words))
+            pattern_counts[code] = pattern_counts.get(code, 0) + count
+    return sorted(pattern_counts.items(), key=lambda item: -item[1])[:top_n]
+
+
+def compute_missingness(df, bins=NULLITY_HEATMAP_BINS):
+    """
+    Build the missingness profile from packed null bitmaps
+    
+    Args:
+        df: pandas DataFrame
+        bins: number of row bins in the nullity heatmap
+        
+    Returns:
+        dict: columns with nulls, null counts, co-occurrence matrix, binned
+              nullity heatmap and the most common missingness patterns
+    """
+    n_rows = len(df)
+    columns, bitmaps, null_counts = compute_null_bitmaps(df)
+    
+    # Row bins aligned to 64-row words so each bin is a popcount over whole words
+    words_per_bin = max(1, -(-bitmaps.shape[1] // bins))
+    n_bins = -(-bitmaps.shape[1] // words_per_bin) if bitmaps.shape[1] else 0
+    heatmap = np.zeros((len(columns), n_bins), dtype=np.float64)
+    for b in range(n_bins):
+        block = bitmaps[:, b * words_per_bin:(b + 1) * words_per_bin]
+        heatmap[:, b] = _popcount_sum(block, axis=1)
+    bin_starts = np.arange(n_bins) * words_per_bin * 64
+    bin_rows = np.minimum(bin_starts + words_per_bin * 64, n_rows) - bin_starts
+    if n_bins:
+        heatmap /= bin_rows
+    
+    patterns = []
+    for code, count in compute_missingness_patterns(bitmaps, n_rows):
+        missing = [columns[j] for j in range(len(columns)) if code >> j & 1]
+        patterns.append((missing, count))
+    
+    return {
+        'n_rows': n_rows,
+        'columns': columns,
+        'null_counts': null_counts,
+        'cooccurrence': compute_null_cooccurrence(bitmaps),
+        'heatmap': heatmap,
+        'bin_starts': bin_starts,
+        'patterns': patterns
+    }
+
+
+def plot_correlation_heatmap(corr_matrix):
+    """
+    Create correlation heatmap using plotly
+    
+    Args:
+        corr_matrix: pandas DataFrame correlation matrix
+        
+    Returns:
+        plotly figure
+    """
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix.values,
+        x=corr_matrix.columns,
+        y=corr_matrix.columns,
+        colorscale='RdBu',
+        zmid=0,
+        text=corr_matrix.values.round(2),
+        texttemplate='%{text}',
+        textfont={"size": 10},
+        colorbar=dict(title="Correlation")
+    ))
+    
+    fig.update_layout(
+        title="Correlation Heatmap",
+        xaxis_title="Features",
+        yaxis_title="Features",
+        height=600,
+        width=800
+    )
+    
+    return fig
+
+
+def plot_association_heatmap(matrix, title, colorbar_title):
+    """
+    Create a heatmap for an association matrix with values in [0, 1]
+    
+    Args:
+        matrix: square pandas DataFrame
+        title: chart title
+        colorbar_title: label for the color scale
+        
+    Returns:
+        plotly figure
+    """
+    fig = go.Figure(data=go.Heatmap(
+        z=matrix.values,
+        x=matrix.columns,
+        y=matrix.index,
+        colorscale='Blues',
+        zmin=0,
+        zmax=1,
+        text=matrix.values.round(2),
+        texttemplate='%{text}',
+        textfont={"size": 10},
+        colorbar=dict(title=colorbar_title)
+    ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="Features",
+        yaxis_title="Features",
+        height=600,
+        width=800
+    )
+    
+    return fig
+
+
+def plot_histogram(df, column):
+    """
+    Create histogram with marginal box plot for numerical column
+    
+    Args:
+        df: pandas DataFrame
+        column: column name
+        
+    Returns:
+        plotly figure
+    """
+    return plot_histogram_from_aggregates(compute_numeric_aggregates(df[column]), column)
+
+
+def plot_histogram_from_aggregates(aggregates, column):
+    """
+    Create histogram with marginal box plot from precomputed aggregates
+    
+    Args:
+        aggregates: dict returned by compute_numeric_aggregates
+        column: column name
+        
+    Returns:
+        plotly figure
+    """
+    edges = aggregates['hist_edges']
+    fig = plotly_subplots.make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+    
+    # Box plot above the histogram
+    fig.add_trace(go.Box(
+        q1=[aggregates['q1']],
+        median=[aggregates['median']],
+        q3=[aggregates['q3']],
+        lowerfence=[aggregates['lower_fence']],
+        upperfence=[aggregates['upper_fence']],
+        mean=[aggregates['mean']],
+        y=[column],
+        orientation='h',
+        marker_color='#667eea',
+        name=column
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=aggregates['hist_counts'],
+        width=np.diff(edges) * 0.9,
+        marker_color='#667eea',
+        name=column
+    ), row=2, col=1)
+    
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_yaxes(title_text='Frequency', row=2, col=1)
+    fig.update_xaxes(title_text=column, row=2, col=1)
+    fig.update_layout(
+        title=f"Distribution & Outlier Analysis: {column}",
+        showlegend=False,
+        height=500
+    )
+    
+    return fig
+
+
+def plot_density_grid(grid, x_col, y_col):
+    """
+    Create a density heatmap of two numerical columns from a binned grid
+    
+    Cell colors use a log scale so sparse regions stay visible next to dense
+    ones; raw points, when the grid carries them, are drawn on top.
+    
+    Args:
+        grid: dict returned by compute_density_grid
+        x_col: x-axis column name
+        y_col: y-axis column name
+        
+    Returns:
+        plotly figure
+    """
+    x_edges, y_edges, counts = grid['x_edges'], grid['y_edges'], grid['counts']
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(counts > 0, np.log10(np.maximum(counts, 1)).round(3), np.nan),
+        customdata=counts,
+        colorscale='Viridis',
+        colorbar=dict(title='log10(rows)'),
+        hovertemplate=f"{x_col}: %{{x:.4g}}<br>{y_col}: %{{y:.4g}}<br>Rows: %{{customdata:,}}<extra></extra>"
+    ))
+    
+    if grid['points'] is not None:
+        fig.add_trace(go.Scattergl(
+            x=grid['points'][0],
+            y=grid['points'][1],
+            mode='markers',
+            marker=dict(size=4, color='#e53e3e', opacity=0.6),
+            name='Rows',
+            hovertemplate=f"{x_col}: %{{x:.4g}}<br>{y_col}: %{{y:.4g}}<extra></extra>"
+        ))
+    
+    fig.update_xaxes(title_text=x_col, range=[x_edges[0], x_edges[-1]])
+    fig.update_yaxes(title_text=y_col, range=[y_edges[0], y_edges[-1]])
+    fig.update_layout(
+        title=f"Density of {y_col} vs {x_col}",
+        showlegend=False,
+        height=550
+    )
+    
+    return fig
+
+
+def plot_boxplot(df, column):
+    """
+    Create box plot for numerical column
+    
+    Args:
+        df: pandas DataFrame
+        column: column name
+        
+    Returns:
+        plotly figure
+    """
+    fig = px.box(
+        df, 
+        y=column,
+        title=f"Box Plot of {column}",
+        color_discrete_sequence=['#2ca02c']
+    )
+    
+    fig.update_layout(
+        showlegend=False,
+        height=400
+    )
+    
+    return fig
+
+
+def plot_group_boxplot(group_stats, labels, num_col, cat_col):
+    """
+    Create one box per category from precomputed group statistics
+    
+    Args:
+        group_stats: dict returned by compute_group_statistics
+        labels: category labels aligned with group_stats
+        num_col: numerical column name
+        cat_col: categorical column name
+        
+    Returns:
+        plotly figure
+    """
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    
+    for i, label in enumerate(labels):
+        fig.add_trace(go.Box(
+            x=[label],
+            q1=[group_stats['q1'][i]],
+            median=[group_stats['median'][i]],
+            q3=[group_stats['q3'][i]],
+            lowerfence=[group_stats['lower_fence'][i]],
+            upperfence=[group_stats['upper_fence'][i]],
+            mean=[group_stats['mean'][i]],
+            name=label,
+            marker_color=colors[i % len(colors)]
+        ))
+    
+    fig.update_layout(
+        title=f"{num_col} Distribution Across {cat_col}",
+        xaxis_title=cat_col,
+        yaxis_title=num_col,
+        showlegend=False,
+        xaxis_tickangle=-45,
+        height=500
+    )
+    
+    return fig
+
+
+def plot_categorical_bar(df, column):
+    """
+    Create bar chart for categorical column
+    
+    Args:
+        df: pandas DataFrame
+        column: column name
+        
+    Returns:
+        plotly figure
+    """
+    return plot_categorical_bar_from_aggregates(compute_categorical_aggregates(df[column]), column)
+
+
+def plot_categorical_bar_from_aggregates(aggregates, column):
+    """
+    Create bar chart for categorical column from precomputed value counts
+    
+    Args:
+        aggregates: dict returned by compute_categorical_aggregates
+        column: column name
+        
+    Returns:
+        plotly figure
+    """
+    fig = px.bar(
+        x=[str(value) for value in aggregates['top_values']],
+        y=aggregates['top_counts'],
+        title=f"Value Counts for {column} (Top {TOP_CATEGORIES})",
+        labels={'x': column, 'y': 'Count'},
+        color_discrete_sequence=['#ff7f0e']
+    )
+    
+    fig.update_layout(
+        showlegend=False,
+        height=400,
+        xaxis_tickangle=-45
+    )
+    
+    return fig
+
+
+def plot_text_length_histogram(aggregates, column):
+    """
+    Create a string length histogram from precomputed text aggregates
+    
+    Args:
+        aggregates: dict returned by compute_text_aggregates
+        column: column name
+        
+    Returns:
+        plotly figure
+    """
+    edges = aggregates['length_hist_edges']
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=aggregates['length_hist_counts'],
+        width=np.diff(edges) * 0.9,
+        marker_color='#ff7f0e',
+        name=column
+    ))
+    
+    fig.update_layout(
+        title=f"String Length Distribution: {column}",
+        xaxis_title='Length (characters)',
+        yaxis_title='Frequency',
+        showlegend=False,
+        height=400
+    )
+    
+    return fig
+
+
+def plot_time_series(series_df, column, value_label):
+    """
+    Plot a resampled time series, with a min-max band when available
+    
+    Args:
+        series_df: DataFrame returned by aggregate_time_series
+        column: datetime column name
+        value_label: label of the plotted value
+        
+    Returns:
+        plotly figure
+    """
+    fig = go.Figure()
+    
+    if 'count' in series_df.columns:
+        fig.add_trace(go.Scatter(x=series_df.index, y=series_df['count'], mode='lines', name='Rows',
+                                 line=dict(color='#667eea')))
+    else:
+        fig.add_trace(go.Scatter(x=series_df.index, y=series_df['max'], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=series_df.index, y=series_df['min'], mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor='rgba(102, 126, 234, 0.2)', name='Min-Max'))
+        fig.add_trace(go.Scatter(x=series_df.index, y=series_df['mean'], mode='lines', name='Mean',
+                                 line=dict(color='#667eea')))
+    
+    fig.update_layout(
+        title=f'{value_label} over {column}',
+        xaxis_title=column,
+        yaxis_title=value_label,
+        height=400,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+
+def plot_missing_values(df):
+    """
+    Create bar chart for missing values
+    
+    Args:
+        df: pandas DataFrame
+        
+    Returns:
+        plotly figure
+    """
+    missing_counts = df.isnull().sum()
+    missing_counts = missing_counts[missing_counts > 0].sort_values(ascending=False)
+    
+    if len(missing_counts) == 0:
+        return None
+    
+    fig = px.bar(
+        x=missing_counts.index,
+        y=missing_counts.values,
+        title="Missing Values by Column",
+        labels={'x': 'Column', 'y': 'Missing Count'},
+        color_discrete_sequence=['#d62728']
+    )
+    
+    fig.update_layout(
         showlegend=False,
-        height=400
+        height=400,
+        xaxis_tickangle=-45
+    )
+    
+    return fig
+
+
+
+
+def plot_nullity_heatmap(missingness):
+    """
+    Create a compact nullity heatmap (share of missing values per row bin)
+    
+    Args:
+        missingness: dict returned by compute_missingness
+        
+    Returns:
+        plotly figure
+    """
+    fig = go.Figure(data=go.Heatmap(
+        z=missingness['heatmap'] * 100,
+        x=missingness['bin_starts'],
+        y=[str(col) for col in missingness['columns']],
+        colorscale='Reds',
+        zmin=0,
+        zmax=100,
+        colorbar=dict(title="Missing %"),
+        hovertemplate="Column: %{y}<br>Rows from: %{x}<br>Missing: %{z:.1f}%<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title="Nullity Heatmap (rows grouped into bins)",
+        xaxis_title="Row",
+        yaxis_title="Column",
+        height=max(300, 25 * len(missingness['columns']) + 150)
+    )
+    
+    return fig
+
+
+def plot_null_cooccurrence(missingness):
+    """
+    Create a heatmap of how often columns are missing together
+    
+    Args:
+        missingness: dict returned by compute_missingness
+        
+    Returns:
+        plotly figure
+    """
+    counts = missingness['cooccurrence']
+    # P(column missing | row column missing)
+    conditional = counts / np.maximum(np.diag(counts), 1)[:, None] * 100
+    labels = [str(col) for col in missingness['columns']]
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=conditional,
+        x=labels,
+        y=labels,
+        colorscale='Reds',
+        zmin=0,
+        zmax=100,
+        customdata=counts,
+        colorbar=dict(title="% co-missing"),
+        hovertemplate="When %{y} is missing, %{x} is also missing in %{z:.1f}% of rows (%{customdata:,} rows)<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title="Null Co-occurrence",
+        xaxis_title="Also missing",
+        yaxis_title="Missing column",
+        height=max(400, 25 * len(labels) + 150)
+    )
+    
+    return fig
+
+
+
+
+def generate_comprehensive_report(profile):
+    """Generate a comprehensive Excel report with all analysis results"""
+    output = BytesIO()
+    summary_df = profile['summary_df']
+    quality_report = profile['quality_report']
+    stats_df = profile['stats_df']
+    corr_matrix = profile['corr_matrix']
+    
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        # Sheet 1: Overview
+        overview_data = {
+            'Metric': ['File Type', 'Total Rows', 'Total Columns', 'Memory Usage (MB)', 
+                      'Duplicate Rows', 'Columns with Missing Values'],
+            'Value': [
+                profile['file_type'],
+                profile['n_rows'],
+                profile['n_cols'],
+                f"{profile['memory_mb']:.2f}",
+                quality_report['duplicate_rows'],
+                len(quality_report['columns_with_missing'])
+            ]
+        }
+        pd.DataFrame(overview_data).to_excel(writer, sheet_name='Overview', index=False)
+        
+        # Sheet 2: Feature Summary
+        summary_df.to_excel(writer, sheet_name='Feature Summary', index=False)
+        
+        # Sheet 3: Data Quality Issues
+        quality_data = []
+        for col, count, pct in quality_report['columns_with_missing']:
+            quality_data.append({'Issue Type': 'Missing Values', 'Column': col, 'Details': f"{count} missing ({pct:.2f}%)"})
+        for col in quality_report['constant_features']:
+            quality_data.append({'Issue Type': 'Constant Feature', 'Column': col, 'Details': 'Only 1 unique value'})
+        for col in quality_report['columns_all_zeros']:
+            quality_data.append({'Issue Type': 'All Zeros', 'Column': col, 'Details': 'All values are zero'})
+        for col in quality_report['type_mismatch']:
+            quality_data.append({'Issue Type': 'Type Mismatch', 'Column': col, 'Details': 'Numeric stored as categorical'})
+        
+        if quality_data:
+            pd.DataFrame(quality_data).to_excel(writer, sheet_name='Quality Issues', index=False)
+        
+        # Sheet 4: Descriptive Statistics
+        if stats_df is not None:
+            stats_df.to_excel(writer, sheet_name='Descriptive Stats')
+        
+        # Sheet 5: Correlation Matrix
+        if corr_matrix is not None:
+            corr_matrix.to_excel(writer, sheet_name='Correlation Matrix')
+        
+        # Sheet 6: Categorical Associations
+        if profile['categorical_association']['cramers_v'] is not None:
+            profile['categorical_association']['cramers_v'].to_excel(writer, sheet_name='Categorical Associations')
+        
+        # Sheet 7: Time Series
+        if profile['temporal_aggregates']:
+            pd.DataFrame([
+                {'Column': col, 'Start': aggregates['min'], 'End': aggregates['max'],
+                 'Frequency': aggregates['frequency'] or 'Irregular', 'Gaps': aggregates['gap_count']}
+                for col, aggregates in profile['temporal_aggregates'].items()
+            ]).to_excel(writer, sheet_name='Time Series', index=False)
+        
+        # Sheet 8: Text Profile
+        if profile['text_aggregates']:
+            pd.DataFrame([
+                {'Column': col, 'Detected Type': aggregates['semantic_type'],
+                 'Avg Length': round(aggregates['mean_length'], 2), 'Max Length': aggregates['max_length'],
+                 'Empty': aggregates['empty'], 'Whitespace Only': aggregates['whitespace_only'],
+                 'Patterns': aggregates['pattern_count'],
+                 'Top Pattern': aggregates['top_patterns'][0] if aggregates['top_patterns'] else None}
+                for col, aggregates in profile['text_aggregates'].items()
+            ]).to_excel(writer, sheet_name='Text Profile', index=False)
+        
+        # Sheet 9: Outliers
+        if not profile['outlier_scan']['summary'].empty:
+            profile['outlier_scan']['summary'].to_excel(writer, sheet_name='Outliers', index=False)
+        
+        # Sheet 10: Associations
+        if not profile['associations'].empty:
+            profile['associations'].round(4).to_excel(writer, sheet_name='Associations', index=False)
+        
+        # Sheet 11: Data Preview
+        profile['preview'].head(PREVIEW_ROWS).to_excel(writer, sheet_name='Data Preview', index=False)
+    
+    output.seek(0)
+    return output
+
+
+def compute_file_hash(uploaded_file):
+    """
+    Compute a SHA-256 content hash of an uploaded file
+    
+    Args:
+        uploaded_file: file-like object
+        
+    Returns:
+        str: hex digest
+    """
+    hasher = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in iter(lambda: uploaded_file.read(1024 * 1024), b''):
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def get_uploaded_file_hash(uploaded_file):
+    """
+    Return the content hash of an upload, computed once per session
+    
+    Uploads keep their file_id across reruns, so the hash is memoized by it.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        
+    Returns:
+        str: hex digest
+    """
+    file_id = getattr(uploaded_file, 'file_id', None)
+    file_hashes = st.session_state.setdefault('file_hashes', {})
+    file_hash = file_hashes.get(file_id) if file_id else None
+    if file_hash is None:
+        file_hash = compute_file_hash(uploaded_file)
+        if file_id:
+            file_hashes[file_id] = file_hash
+    return file_hash
+
+
+def build_profile(df, file_type, file_name=None, file_hash=None, diagnostics=None, backend='pandas'):
+    """
+    Run every analysis step and collect the results into a single profile
+    
+    Args:
+        df: pandas DataFrame
+        file_type: 'CSV', 'Excel' or 'Parquet'
+        file_name: original file name
+        file_hash: content hash of the original file
+        diagnostics: optional diagnostics dict to record per-stage timings
+        backend: compute backend for the core tables ('pandas' or 'polars')
+        
+    Returns:
+        dict: profile with summary, quality report, statistics, correlations
+              and per-column histogram/box/value-count aggregates
+    """
+    summary_df, quality_report, stats_df, corr_matrix, strong_corr, insights = compute_core_tables(
+        df, backend, diagnostics
+    )
+    
+    with measure_stage(diagnostics, "Categorical associations"):
+        categorical_association = compute_categorical_association(df)
+    
+    # Column sketches carry the frequent-item summaries used for value counts
+    with measure_stage(diagnostics, "Drift sketch"):
+        sketch = create_dataset_sketch(df)
+    
+    with measure_stage(diagnostics, "Histogram/value-count aggregates"):
+        numeric_aggregates = {}
+        categorical_aggregates = {}
+        temporal_aggregates = {}
+        for col in df.columns:
+            feature_type = classify_feature_type(df[col])
+            if feature_type == 'Numerical':
+                numeric_aggregates[col] = compute_numeric_aggregates(df[col])
+            elif feature_type == 'Temporal':
+                temporal_aggregates[col] = compute_temporal_aggregates(df[col])
+            else:
+                categorical_aggregates[col] = categorical_aggregates_from_sketch(sketch['columns'][col])
+    
+    with measure_stage(diagnostics, "Text profiling"):
+        text_aggregates = {col: compute_text_aggregates(df[col]) for col in categorical_aggregates}
+    
+    with measure_stage(diagnostics, "Outlier scan"):
+        outlier_scan = compute_outlier_scan(df, numeric_aggregates)
+    
+    with measure_stage(diagnostics, "Numerical-categorical associations"):
+        associations, association_skipped = compute_association_ranking(df)
+    
+    with measure_stage(diagnostics, "Missingness bitmaps"):
+        missingness = compute_missingness(df)
+    
+    with measure_stage(diagnostics, "Memory usage"):
+        memory_mb = df.memory_usage(deep=True).sum() / 1024**2
+    
+    return {
+        'version': PROFILE_ARTIFACT_VERSION,
+        'file_name': file_name,
+        'file_hash': file_hash,
+        'file_type': file_type,
+        'n_rows': len(df),
+        'n_cols': len(df.columns),
+        'memory_mb': memory_mb,
+        'preview': df.head(PREVIEW_ROWS),
+        'summary_df': summary_df,
+        'quality_report': quality_report,
+        'stats_df': stats_df,
+        'corr_matrix': corr_matrix,
+        'strong_correlations': strong_corr,
+        'insights': insights,
+        'categorical_association': categorical_association,
+        'numeric_aggregates': numeric_aggregates,
+        'categorical_aggregates': categorical_aggregates,
+        'temporal_aggregates': temporal_aggregates,
+        'text_aggregates': text_aggregates,
+        'outlier_scan': outlier_scan,
+        'associations': associations,
+        'association_skipped': association_skipped,
+        'missingness': missingness,
+        'sketch': sketch
+    }
+
+
+def _sql_identifier(name):
+    """Quote a column name for DuckDB"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_literal(value):
+    """Quote a string literal for DuckDB"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _duckdb_feature_type(type_name):
+    """Classify a DuckDB column type as Numerical, Temporal or Categorical"""
+    type_name = type_name.upper()
+    if type_name in DUCKDB_NUMERIC_TYPES or type_name.startswith('DECIMAL'):
+        return 'Numerical'
+    if type_name == 'DATE' or type_name.startswith('TIMESTAMP'):
+        return 'Temporal'
+    return 'Categorical'
+
+
+def _duckdb_value_expression(name, feature_type):
+    """SQL expression for a column's values: DOUBLE (NaN as NULL), epoch seconds or VARCHAR"""
+    column = _sql_identifier(name)
+    if feature_type == 'Numerical':
+        return f"nullif(CAST({column} AS DOUBLE), 'NaN'::DOUBLE)"
+    if feature_type == 'Temporal':
+        return f"epoch(CAST({column} AS TIMESTAMP))"
+    return f"CAST({column} AS VARCHAR)"
+
+
+def _histogram_bin_sql(expression, low, high, bins):
+    """
+    SQL expression assigning values to equal-width bins, as np.histogram does
+    
+    Returns:
+        tuple: (SQL expression, numpy array of bin edges)
+    """
+    if high <= low:
+        # np.histogram widens an empty range by 0.5 on each side
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    sql = f"least(greatest(floor(({expression} - {low!r}) / {width!r}), 0), {bins - 1})::INTEGER"
+    return sql, np.linspace(low, high, bins + 1)
+
+
+def _histogram_counts(histogram, bins):
+    """Convert a DuckDB histogram() map of bin -> count to a dense count array"""
+    counts = np.zeros(bins, dtype=np.int64)
+    for position, count in (histogram or {}).items():
+        counts[position] = count
+    return counts
+
+
+def stage_duckdb_source(uploaded_file, file_hash, work_dir=DUCKDB_WORK_DIR):
+    """
+    Copy an uploaded file to disk once so DuckDB can scan it
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        file_hash: content hash of the file, used as its name
+        work_dir: directory holding staged files and spill files
+        
+    Returns:
+        str: path of the staged file
+    """
+    # The full suffix is kept so DuckDB detects compression (e.g. `.csv.gz`)
+    file_extension, codec = split_file_name(uploaded_file.name)
+    suffix = uploaded_file.name.lower().rsplit('.', 2 if codec else 1)[1:]
+    path = os.path.join(work_dir, f"{file_hash}.{'.'.join(suffix)}")
+    if not os.path.exists(path):
+        os.makedirs(work_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        uploaded_file.seek(0)
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(uploaded_file, f, 1024 * 1024)
+        os.replace(tmp_path, path)
+        uploaded_file.seek(0)
+    return path
+
+
+@st.cache_resource
+def _staged_sources():
+    """Staged file used by each session, shared by all sessions of the server process"""
+    return {'lock': threading.Lock(), 'sessions': {}}
+
+
+def track_duckdb_source(path, work_dir=DUCKDB_WORK_DIR, ttl=DUCKDB_STAGED_TTL_SECONDS):
+    """
+    Record the staged file this session uses and delete the ones nobody uses
+    
+    Staged files are shared by sessions that upload the same content, so a
+    file is only deleted once no session has used it for `ttl` seconds or
+    every session that used it has moved on to another dataset. Closed
+    sessions never report back, so their entries expire after `ttl`.
+    
+    Args:
+        path: staged file shown by this session, or None
+        work_dir: directory holding staged files
+        ttl: seconds after which an idle session's entry expires
+    """
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx is not None else 'local'
+    registry = _staged_sources()
+    now = time.time()
+    with registry['lock']:
+        sessions = registry['sessions']
+        for other in [key for key, (_, seen) in sessions.items() if now - seen > ttl]:
+            del sessions[other]
+        if path is None:
+            sessions.pop(session_id, None)
+        else:
+            sessions[session_id] = (os.path.abspath(path), now)
+        in_use = {used for used, _ in sessions.values()}
+        
+        try:
+            names = os.listdir(work_dir)
+        except OSError:
+            return
+        for name in names:
+            staged = os.path.abspath(os.path.join(work_dir, name))
+            # Only staged files (named by content hash); spill files and copies in progress are left alone
+            file_hash = name.split('.', 1)[0]
+            if len(file_hash) != 64 or name.endswith('.tmp') or staged in in_use:
+                continue
+            try:
+                os.remove(staged)
+            except OSError:
+                pass
+
+
+def open_duckdb_source(path, sql_filter=None, memory_limit=DUCKDB_MEMORY_LIMIT, work_dir=DUCKDB_WORK_DIR):
+    """
+    Open an in-process DuckDB connection with the file registered as view `data`
+    
+    Queries spill to `work_dir` when they exceed the memory limit. The filter
+    is user-written SQL, so file access is restricted to the source file.
+    
+    Args:
+        path: CSV or Parquet file
+        sql_filter: optional WHERE condition applied to every query
+        memory_limit: DuckDB memory limit (e.g. '2GB'), or None for the default
+        work_dir: directory for spill files
+        
+    Returns:
+        duckdb connection
+    """
+    if sql_filter and ';' in sql_filter:
+        raise ValueError("The SQL filter must be a single WHERE condition")
+    
+    spill_dir = os.path.join(work_dir, 'spill')
+    os.makedirs(spill_dir, exist_ok=True)
+    config = {'temp_directory': spill_dir}
+    if memory_limit:
+        config['memory_limit'] = memory_limit
+    con = duckdb.connect(config=config)
+    if path.endswith('.parquet'):
+        reader = f"FROM read_parquet({_sql_literal(path)})"
+    else:
+        # Sniff the dialect and column types once instead of on every query
+        reader = con.execute(f"SELECT Prompt FROM sniff_csv({_sql_literal(path)})").fetchone()[0].rstrip('; ')
+    con.execute(f"CREATE VIEW source AS SELECT * {reader}")
+    con.execute(f"SET allowed_paths = [{_sql_literal(path)}]")
+    con.execute("SET enable_external_access = false")
+    where = f" WHERE {sql_filter}" if sql_filter and sql_filter.strip() else ""
+    con.execute(f"CREATE VIEW data AS SELECT * FROM source{where}")
+    return con
+
+
+def _duckdb_core_tables(con, columns, types, kinds):
+    """
+    Compute the feature summary, quality report, statistics and correlations in SQL
+    
+    Every per-column aggregate and pairwise correlation is one SELECT over
+    `data`; duplicates need a second DISTINCT query.
+    
+    Returns:
+        tuple: (n_rows, per-column aggregate row, summary_df, quality_report,
+                stats_df, corr_matrix, strong_correlations, insights)
+    """
+    values = [_duckdb_value_expression(col, kind) for col, kind in zip(columns, kinds)]
+    # Booleans are profiled as numbers but, as with select_dtypes, get no statistics
+    stats_positions = [i for i, kind in enumerate(kinds) if kind == 'Numerical' and types[i].upper() != 'BOOLEAN']
+    
+    exprs = ["count(*) AS n_rows"]
+    for i, (value, kind) in enumerate(zip(values, kinds)):
+        exprs.append(f"count({value}) AS c{i}_count")
+        exprs.append(f"count(DISTINCT {value}) AS c{i}_unique")
+        if kind == 'Numerical':
+            exprs.extend([
+                f"count(*) FILTER (WHERE {value} <> 0) = 0 AS c{i}_zeros",
+                f"avg({value}) AS c{i}_mean",
+                f"stddev_samp({value}) AS c{i}_std",
+                f"min({value}) AS c{i}_min",
+                f"max({value}) AS c{i}_max",
+                f"approx_quantile({value}, [0.25, 0.5, 0.75]) AS c{i}_quartiles"
+            ])
+        elif kind == 'Temporal':
+            exprs.extend([f"min({value}) AS c{i}_min", f"max({value}) AS c{i}_max"])
+        elif types[i].upper() == 'VARCHAR':
+            column = _sql_identifier(columns[i])
+            exprs.append(f"count(TRY_CAST({column} AS DOUBLE)) = count({column}) AS c{i}_numeric")
+    for a, i in enumerate(stats_positions):
+        for j in stats_positions[a + 1:]:
+            exprs.append(f"corr({values[i]}, {values[j]}) AS r{i}_{j}")
+    
+    result = con.execute(f"SELECT {', '.join(exprs)} FROM data").fetchone()
+    row = dict(zip([expr.rsplit(' AS ', 1)[1] for expr in exprs], result))
+    n_rows = row['n_rows']
+    distinct_rows = con.execute("SELECT count(*) FROM (SELECT DISTINCT * FROM data)").fetchone()[0]
+    
+    summary_data = []
+    quality_report = {
+        'columns_with_missing': [],
+        'columns_high_missing': [],
+        'columns_all_zeros': [],
+        'constant_features': [],
+        'type_mismatch': [],
+        'duplicate_rows': int(n_rows - distinct_rows)
+    }
+    for i, (col, type_name, kind) in enumerate(zip(columns, types, kinds)):
+        null_count = n_rows - row[f'c{i}_count']
+        null_percentage = (null_count / n_rows) * 100 if n_rows else np.nan
+        unique_count = row[f'c{i}_unique']
+        
+        summary_data.append({
+            'Column Name': col,
+            'Data Type': type_name,
+            'Feature Type': kind,
+            'Unique Values': unique_count,
+            'Null Values': null_count,
+            'Null %': round(null_percentage, 2)
+        })
+        
+        if null_count > 0:
+            quality_report['columns_with_missing'].append((col, null_count, null_percentage))
+        if null_percentage > 30:
+            quality_report['columns_high_missing'].append((col, null_percentage))
+        if row.get(f'c{i}_zeros'):
+            quality_report['columns_all_zeros'].append(col)
+        if unique_count == 1:
+            quality_report['constant_features'].append(col)
+        if row.get(f'c{i}_numeric'):
+            quality_report['type_mismatch'].append(col)
+    
+    summary_df = pd.DataFrame(summary_data)
+    
+    if not stats_positions:
+        return n_rows, row, summary_df, quality_report, None, None, None, \
+            "Not enough numerical columns for correlation analysis."
+    
+    stats_labels = [columns[i] for i in stats_positions]
+    stats_df = pd.DataFrame(
+        [[row[f'c{i}_count'], row[f'c{i}_mean'], (row[f'c{i}_quartiles'] or [None] * 3)[1],
+          row[f'c{i}_std'], row[f'c{i}_min'], row[f'c{i}_max']] for i in stats_positions],
+        index=stats_labels, columns=['count', 'mean', 'median', 'std', 'min', 'max'], dtype='float64'
+    ).round(2)
+    
+    if len(stats_positions) < 2:
+        return n_rows, row, summary_df, quality_report, stats_df, None, None, \
+            "Not enough numerical columns for correlation analysis."
+    
+    corr = np.diag([1.0 if (row[f'c{i}_std'] or 0) > 0 else np.nan for i in stats_positions])
+    for a, i in enumerate(stats_positions):
+        for b in range(a + 1, len(stats_positions)):
+            value = row[f'r{i}_{stats_positions[b]}']
+            corr[a, b] = corr[b, a] = np.nan if value is None else value
+    corr_matrix = pd.DataFrame(corr, index=stats_labels, columns=stats_labels)
+    strong_correlations, insights = _correlation_insights(corr_matrix)
+    
+    return n_rows, row, summary_df, quality_report, stats_df, corr_matrix, strong_correlations, insights
+
+
+def _duckdb_numeric_aggregates(con, columns, kinds, row, bins=HISTOGRAM_BINS,
+                               z_threshold=OUTLIER_Z_THRESHOLD, mad_threshold=OUTLIER_MAD_THRESHOLD):
+    """
+    Compute histograms, box plot statistics and the outlier scan in SQL
+    
+    One pass bins every numerical column and finds its whisker ends and
+    median absolute deviation; a second pass flags outliers and groups the
+    rows by outlier score.
+    
+    Returns:
+        tuple: (numeric_aggregates dict, outlier_scan dict), in the layouts of
+               compute_numeric_aggregates and compute_outlier_scan
+    """
+    positions = [i for i, kind in enumerate(kinds) if kind == 'Numerical']
+    values = {i: _duckdb_value_expression(columns[i], 'Numerical') for i in positions}
+    
+    numeric_aggregates = {}
+    bounds = {}
+    exprs = []
+    for i in positions:
+        if not row[f'c{i}_count']:
+            numeric_aggregates[columns[i]] = compute_numeric_aggregates(pd.Series([], dtype='float64'), bins)
+            continue
+        q1, median, q3 = row[f'c{i}_quartiles']
+        iqr = q3 - q1
+        lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        bin_sql, edges = _histogram_bin_sql(values[i], row[f'c{i}_min'], row[f'c{i}_max'], bins)
+        bounds[i] = (lower, upper, median, edges)
+        exprs.extend([
+            f"histogram({bin_sql}) FILTER (WHERE {values[i]} IS NOT NULL) AS h{i}",
+            f"min({values[i]}) FILTER (WHERE {values[i]} >= {lower!r}) AS lf{i}",
+            f"max({values[i]}) FILTER (WHERE {values[i]} <= {upper!r}) AS uf{i}",
+            f"count_if({values[i]} < {lower!r} OR {values[i]} > {upper!r}) AS o{i}",
+            f"approx_quantile(abs({values[i]} - {median!r}), 0.5) AS mad{i}"
+        ])
+    
+    second = {}
+    if exprs:
+        result = con.execute(f"SELECT {', '.join(exprs)} FROM data").fetchone()
+        second = dict(zip([expr.rsplit(' AS ', 1)[1] for expr in exprs], result))
+    
+    for i in bounds:
+        lower, upper, median, edges = bounds[i]
+        q1, _, q3 = row[f'c{i}_quartiles']
+        numeric_aggregates[columns[i]] = {
+            'count': int(row[f'c{i}_count']),
+            'mean': float(row[f'c{i}_mean']),
+            'median': float(median),
+            'std': float(row[f'c{i}_std']) if row[f'c{i}_std'] is not None else np.nan,
+            'min': float(row[f'c{i}_min']),
+            'max': float(row[f'c{i}_max']),
+            'q1': float(q1),
+            'q3': float(q3),
+            'lower_fence': float(second[f'lf{i}']),
+            'upper_fence': float(second[f'uf{i}']),
+            'outliers': int(second[f'o{i}']),
+            'hist_counts': _histogram_counts(second[f'h{i}'], bins),
+            'hist_edges': edges
+        }
+    
+    # Outlier flags per row; the score is the number of columns flagged by any method
+    summary_columns = ['Column', 'IQR Outliers', 'Z-Score Outliers', 'MAD Outliers', 'Any Method', 'Any Method %']
+    outlier_scan = {
+        'summary': pd.DataFrame(columns=summary_columns),
+        'score_counts': np.zeros(1, dtype=np.int64),
+        'top_rows': np.zeros(0, dtype=np.int64),
+        'top_scores': np.zeros(0, dtype=np.int64)
+    }
+    if not positions or not row['n_rows']:
+        return numeric_aggregates, outlier_scan
+    
+    flag_exprs = []
+    for i in positions:
+        if i not in bounds:
+            flag_exprs.extend([f"0 AS iqr{i}", f"0 AS z{i}", f"0 AS mad{i}"])
+            continue
+        lower, upper, median, _ = bounds[i]
+        std, mad = row[f'c{i}_std'], second[f'mad{i}']
+        x = values[i]
+        flag_exprs.append(f"coalesce({x} < {lower!r} OR {x} > {upper!r}, false)::INTEGER AS iqr{i}")
+        flag_exprs.append(f"coalesce(abs({x} - {row[f'c{i}_mean']!r}) > {z_threshold * std!r}, false)::INTEGER AS z{i}"
+                          if std else f"0 AS z{i}")
+        flag_exprs.append(f"coalesce(abs({x} - {median!r}) > {mad_threshold * mad / 0.6745!r}, false)::INTEGER AS mad{i}"
+                          if mad else f"0 AS mad{i}")
+    any_exprs = [f"greatest(iqr{i}, z{i}, mad{i}) AS any{i}" for i in positions]
+    score_expr = ' + '.join(f"any{i}" for i in positions)
+    sums = [f"sum({prefix}{i})" for i in positions for prefix in ('iqr', 'z', 'mad', 'any')]
+    query = (
+        f"SELECT {score_expr} AS score, count(*), {', '.join(sums)} FROM ("
+        f"SELECT *, {', '.join(any_exprs)} FROM (SELECT {', '.join(flag_exprs)} FROM data)) GROUP BY score"
+    )
+    groups = np.array(con.execute(query).fetchall(), dtype=np.float64).astype(np.int64)
+    
+    score_counts = np.zeros(len(positions) + 1, dtype=np.int64)
+    score_counts[groups[:, 0]] = groups[:, 1]
+    totals = groups[:, 2:].sum(axis=0).reshape(len(positions), 4)
+    outlier_scan['summary'] = pd.DataFrame({
+        'Column': [columns[i] for i in positions],
+        'IQR Outliers': totals[:, 0],
+        'Z-Score Outliers': totals[:, 1],
+        'MAD Outliers': totals[:, 2],
+        'Any Method': totals[:, 3],
+        'Any Method %': (totals[:, 3] / row['n_rows'] * 100).round(2)
+    }).sort_values('Any Method', ascending=False, ignore_index=True)
+    outlier_scan['score_counts'] = score_counts
+    return numeric_aggregates, outlier_scan
+
+
+def _duckdb_categorical_aggregates(con, columns, kinds, row, top_n=TOP_CATEGORIES, bins=HISTOGRAM_BINS,
+                                   top_patterns=TOP_TEXT_PATTERNS):
+    """
+    Compute value counts and text profiles of the categorical columns in SQL
+    
+    All categorical columns are unnested into (column, value) pairs and
+    grouped in one scan. Value counts, text statistics and patterns are then
+    computed from the distinct values weighted by their counts, so string
+    functions and regexes run once per distinct value rather than per row.
+    
+    Returns:
+        tuple: (categorical_aggregates, text_aggregates, top values per column
+                used to pool rare categories)
+    """
+    positions = [i for i, kind in enumerate(kinds) if kind == 'Categorical']
+    if not positions:
+        return {}, {}, {}
+    
+    values = [_duckdb_value_expression(columns[i], 'Categorical') for i in positions]
+    keep = max(top_n, CATEGORICAL_ASSOCIATION_MAX_CATEGORIES - 1)
+    con.execute(
+        f"CREATE OR REPLACE TEMP TABLE value_counts AS SELECT i, v, count(*) AS n FROM ("
+        f"SELECT UNNEST([{', '.join(map(str, positions))}]) AS i, UNNEST([{', '.join(values)}]) AS v FROM data) "
+        f"WHERE v IS NOT NULL GROUP BY i, v"
+    )
+    
+    def top_values_by_column(key, limit):
+        # Most frequent keys per column, with the number of distinct keys
+        result = {i: [] for i in positions}
+        distinct = {i: 0 for i in positions}
+        query = (
+            f"SELECT i, k, n, count(*) OVER (PARTITION BY i) FROM ("
+            f"SELECT i, {key} AS k, sum(n) AS n FROM value_counts GROUP BY 1, 2) "
+            f"QUALIFY row_number() OVER (PARTITION BY i ORDER BY n DESC, k) <= {int(limit)} ORDER BY i, n DESC, k"
+        )
+        for i, value, count, n_distinct in con.execute(query).fetchall():
+            result[i].append((value, int(count)))
+            distinct[i] = int(n_distinct)
+        return result, distinct
+    
+    value_counts, _ = top_values_by_column('v', keep)
+    categorical_aggregates = {}
+    top_values = {}
+    for i in positions:
+        counts = value_counts[i]
+        top_values[columns[i]] = [value for value, _ in counts]
+        top = counts[:top_n]
+        categorical_aggregates[columns[i]] = {
+            'unique': int(row[f'c{i}_unique']),
+            'mode': top[0][0] if top else None,
+            'mode_count': int(top[0][1]) if top else 0,
+            'top_values': [value for value, _ in top],
+            'top_counts': [int(count) for _, count in top],
+            'count_error': 0
+        }
+    
+    semantic = ', '.join(
+        f"sum(n) FILTER (WHERE regexp_matches(v, {_sql_literal(regex)})) AS sem{k}"
+        for k, regex in enumerate(TEXT_SEMANTIC_REGEXES.values())
+    )
+    stats = {
+        result[0]: result for result in con.execute(
+            f"SELECT i, sum(n), sum(n) FILTER (WHERE length(v) = 0), "
+            f"sum(n) FILTER (WHERE regexp_full_match(v, '\\s+')), "
+            f"sum(n) FILTER (WHERE regexp_matches(v, '^\\s|\\s$')), "
+            f"min(length(v)), sum(n * length(v)) / sum(n), max(length(v)), {semantic} "
+            f"FROM value_counts GROUP BY i"
+        ).fetchall()
+    }
+    
+    # Length histograms, with each column's bins passed in as a VALUES table
+    edges = {}
+    bin_rows = []
+    for i, result in stats.items():
+        min_length, max_length = result[5], result[7]
+        n_bins = min(bins, max(int(max_length), 1))
+        low, high = (min_length - 0.5, max_length + 0.5) if max_length <= min_length else (min_length, max_length)
+        edges[i] = np.linspace(low, high, n_bins + 1)
+        bin_rows.append(f"({i}, {float(low)!r}, {(high - low) / n_bins!r}, {n_bins})")
+    length_counts = {i: np.zeros(len(edges[i]) - 1, dtype=np.int64) for i in edges}
+    if bin_rows:
+        histogram = con.execute(
+            f"SELECT i, least(greatest(floor((length(v) - low) / width), 0), bins - 1)::INTEGER AS b, sum(n) "
+            f"FROM value_counts JOIN (VALUES {', '.join(bin_rows)}) AS p(i, low, width, bins) USING (i) "
+            f"GROUP BY 1, 2"
+        ).fetchall()
+        for i, position, count in histogram:
+            length_counts[i][position] = count
+    
+    # translate() maps A-Z to 'A', a-z to 'a' and 0-9 to '9', like _pattern_table()
+    pattern_from = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    pattern_to = 'A' * 26 + 'a' * 26 + '9' * 10
+    patterns, pattern_counts = top_values_by_column(
+        f"translate(left(v, {TEXT_PATTERN_LENGTH}), '{pattern_from}', '{pattern_to}')", top_patterns
     )
+    con.execute("DROP TABLE value_counts")
+    
+    text_aggregates = {}
+    for i in positions:
+        result = stats.get(i)
+        count = int(result[1]) if result else 0
+        aggregates = {
+            'count': count,
+            'empty': int(result[2] or 0) if result else 0,
+            'whitespace_only': int(result[3] or 0) if result else 0,
+            'padded': int(result[4] or 0) if result else 0,
+            'min_length': int(result[5]) if result else 0,
+            'mean_length': float(result[6]) if result else 0.0,
+            'max_length': int(result[7]) if result else 0,
+            'length_hist_counts': length_counts.get(i, np.zeros(0, dtype=np.int64)),
+            'length_hist_edges': edges.get(i, np.zeros(0, dtype=np.float64)),
+            'pattern_count': pattern_counts[i],
+            'top_patterns': [pattern for pattern, _ in patterns[i]],
+            'top_pattern_counts': [n for _, n in patterns[i]]
+        }
+        for k, label in enumerate(TEXT_SEMANTIC_REGEXES):
+            aggregates[label.lower()] = int(result[8 + k] or 0) if result else 0
+        aggregates['semantic_type'] = next(
+            (label for label in TEXT_SEMANTIC_REGEXES
+             if count and aggregates[label.lower()] >= TEXT_SEMANTIC_RATIO * count),
+            'Text'
+        )
+        text_aggregates[columns[i]] = aggregates
+    
+    return categorical_aggregates, text_aggregates, top_values
+
+
+def _duckdb_temporal_aggregates(con, col, row, position, max_points=TIME_SERIES_MAX_POINTS):
+    """
+    Compute range, gaps, frequency and period counts of a date/time column in SQL
+    
+    Returns:
+        dict: same layout as compute_temporal_aggregates
+    """
+    aggregates = compute_temporal_aggregates(pd.Series([], dtype='datetime64[ns]'), max_points)
+    count = int(row[f'c{position}_count'])
+    if count == 0:
+        return aggregates
+    
+    first, last = row[f'c{position}_min'], row[f'c{position}_max']
+    span_seconds = float(last - first)
+    aggregates.update({
+        'count': count,
+        'min': pd.Timestamp(first, unit='s').isoformat(),
+        'max': pd.Timestamp(last, unit='s').isoformat(),
+        'span_seconds': span_seconds
+    })
+    
+    seconds = _duckdb_value_expression(col, 'Temporal')
+    distinct = f"(SELECT DISTINCT {seconds} AS t FROM data WHERE {seconds} IS NOT NULL)"
+    steps = con.execute(
+        f"WITH s AS (SELECT lag(t) OVER (ORDER BY t) AS start, t - lag(t) OVER (ORDER BY t) AS step FROM {distinct}), "
+        f"m AS (SELECT approx_quantile(step, 0.5) AS median_step FROM s) "
+        f"SELECT count(step), any_value(median_step), count_if(step > 1.5 * median_step), "
+        f"max(step), arg_max(start, step) FROM s, m"
+    ).fetchone()
+    n_steps, median_step, gap_count, largest_step, largest_start = steps
+    if n_steps:
+        aggregates.update({
+            'median_step_seconds': float(median_step),
+            'gap_count': int(gap_count),
+            'largest_gap_seconds': float(largest_step) if gap_count else 0.0,
+            'largest_gap_start': pd.Timestamp(largest_start, unit='s').isoformat() if gap_count else None
+        })
+    if n_steps >= 2:
+        # Filter and sort on the source expression: an alias would lose to a real column of the same name
+        sample = con.execute(
+            f"SELECT DISTINCT CAST({_sql_identifier(col)} AS TIMESTAMP) FROM data "
+            f"WHERE {seconds} IS NOT NULL ORDER BY 1 LIMIT {DATETIME_SAMPLE_ROWS}"
+        ).fetchall()
+        if len(sample) >= 3:
+            aggregates['frequency'] = pd.infer_freq(pd.DatetimeIndex([t for t, in sample]))
+    
+    rule = choose_resample_rule(span_seconds, max_points)
+    column = _sql_identifier(col)
+    periods = con.execute(
+        f"SELECT date_trunc('{DUCKDB_TRUNC_UNITS[rule]}', CAST({column} AS TIMESTAMP)) AS p, count(*) "
+        f"FROM data WHERE {column} IS NOT NULL GROUP BY p ORDER BY p"
+    ).fetchall()
+    # pandas labels weekly bins by their closing Sunday and fills empty periods with zeros
+    offset = pd.Timedelta(days=6) if rule == 'W' else pd.Timedelta(0)
+    counts = pd.Series([n for _, n in periods], index=pd.DatetimeIndex([p for p, _ in periods]) + offset)
+    counts = counts.reindex(pd.date_range(counts.index[0], counts.index[-1], freq=rule), fill_value=0)
+    aggregates.update({
+        'resample_rule': rule,
+        'period_starts': counts.index.to_numpy(dtype='datetime64[ns]'),
+        'period_counts': counts.to_numpy(dtype=np.int64)
+    })
+    return aggregates
+
+
+def _duckdb_missingness(con, columns, kinds, row, bins=NULLITY_HEATMAP_BINS, top_n=10):
+    """
+    Compute null co-occurrence, nullity heatmap and missingness patterns in SQL
+    
+    Returns:
+        dict: same layout as compute_missingness
+    """
+    n_rows = row['n_rows']
+    positions = [i for i in range(len(columns)) if row[f'c{i}_count'] < n_rows]
+    missing_columns = [columns[i] for i in positions]
+    null_counts = np.array([n_rows - row[f'c{i}_count'] for i in positions], dtype=np.int64)
+    nulls = [f"({_duckdb_value_expression(columns[i], kinds[i])} IS NULL) AS m{k}" for k, i in enumerate(positions)]
+    
+    n_words = -(-n_rows // 64)
+    words_per_bin = max(1, -(-n_words // bins))
+    n_bins = -(-n_words // words_per_bin) if n_words else 0
+    missingness = {
+        'n_rows': n_rows,
+        'columns': missing_columns,
+        'null_counts': null_counts,
+        'cooccurrence': np.zeros((len(positions), len(positions)), dtype=np.int64),
+        'heatmap': np.zeros((len(positions), n_bins), dtype=np.float64),
+        'bin_starts': np.arange(n_bins) * words_per_bin * 64,
+        'patterns': []
+    }
+    if not positions:
+        missingness['patterns'] = [([], n_rows)] if n_rows else []
+        return missingness
+    
+    k_range = range(len(positions))
+    pairs = [(a, b) for a in k_range for b in k_range if a <= b]
+    both = ', '.join(f"count_if(m{a} AND m{b})" for a, b in pairs)
+    counts = con.execute(f"SELECT {both} FROM (SELECT {', '.join(nulls)} FROM data)").fetchone()
+    for (a, b), count in zip(pairs, counts):
+        missingness['cooccurrence'][a, b] = missingness['cooccurrence'][b, a] = count
+    
+    # Row bins follow scan order, 64 rows aligned as in the bitmap version
+    bin_rows = words_per_bin * 64
+    binned = con.execute(
+        f"SELECT (rn - 1) // {bin_rows} AS b, count(*), {', '.join(f'count_if(m{k})' for k in k_range)} "
+        f"FROM (SELECT row_number() OVER () AS rn, {', '.join(nulls)} FROM data) GROUP BY b ORDER BY b"
+    ).fetchall()
+    for bin_row in binned:
+        missingness['heatmap'][:, bin_row[0]] = np.array(bin_row[2:], dtype=np.float64) / bin_row[1]
+    
+    # One code word per group of 64 columns; bit k % 64 of word k // 64 means column k is missing
+    words = [
+        ' + '.join(f"(m{k}::UBIGINT << {k % 64})" for k in k_range[w * 64:(w + 1) * 64]) + f" AS w{w}"
+        for w in range(-(-len(positions) // 64))
+    ]
+    word_names = ', '.join(f"w{w}" for w in range(len(words)))
+    patterns = con.execute(
+        f"SELECT {word_names}, count(*) AS n FROM (SELECT {', '.join(words)} FROM (SELECT {', '.join(nulls)} FROM data)) "
+        f"GROUP BY ALL ORDER BY n DESC LIMIT {top_n}"
+    ).fetchall()
+    missingness['patterns'] = []
+    for row in patterns:
+        code = sum(int(word) << (64 * w) for w, word in enumerate(row[:-1]))
+        missingness['patterns'].append(([missing_columns[k] for k in k_range if code >> k & 1], int(row[-1])))
+    return missingness
+
+
+def _duckdb_associations(con, columns, types, kinds, row, top_values,
+                         max_categories=ASSOCIATION_MAX_CATEGORIES,
+                         max_pooled=CATEGORICAL_ASSOCIATION_MAX_CATEGORIES):
+    """
+    Compute the numerical-categorical ranking and the categorical association matrix in SQL
+    
+    Per-category sums for every categorical column come from one GROUPING
+    SETS query, and so do the contingency tables of every categorical pair.
+    
+    Returns:
+        tuple: (ranking DataFrame, skipped columns, categorical_association dict)
+    """
+    numerical = [i for i, kind in enumerate(kinds) if kind == 'Numerical' and types[i].upper() != 'BOOLEAN']
+    categorical = [i for i, kind in enumerate(kinds) if kind == 'Categorical' and row[f'c{i}_unique'] >= 2]
+    ranking_columns = ['Numerical', 'Categorical', 'Groups', 'N', 'Eta²', 'F']
+    
+    grouped = [i for i in categorical if row[f'c{i}_unique'] <= max_categories]
+    skipped = [columns[i] for i, kind in enumerate(kinds)
+               if kind == 'Categorical' and row[f'c{i}_unique'] > max_categories]
+    rows = []
+    if numerical and grouped:
+        keys = {i: _duckdb_value_expression(columns[i], 'Categorical') for i in grouped}
+        x = [_duckdb_value_expression(columns[j], 'Numerical') for j in numerical]
+        sums = [f"{agg}" for v in x for agg in (f"count({v})", f"sum({v})", f"sum({v} * {v})")]
+        result = con.execute(
+            f"SELECT {', '.join(f'grouping({keys[i]})' for i in grouped)}, {', '.join(sums)} "
+            f"FROM data GROUP BY GROUPING SETS ({', '.join(f'({keys[i]})' for i in grouped)}) "
+            f"HAVING {' OR '.join(f'(grouping({keys[i]}) = 0 AND {keys[i]} IS NOT NULL)' for i in grouped)}"
+        ).fetchall()
+        table = np.array([[np.nan if value is None else value for value in result_row] for result_row in result],
+                         dtype=np.float64).reshape(len(result), len(grouped) + 3 * len(numerical))
+        for k, i in enumerate(grouped):
+            block = np.nan_to_num(table[table[:, k] == 0, len(grouped):]).reshape(-1, len(numerical), 3)
+            rows.extend(_association_rows([columns[j] for j in numerical], columns[i],
+                                          block[:, :, 0], block[:, :, 1], block[:, :, 2]))
+    ranking = pd.DataFrame(rows, columns=ranking_columns).sort_values('Eta²', ascending=False, ignore_index=True)
+    
+    categorical_association = {'cramers_v': None, 'theils_u': None, 'strong': [], 'capped': [], 'sampled_rows': None,
+                               'insights': ["Not enough categorical columns for association analysis."]}
+    if len(categorical) < 2:
+        return ranking, skipped, categorical_association
+    
+    # Columns over the cap keep their most frequent values; the rest share code 0
+    keys = {}
+    for i in categorical:
+        value = _duckdb_value_expression(columns[i], 'Categorical')
+        if row[f'c{i}_unique'] > max_pooled:
+            kept = ', '.join(_sql_literal(v) for v in top_values[columns[i]][:max_pooled - 1])
+            keys[i] = f"CAST(coalesce(list_position([{kept}], {value}), 0) AS VARCHAR)"
+            keys[i] = f"CASE WHEN {value} IS NULL THEN NULL ELSE {keys[i]} END"
+            categorical_association['capped'].append(columns[i])
+        else:
+            keys[i] = value
+    pairs = [(a, b) for a in range(len(categorical)) for b in range(a + 1, len(categorical))]
+    names = [f"k{a}" for a in range(len(categorical))]
+    result = con.execute(
+        f"SELECT {', '.join(f'grouping({name})' for name in names)}, {', '.join(names)}, count(*) "
+        f"FROM (SELECT {', '.join(f'{keys[i]} AS {name}' for i, name in zip(categorical, names))} FROM data) "
+        f"GROUP BY GROUPING SETS ({', '.join(f'({names[a]}, {names[b]})' for a, b in pairs)})"
+    ).fetchall()
+    
+    n_columns = len(categorical)
+    tables = {pair: [] for pair in pairs}
+    for result_row in result:
+        grouped_positions = tuple(a for a in range(n_columns) if result_row[a] == 0)
+        a, b = grouped_positions
+        value_a, value_b = result_row[n_columns + a], result_row[n_columns + b]
+        if value_a is not None and value_b is not None:
+            tables[(a, b)].append((value_a, value_b, result_row[-1]))
+    
+    cramers_v = np.eye(n_columns)
+    theils_u = np.eye(n_columns)
+    for (a, b), cells in tables.items():
+        table = pd.DataFrame(cells, columns=['a', 'b', 'n']).pivot_table(
+            index='a', columns='b', values='n', aggfunc='sum', fill_value=0
+        ) if cells else pd.DataFrame()
+        cramers_v[a, b], theils_u[a, b], theils_u[b, a] = _contingency_association(table.to_numpy())
+        cramers_v[b, a] = cramers_v[a, b]
+    
+    categorical_association.update(_categorical_association_result([columns[i] for i in categorical],
+                                                                    cramers_v, theils_u))
+    return ranking, skipped, categorical_association
+
+
+def build_profile_duckdb(path, file_type, file_name=None, file_hash=None, sql_filter=None, diagnostics=None):
+    """
+    Build a profile out-of-core with DuckDB, without creating a DataFrame
+    
+    Every section is expressed as aggregate SQL over the file, so DuckDB
+    streams it and spills to disk instead of holding it in memory. Quantiles
+    are approximate and drift sketches are not built.
+    
+    Args:
+        path: staged CSV or Parquet file
+        file_type: 'CSV' or 'Parquet'
+        file_name: original file name
+        file_hash: content hash of the original file
+        sql_filter: optional WHERE condition applied before profiling
+        diagnostics: optional diagnostics dict to record per-stage timings
+        
+    Returns:
+        dict: profile in the same layout as build_profile ('sketch' is None)
+    """
+    con = open_duckdb_source(path, sql_filter)
+    try:
+        with measure_stage(diagnostics, "SQL schema & preview"):
+            schema = con.execute("DESCRIBE data").fetchall()
+            columns = [name for name, *_ in schema]
+            types = [type_name for _, type_name, *_ in schema]
+            kinds = [_duckdb_feature_type(type_name) for type_name in types]
+            preview = con.execute(f"SELECT * FROM data LIMIT {PREVIEW_ROWS}").df()
+        
+        with measure_stage(diagnostics, "SQL summary, quality, statistics & correlations"):
+            n_rows, row, summary_df, quality_report, stats_df, corr_matrix, strong_corr, insights = \
+                _duckdb_core_tables(con, columns, types, kinds)
+        
+        with measure_stage(diagnostics, "SQL histograms & outlier scan"):
+            numeric_aggregates, outlier_scan = _duckdb_numeric_aggregates(con, columns, kinds, row)
+        
+        with measure_stage(diagnostics, "SQL value counts & text profiling"):
+            categorical_aggregates, text_aggregates, top_values = _duckdb_categorical_aggregates(
+                con, columns, kinds, row
+            )
+        
+        with measure_stage(diagnostics, "SQL time series"):
+            temporal_aggregates = {
+                col: _duckdb_temporal_aggregates(con, col, row, i)
+                for i, (col, kind) in enumerate(zip(columns, kinds)) if kind == 'Temporal'
+            }
+        
+        with measure_stage(diagnostics, "SQL associations"):
+            associations, association_skipped, categorical_association = _duckdb_associations(
+                con, columns, types, kinds, row, top_values
+            )
+        
+        with measure_stage(diagnostics, "SQL missingness"):
+            missingness = _duckdb_missingness(con, columns, kinds, row)
+    finally:
+        con.close()
+    
+    return {
+        'version': PROFILE_ARTIFACT_VERSION,
+        'file_name': file_name,
+        'file_hash': file_hash,
+        'file_type': file_type,
+        'n_rows': n_rows,
+        'n_cols': len(columns),
+        # No DataFrame is built, so report the size of the file on disk
+        'memory_mb': os.path.getsize(path) / 1024**2,
+        'preview': preview,
+        'summary_df': summary_df,
+        'quality_report': quality_report,
+        'stats_df': stats_df,
+        'corr_matrix': corr_matrix,
+        'strong_correlations': strong_corr,
+        'insights': insights,
+        'categorical_association': categorical_association,
+        'numeric_aggregates': numeric_aggregates,
+        'categorical_aggregates': categorical_aggregates,
+        'temporal_aggregates': temporal_aggregates,
+        'text_aggregates': text_aggregates,
+        'outlier_scan': outlier_scan,
+        'associations': associations,
+        'association_skipped': association_skipped,
+        'missingness': missingness,
+        'sketch': None
+    }
+
+
+def duckdb_group_statistics(path, sql_filter, num_col, cat_col, top_n):
+    """
+    Compute per-category statistics of a numerical column in SQL
+    
+    Args:
+        path: staged CSV or Parquet file
+        sql_filter: optional WHERE condition
+        num_col: numerical column
+        cat_col: grouping column
+        top_n: number of most frequent categories to report
+        
+    Returns:
+        tuple: (category labels, dict of arrays in the layout of
+                compute_group_statistics, number of non-empty categories)
+    """
+    con = open_duckdb_source(path, sql_filter)
+    try:
+        g = _duckdb_value_expression(cat_col, 'Categorical')
+        x = _duckdb_value_expression(num_col, 'Numerical')
+        query = f"""
+            WITH rows AS (SELECT {g} AS g, {x} AS x FROM data WHERE {g} IS NOT NULL),
+            top AS (SELECT g, count(*) AS n FROM rows GROUP BY g ORDER BY n DESC, g LIMIT {int(top_n)}),
+            stats AS (
+                SELECT g, any_value(top.n) AS n, count(x) AS count, avg(x) AS mean,
+                       approx_quantile(x, 0.5) AS median, stddev_samp(x) AS std, min(x) AS min, max(x) AS max,
+                       approx_quantile(x, 0.25) AS q1, approx_quantile(x, 0.75) AS q3
+                FROM rows JOIN top USING (g) GROUP BY g
+            )
+            SELECT stats.*,
+                   min(rows.x) FILTER (WHERE rows.x >= q1 - 1.5 * (q3 - q1)) AS lower_fence,
+                   max(rows.x) FILTER (WHERE rows.x <= q3 + 1.5 * (q3 - q1)) AS upper_fence
+            FROM stats JOIN rows USING (g) GROUP BY ALL ORDER BY n DESC, g
+        """
+        result = con.execute(query).df()
+        n_categories = con.execute(f"SELECT count(DISTINCT {g}) FROM data").fetchone()[0]
+    finally:
+        con.close()
+    
+    group_stats = {key: result[key].to_numpy(dtype='float64', na_value=np.nan)
+                   for key in ('mean', 'median', 'std', 'min', 'max', 'q1', 'q3', 'lower_fence', 'upper_fence')}
+    group_stats['count'] = result['count'].to_numpy(dtype=np.int64)
+    return result['g'].astype(str).tolist(), group_stats, int(n_categories)
+
+
+def duckdb_density_grid(path, sql_filter, x_col, y_col, bins=DENSITY_GRID_BINS, x_range=None, y_range=None,
+                        max_points=DENSITY_MAX_POINTS):
+    """
+    Bin two numerical columns into a 2D count grid in SQL
+    
+    Args:
+        path: staged CSV or Parquet file
+        sql_filter: optional WHERE condition
+        x_col: x-axis column
+        y_col: y-axis column
+        bins: number of bins per axis
+        x_range: optional (low, high) window on x; defaults to the full range
+        y_range: optional (low, high) window on y; defaults to the full range
+        max_points: largest number of raw points returned
+        
+    Returns:
+        dict in the layout of compute_density_grid, or None when no row has
+        values in both columns
+    """
+    con = open_duckdb_source(path, sql_filter)
+    try:
+        x = _duckdb_value_expression(x_col, 'Numerical')
+        y = _duckdb_value_expression(y_col, 'Numerical')
+        pairs = f"SELECT {x} AS x, {y} AS y FROM data WHERE isfinite({x}) AND isfinite({y})"
+        if x_range is None or y_range is None:
+            x_low, x_high, y_low, y_high = con.execute(f"SELECT min(x), max(x), min(y), max(y) FROM ({pairs})").fetchone()
+            if x_low is None:
+                return None
+            x_range = x_range or (x_low, x_high)
+            y_range = y_range or (y_low, y_high)
+        
+        x_bin, x_edges = _histogram_bin_sql('x', float(x_range[0]), float(x_range[1]), bins)
+        y_bin, y_edges = _histogram_bin_sql('y', float(y_range[0]), float(y_range[1]), bins)
+        window = (f"SELECT * FROM ({pairs}) WHERE x BETWEEN {float(x_edges[0])!r} AND {float(x_edges[-1])!r} "
+                  f"AND y BETWEEN {float(y_edges[0])!r} AND {float(y_edges[-1])!r}")
+        cells = con.execute(f"SELECT {y_bin} AS iy, {x_bin} AS ix, count(*) AS n FROM ({window}) GROUP BY ALL").fetchnumpy()
+        counts = np.zeros((bins, bins), dtype=np.int64)
+        counts[cells['iy'], cells['ix']] = cells['n']
+        n_points = int(counts.sum())
+        points = None
+        if n_points <= max_points:
+            rows = con.execute(f"SELECT x, y FROM ({window})").fetchnumpy()
+            points = (np.asarray(rows['x'], dtype=np.float64), np.asarray(rows['y'], dtype=np.float64))
+    finally:
+        con.close()
+    
+    return {'counts': counts, 'x_edges': x_edges, 'y_edges': y_edges, 'n_points': n_points, 'points': points}
+
+
+def _to_builtin(value):
+    """Convert numpy scalars to plain Python values for JSON encoding"""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _frame_to_json(frame):
+    """Encode a DataFrame as a JSON-compatible 'split' dict"""
+    if frame is None:
+        return None
+    return json.loads(frame.to_json(orient='split', date_format='iso', default_handler=str))
+
+
+def _frame_from_json(payload):
+    """Decode a DataFrame encoded by _frame_to_json"""
+    if payload is None:
+        return None
+    return pd.DataFrame(payload['data'], index=payload['index'], columns=payload['columns'])
+
+
+def _restore_dtypes(frame, dtypes):
+    """
+    Reapply the dtypes a frame had before _frame_to_json (datetimes become ISO text)
+    
+    Args:
+        frame: DataFrame decoded by _frame_from_json
+        dtypes: dtype names aligned with the columns, or None for older artifacts
+        
+    Returns:
+        DataFrame
+    """
+    if frame is None or dtypes is None:
+        return frame
+    for col, dtype in zip(list(frame.columns), dtypes):
+        try:
+            if dtype.startswith('datetime64'):
+                values = pd.to_datetime(frame[col], format='ISO8601', utc=True)
+                timezone = dtype[dtype.find(', ') + 2:-1] if ', ' in dtype else None
+                frame[col] = values.dt.tz_convert(timezone) if timezone else values.dt.tz_localize(None)
+            elif dtype in ('category', 'bool', 'boolean') or dtype.startswith(('int', 'Int', 'float', 'Float')):
+                frame[col] = frame[col].astype(dtype)
+        except (TypeError, ValueError):
+            # Keep the decoded values (e.g. an integer column holding nulls)
+            pass
+    return frame
+
+
+def _sketch_to_artifact(sketch, arrays):
+    """Encode a dataset sketch as JSON metadata, adding its arrays to `arrays`"""
+    columns_meta = []
+    for i, (col, column_sketch) in enumerate(sketch['columns'].items()):
+        arrays[f'sketch_hll_{i}'] = column_sketch['hll']
+        entry = {
+            'column': col,
+            'top_k': [[value, count] for value, count in column_sketch['top_k'].items()],
+            **{key: _to_builtin(value) for key, value in column_sketch.items()
+               if key in ('kind', 'count', 'nulls', 'n', 'mean', 'm2', 'min', 'max', 'top_k_error', 'distinct')}
+        }
+        if column_sketch['kind'] in ('Numerical', 'Temporal'):
+            arrays[f'sketch_quantile_values_{i}'] = column_sketch['quantile_values']
+            arrays[f'sketch_quantile_weights_{i}'] = column_sketch['quantile_weights']
+        columns_meta.append(entry)
+    
+    for key in ('n', 'mean', 'm2', 'comoment'):
+        arrays[f'comoment_{key}'] = sketch['comoments'][key]
+    
+    return {
+        'n_rows': sketch['n_rows'],
+        'columns': columns_meta,
+        'comoment_columns': sketch['comoments']['columns']
+    }
+
+
+def _sketch_from_artifact(meta, arrays):
+    """Decode a dataset sketch encoded by _sketch_to_artifact"""
+    columns = {}
+    for i, entry in enumerate(meta['columns']):
+        column_sketch = {key: np.nan if value is None else value for key, value in entry.items()
+                         if key not in ('column', 'top_k')}
+        column_sketch['top_k'] = {value: count for value, count in entry['top_k']}
+        column_sketch['hll'] = arrays[f'sketch_hll_{i}']
+        if entry['kind'] in ('Numerical', 'Temporal'):
+            column_sketch['quantile_values'] = arrays[f'sketch_quantile_values_{i}']
+            column_sketch['quantile_weights'] = arrays[f'sketch_quantile_weights_{i}']
+        columns[entry['column']] = column_sketch
+    
+    comoments = {key: arrays[f'comoment_{key}'] for key in ('n', 'mean', 'm2', 'comoment')}
+    comoments['columns'] = meta['comoment_columns']
+    return {'n_rows': meta['n_rows'], 'columns': columns, 'comoments': comoments}
+
+
+def save_profile_artifact(profile):
+    """
+    Serialize a profile to a compact artifact (JSON metadata + NumPy arrays)
+    
+    Args:
+        profile: dict returned by build_profile
+        
+    Returns:
+        BytesIO: zip archive with 'meta.json' and 'arrays.npz'
+    """
+    arrays = {}
+    numeric_meta = []
+    for i, (col, aggregates) in enumerate(profile['numeric_aggregates'].items()):
+        arrays[f'hist_counts_{i}'] = aggregates['hist_counts']
+        arrays[f'hist_edges_{i}'] = aggregates['hist_edges']
+        numeric_meta.append({
+            'column': col,
+            'stats': {key: _to_builtin(value) for key, value in aggregates.items()
+                      if key not in ('hist_counts', 'hist_edges')}
+        })
+    
+    temporal_meta = []
+    for i, (col, aggregates) in enumerate(profile['temporal_aggregates'].items()):
+        arrays[f'period_starts_{i}'] = aggregates['period_starts']
+        arrays[f'period_counts_{i}'] = aggregates['period_counts']
+        temporal_meta.append({
+            'column': col,
+            'stats': {key: _to_builtin(value) for key, value in aggregates.items()
+                      if key not in ('period_starts', 'period_counts')}
+        })
+    
+    text_meta = []
+    for i, (col, aggregates) in enumerate(profile['text_aggregates'].items()):
+        arrays[f'length_hist_counts_{i}'] = aggregates['length_hist_counts']
+        arrays[f'length_hist_edges_{i}'] = aggregates['length_hist_edges']
+        text_meta.append({
+            'column': col,
+            'stats': {key: _to_builtin(value) for key, value in aggregates.items()
+                      if key not in ('length_hist_counts', 'length_hist_edges')}
+        })
+    
+    corr_matrix = profile['corr_matrix']
+    if corr_matrix is not None:
+        arrays['corr'] = corr_matrix.to_numpy(dtype='float64')
+    
+    categorical_association = profile['categorical_association']
+    if categorical_association['cramers_v'] is not None:
+        arrays['cramers_v'] = categorical_association['cramers_v'].to_numpy(dtype='float64')
+        arrays['theils_u'] = categorical_association['theils_u'].to_numpy(dtype='float64')
+    
+    quality_report = profile['quality_report']
+    meta = {
+        'version': PROFILE_ARTIFACT_VERSION,
+        'file_name': profile['file_name'],
+        'file_hash': profile['file_hash'],
+        'file_type': profile['file_type'],
+        'n_rows': profile['n_rows'],
+        'n_cols': profile['n_cols'],
+        'memory_mb': profile['memory_mb'],
+        'preview': _frame_to_json(profile['preview']),
+        'preview_dtypes': [str(dtype) for dtype in profile['preview'].dtypes],
+        'summary_df': _frame_to_json(profile['summary_df']),
+        'quality_report': {
+            'columns_with_missing': [[col, _to_builtin(count), _to_builtin(pct)]
+                                     for col, count, pct in quality_report['columns_with_missing']],
+            'columns_high_missing': [[col, _to_builtin(pct)] for col, pct in quality_report['columns_high_missing']],
+            'columns_all_zeros': quality_report['columns_all_zeros'],
+            'constant_features': quality_report['constant_features'],
+            'type_mismatch': quality_report['type_mismatch'],
+            'duplicate_rows': _to_builtin(quality_report['duplicate_rows'])
+        },
+        'stats_df': _frame_to_json(profile['stats_df']),
+        'corr_columns': None if corr_matrix is None else corr_matrix.columns.tolist(),
+        'strong_correlations': None if profile['strong_correlations'] is None else [
+            [col1, col2, _to_builtin(value)] for col1, col2, value in profile['strong_correlations']
+        ],
+        'insights': profile['insights'],
+        'categorical_association': {
+            **{key: value for key, value in categorical_association.items() if key not in ('cramers_v', 'theils_u')},
+            'columns': None if categorical_association['cramers_v'] is None
+            else categorical_association['cramers_v'].columns.tolist()
+        },
+        'numeric_aggregates': numeric_meta,
+        'categorical_aggregates': [
+            {'column': col, **{key: _to_builtin(value) for key, value in aggregates.items()}}
+            for col, aggregates in profile['categorical_aggregates'].items()
+        ],
+        'temporal_aggregates': temporal_meta,
+        'text_aggregates': text_meta,
+        'outlier_summary': _frame_to_json(profile['outlier_scan']['summary']),
+        'associations': _frame_to_json(profile['associations']),
+        'association_skipped': profile['association_skipped'],
+        'missingness': {
+            'n_rows': profile['missingness']['n_rows'],
+            'columns': profile['missingness']['columns'],
+            'patterns': profile['missingness']['patterns']
+        },
+        'sketch': None if profile['sketch'] is None else _sketch_to_artifact(profile['sketch'], arrays)
+    }
+    for key in ('null_counts', 'cooccurrence', 'heatmap', 'bin_starts'):
+        arrays[f'missingness_{key}'] = profile['missingness'][key]
+    for key in ('score_counts', 'top_rows', 'top_scores'):
+        arrays[f'outlier_{key}'] = profile['outlier_scan'][key]
+    
+    arrays_buffer = BytesIO()
+    np.savez(arrays_buffer, **arrays)
+    
+    output = BytesIO()
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('meta.json', json.dumps(meta, default=str))
+        archive.writestr('arrays.npz', arrays_buffer.getvalue())
+    
+    output.seek(0)
+    return output
+
+
+def load_profile_artifact(source):
+    """
+    Load a profile artifact written by save_profile_artifact
+    
+    Args:
+        source: file path or file-like object
+        
+    Returns:
+        dict: profile in the same layout as build_profile
+    """
+    with zipfile.ZipFile(source) as archive:
+        meta = json.loads(archive.read('meta.json'))
+        arrays = np.load(BytesIO(archive.read('arrays.npz')))
+        
+        if meta.get('version') != PROFILE_ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported profile artifact version: {meta.get('version')}")
+        
+        numeric_aggregates = {}
+        for i, entry in enumerate(meta['numeric_aggregates']):
+            aggregates = {key: np.nan if value is None else value for key, value in entry['stats'].items()}
+            aggregates['hist_counts'] = arrays[f'hist_counts_{i}']
+            aggregates['hist_edges'] = arrays[f'hist_edges_{i}']
+            numeric_aggregates[entry['column']] = aggregates
+        
+        temporal_aggregates = {}
+        for i, entry in enumerate(meta['temporal_aggregates']):
+            aggregates = {key: np.nan if value is None and key.endswith('_seconds') else value
+                          for key, value in entry['stats'].items()}
+            aggregates['period_starts'] = arrays[f'period_starts_{i}']
+            aggregates['period_counts'] = arrays[f'period_counts_{i}']
+            temporal_aggregates[entry['column']] = aggregates
+        
+        text_aggregates = {}
+        for i, entry in enumerate(meta['text_aggregates']):
+            aggregates = entry['stats']
+            aggregates['length_hist_counts'] = arrays[f'length_hist_counts_{i}']
+            aggregates['length_hist_edges'] = arrays[f'length_hist_edges_{i}']
+            text_aggregates[entry['column']] = aggregates
+        
+        corr_matrix = None
+        if meta['corr_columns'] is not None:
+            corr_matrix = pd.DataFrame(arrays['corr'], index=meta['corr_columns'], columns=meta['corr_columns'])
+        
+        categorical_association = meta['categorical_association']
+        association_columns = categorical_association.pop('columns')
+        categorical_association['strong'] = [tuple(item) for item in categorical_association['strong']]
+        for key in ('cramers_v', 'theils_u'):
+            categorical_association[key] = None if association_columns is None else pd.DataFrame(
+                arrays[key], index=association_columns, columns=association_columns
+            )
+        
+        outlier_scan = {key: arrays[f'outlier_{key}'] for key in ('score_counts', 'top_rows', 'top_scores')}
+        outlier_scan['summary'] = _frame_from_json(meta['outlier_summary'])
+        
+        sketch = None if meta['sketch'] is None else _sketch_from_artifact(meta['sketch'], arrays)
+        
+        missingness = meta['missingness']
+        missingness['patterns'] = [(missing, count) for missing, count in missingness['patterns']]
+        for key in ('null_counts', 'cooccurrence', 'heatmap', 'bin_starts'):
+            missingness[key] = arrays[f'missingness_{key}']
+    
+    quality_report = meta['quality_report']
+    quality_report['columns_with_missing'] = [tuple(item) for item in quality_report['columns_with_missing']]
+    quality_report['columns_high_missing'] = [tuple(item) for item in quality_report['columns_high_missing']]
+    
+    return {
+        'version': meta['version'],
+        'file_name': meta['file_name'],
+        'file_hash': meta['file_hash'],
+        'file_type': meta['file_type'],
+        'n_rows': meta['n_rows'],
+        'n_cols': meta['n_cols'],
+        'memory_mb': meta['memory_mb'],
+        'preview': _restore_dtypes(_frame_from_json(meta['preview']), meta.get('preview_dtypes')),
+        'summary_df': _frame_from_json(meta['summary_df']),
+        'quality_report': quality_report,
+        'stats_df': _frame_from_json(meta['stats_df']),
+        'corr_matrix': corr_matrix,
+        'strong_correlations': None if meta['strong_correlations'] is None else [
+            tuple(item) for item in meta['strong_correlations']
+        ],
+        'insights': meta['insights'],
+        'categorical_association': categorical_association,
+        'numeric_aggregates': numeric_aggregates,
+        'categorical_aggregates': {
+            entry.pop('column'): entry for entry in meta['categorical_aggregates']
+        },
+        'temporal_aggregates': temporal_aggregates,
+        'text_aggregates': text_aggregates,
+        'outlier_scan': outlier_scan,
+        'associations': _frame_from_json(meta['associations']),
+        'association_skipped': meta['association_skipped'],
+        'missingness': missingness,
+        'sketch': sketch
+    }
+
+
+def load_cached_profile(file_hash, cache_dir=PROFILE_CACHE_DIR):
+    """
+    Return the cached profile for a file hash, or None if there is none
+    
+    Args:
+        file_hash: content hash of the uploaded file
+        cache_dir: directory holding cached artifacts
+        
+    Returns:
+        dict or None
+    """
+    path = os.path.join(cache_dir, f"{file_hash}.{PROFILE_ARTIFACT_EXTENSION}")
+    if not os.path.exists(path):
+        return None
+    try:
+        # The modification time records the last use for eviction
+        os.utime(path)
+        return load_profile_artifact(path)
+    except Exception:
+        # Corrupted or outdated artifact - recompute
+        return None
+
+
+def evict_cached_profiles(cache_dir=PROFILE_CACHE_DIR, max_mb=PROFILE_CACHE_MAX_MB, keep=None):
+    """
+    Delete the least recently used artifacts until the cache fits its size limit
+    
+    Args:
+        cache_dir: directory holding cached artifacts
+        max_mb: size limit in MB (0 for no limit)
+        keep: path that is never evicted (the artifact just written)
+    """
+    if not max_mb:
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(f".{PROFILE_ARTIFACT_EXTENSION}"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:  # Evicted by another session meanwhile
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_mb * 1024 ** 2:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def save_cached_profile(profile, cache_dir=PROFILE_CACHE_DIR):
+    """
+    Write a profile artifact into the cache directory, keyed by file hash
+    
+    The least recently used artifacts are evicted once the directory exceeds
+    PROFILE_CACHE_MAX_MB.
+    
+    Args:
+        profile: dict returned by build_profile
+        cache_dir: directory holding cached artifacts
+    """
+    if not profile['file_hash']:
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, f"{profile['file_hash']}.{PROFILE_ARTIFACT_EXTENSION}")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(save_profile_artifact(profile).getvalue())
+        os.replace(tmp_path, path)
+        evict_cached_profiles(cache_dir, keep=path)
+    except OSError:
+        # Caching is best effort (e.g. read-only file system)
+        pass
+
+
+def load_dataset_sketch(uploaded_file):
+    """
+    Get a dataset sketch for an uploaded file without loading it in full
+    
+    Saved profiles and cached profiles are reused; other files are streamed
+    chunk by chunk.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        
+    Returns:
+        tuple: (dataset sketch, error_message)
+    """
+    try:
+        file_extension = uploaded_file.name.split('.')[-1].lower()
+        if file_extension == PROFILE_ARTIFACT_EXTENSION:
+            sketch = load_profile_artifact(uploaded_file)['sketch']
+            if sketch is None:
+                return None, "This saved profile was built in out-of-core mode and has no drift sketch."
+            return sketch, None
+        
+        profile = load_cached_profile(compute_file_hash(uploaded_file))
+        if profile is not None:
+            return profile['sketch'], None
+        
+        sketch = build_dataset_sketch(iter_data_chunks(uploaded_file))
+        if sketch is None or sketch['n_rows'] == 0:
+            return None, "The uploaded file is empty."
+        return sketch, None
+    
+    except Exception as e:
+        return None, f"Error loading file: {str(e)}"
+
+
+@st.cache_resource
+def _tracemalloc_users():
+    """Runs tracing allocations, shared by every session of the server process"""
+    return {'lock': threading.Lock(), 'count': 0, 'started': False}
+
+
+@contextmanager
+def tracemalloc_session():
+    """
+    Trace allocations while a diagnostics run is in progress
+    
+    Tracing slows every allocation in the process, so it is started for the
+    first concurrent diagnostics run and stopped when the last one ends. It is
+    left alone if something else (e.g. benchmark.py) started it.
+    """
+    users = _tracemalloc_users()
+    with users['lock']:
+        users['count'] += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            users['started'] = True
+    try:
+        yield
+    finally:
+        with users['lock']:
+            users['count'] -= 1
+            if users['count'] == 0 and users['started']:
+                tracemalloc.stop()
+                users['started'] = False
+
+
+# Open measure_stage blocks of this thread, innermost last, with their running peaks
+_traced_stages = threading.local()
+
+
+def _current_rss_mb():
+    """Return the current resident set size in MB, or None if unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_mb():
+    """Return the process peak resident set size in MB, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _arrow_payload_bytes(frame):
+    """Estimate the bytes Streamlit sends to the browser for a DataFrame"""
+    try:
+        table = pa.Table.from_pandas(frame)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().size
+    except Exception:
+        return None
+
+
+@contextmanager
+def measure_stage(diagnostics, name, kind='stage'):
+    """
+    Record wall time, CPU time and memory growth of a block of code
+    
+    Does nothing when diagnostics is None. The yielded record can be updated
+    by the caller (e.g. with 'payload_bytes').
+    
+    Args:
+        diagnostics: dict with a 'stages' list, or None
+        name: stage name
+        kind: 'stage', 'chart', 'table' or 'download'
+        
+    Yields:
+        dict or None: the stage record
+    """
+    if diagnostics is None:
+        yield None
+        return
+    
+    record = {'stage': name, 'kind': kind}
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # reset_peak() is global, so the peak so far is folded into every enclosing stage first
+        if not hasattr(_traced_stages, 'stack'):
+            _traced_stages.stack = []
+        stack = _traced_stages.stack
+        traced_before, peak_so_far = tracemalloc.get_traced_memory()
+        for frame in stack:
+            frame['peak'] = max(frame['peak'], peak_so_far)
+        tracemalloc.reset_peak()
+        frame = {'peak': traced_before}
+        stack.append(frame)
+    rss_before = _current_rss_mb()
+    peak_before = _peak_rss_mb()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    
+    try:
+        yield record
+    finally:
+        record['wall_ms'] = round((time.perf_counter() - wall_start) * 1000, 2)
+        record['cpu_ms'] = round((time.process_time() - cpu_start) * 1000, 2)
+        rss_after = _current_rss_mb()
+        peak_after = _peak_rss_mb()
+        record['rss_mb'] = None if rss_after is None else round(rss_after, 2)
+        record['rss_delta_mb'] = None if rss_after is None or rss_before is None else round(rss_after - rss_before, 2)
+        record['peak_rss_growth_mb'] = None if peak_after is None else round(peak_after - peak_before, 2)
+        record['tracemalloc_peak_mb'] = None
+        if tracing:
+            stack.pop()
+            if tracemalloc.is_tracing():
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                for parent in stack:
+                    parent['peak'] = max(parent['peak'], peak)
+                record['tracemalloc_peak_mb'] = round((peak - traced_before) / 1024**2, 2)
+        record.setdefault('payload_bytes', None)
+        diagnostics['stages'].append(record)
+
+
+def show_chart(fig, diagnostics=None, name="Chart"):
+    """Render a plotly chart, recording its serialization size when instrumented"""
+    with measure_stage(diagnostics, name, kind='chart') as record:
+        if record is not None:
+            record['payload_bytes'] = len(fig.to_json())
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def show_table(data, diagnostics=None, name="Table"):
+    """Render a DataFrame or Styler, recording its Arrow payload size when instrumented"""
+    with measure_stage(diagnostics, name, kind='table') as record:
+        if record is not None:
+            record['payload_bytes'] = _arrow_payload_bytes(getattr(data, 'data', data))
+        st.dataframe(data, use_container_width=True)
+
+
+def _row_highlight_styles(frame, danger_mask, warning_mask):
+    """Build a Styler CSS frame that colors whole rows from two boolean masks"""
+    row_css = np.where(danger_mask, 'background-color: #f8d7da',
+                       np.where(warning_mask, 'background-color: #fff3cd', ''))
+    return pd.DataFrame(np.repeat(row_css[:, None], frame.shape[1], axis=1),
+                        index=frame.index, columns=frame.columns)
+
+
+def highlight_missing_styles(frame):
+    """
+    Vectorized row highlighting for the Feature Summary (use with Styler.apply(axis=None))
+    
+    Args:
+        frame: feature summary DataFrame (or a window of it)
+        
+    Returns:
+        DataFrame of CSS strings
+    """
+    if 'Null %' not in frame.columns:
+        return pd.DataFrame('', index=frame.index, columns=frame.columns)
+    null_pct = frame['Null %'].to_numpy(dtype='float64')
+    return _row_highlight_styles(frame, null_pct > 30, null_pct > 0)
+
+
+def highlight_drift_styles(frame):
+    """
+    Vectorized row highlighting for the drift report (use with Styler.apply(axis=None))
+    
+    Args:
+        frame: drift DataFrame (or a window of it)
+        
+    Returns:
+        DataFrame of CSS strings
+    """
+    if 'Drift' not in frame.columns:
+        return pd.DataFrame('', index=frame.index, columns=frame.columns)
+    drift = frame['Drift'].to_numpy(dtype=object)
+    return _row_highlight_styles(frame, np.isin(drift, ['High', 'Added', 'Removed', 'Type changed']), drift == 'Moderate')
+
+
+def _build_diverging_palette(anchors, steps=201):
+    """Interpolate hex anchor colors into a lookup table of cell CSS strings"""
+    rgb = np.array([[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in anchors], dtype=np.float64)
+    positions = np.linspace(0, 1, len(anchors))
+    grid = np.linspace(0, 1, steps)
+    channels = np.column_stack([np.interp(grid, positions, rgb[:, c]) for c in range(3)]).round().astype(int)
+    # Relative luminance decides between dark and light text (as Styler.background_gradient does)
+    linear = channels / 255.0
+    linear = np.where(linear <= 0.03928, linear / 12.92, ((linear + 0.055) / 1.055) ** 2.4)
+    luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+    return np.array([
+        f"background-color: #{r:02x}{g:02x}{b:02x}; color: {'#f1f1f1' if lum < 0.408 else '#000000'}"
+        for (r, g, b), lum in zip(channels, luminance)
+    ], dtype=object)
+
+
+@lru_cache(maxsize=None)
+def _correlation_palette():
+    """RdBu diverging palette: -1 = dark red, 0 = white, +1 = dark blue"""
+    return _build_diverging_palette([
+        '#67001f', '#b2182b', '#d6604d', '#f4a582', '#fddbc7', '#f7f7f7',
+        '#d1e5f0', '#92c5de', '#4393c3', '#2166ac', '#053061'
+    ])
+
+
+def correlation_gradient_styles(frame):
+    """
+    Vectorized RdBu background gradient for correlation values in [-1, 1]
     
-    return fig
+    Colors come from a precomputed lookup table, so no per-cell Python work
+    (or matplotlib) is needed. Use with Styler.apply(axis=None).
+    
+    Args:
+        frame: correlation matrix (or a window of it)
+        
+    Returns:
+        DataFrame of CSS strings
+    """
+    values = frame.to_numpy(dtype='float64')
+    palette = _correlation_palette()
+    steps = len(palette) - 1
+    index = np.clip(np.rint((np.nan_to_num(values) + 1) / 2 * steps), 0, steps).astype(np.int64)
+    css = np.where(np.isnan(values), '', palette[index])
+    return pd.DataFrame(css, index=frame.index, columns=frame.columns)
 
 
-def plot_categorical_bar(df, column):
+def show_paginated_table(frame, diagnostics=None, name="Table", style=None, key="table",
+                         page_size=TABLE_PAGE_SIZE, column_page_size=TABLE_COLUMN_PAGE_SIZE):
     """
-    Create bar chart for categorical column
+    Render a DataFrame one window at a time
+    
+    Only the visible rows/columns are styled and sent to the browser, so the
+    cost stays flat as the table grows. Small tables render in one piece.
+    
+    Args:
+        frame: pandas DataFrame
+        diagnostics: optional diagnostics dict
+        name: stage name for diagnostics
+        style: optional vectorized style function for Styler.apply(axis=None)
+        key: unique widget key prefix
+        page_size: rows per page
+        column_page_size: columns per page
+    """
+    n_rows, n_cols = frame.shape
+    row_start, col_start = 0, 0
+    row_pages = max(1, -(-n_rows // page_size))
+    col_pages = max(1, -(-n_cols // column_page_size))
+    
+    if row_pages > 1 or col_pages > 1:
+        nav_col1, nav_col2 = st.columns(2)
+        if row_pages > 1:
+            with nav_col1:
+                page = st.number_input(f"Row page (of {row_pages})", min_value=1, max_value=row_pages,
+                                       value=1, key=f"{key}_row_page")
+                row_start = (page - 1) * page_size
+        if col_pages > 1:
+            with nav_col2:
+                col_page = st.number_input(f"Column page (of {col_pages})", min_value=1, max_value=col_pages,
+                                           value=1, key=f"{key}_col_page")
+                col_start = (col_page - 1) * column_page_size
+    
+    row_end = min(row_start + page_size, n_rows)
+    col_end = min(col_start + column_page_size, n_cols)
+    window = frame.iloc[row_start:row_end, col_start:col_end]
+    
+    show_table(window.style.apply(style, axis=None) if style is not None else window, diagnostics, name)
+    
+    if row_pages > 1 or col_pages > 1:
+        st.caption(f"Showing rows {row_start + 1}-{row_end} of {n_rows:,} and columns {col_start + 1}-{col_end} of {n_cols:,}")
+
+
+def compute_sort_index(series, ascending=True):
+    """
+    Compute the row positions that sort a column, with nulls last
+    
+    Args:
+        series: pandas Series
+        ascending: sort direction
+        
+    Returns:
+        numpy array of row positions
+    """
+    return series.reset_index(drop=True).sort_values(
+        ascending=ascending, kind='stable', na_position='last'
+    ).index.to_numpy()
+
+
+def compute_filter_mask(df, filters):
+    """
+    Evaluate column filters into a single boolean row mask
     
     Args:
         df: pandas DataFrame
-        column: column name
+        filters: list of (column, operator, value) tuples where operator is
+                 'between' (value = (low, high)), 'contains' or 'not_null'
         
     Returns:
-        plotly figure
+        numpy boolean array
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, operator, value in filters:
+        series = df[column]
+        if operator == 'between':
+            low, high = value
+            values = series if pd.api.types.is_datetime64_any_dtype(series) else pd.to_numeric(series, errors='coerce')
+            mask &= ((values >= low) & (values <= high)).to_numpy(dtype=bool, na_value=False)
+        elif operator == 'contains':
+            mask &= series.astype(str).str.contains(value, case=False, regex=False).to_numpy(dtype=bool, na_value=False) \
+                & series.notna().to_numpy()
+        elif operator == 'not_null':
+            mask &= series.notna().to_numpy()
+        else:
+            raise ValueError(f"Unknown filter operator: {operator}")
+    return mask
+
+
+def _remember_recent(store, key, value, limit=BROWSER_CACHED_VIEWS):
+    """Add an entry to a memo dict, dropping the oldest entries beyond `limit`"""
+    while len(store) >= limit:
+        store.pop(next(iter(store)))
+    store[key] = value
+    return value
+
+
+def get_browser_view(df, cache, sort_column=None, ascending=True, filters=()):
     """
-    value_counts = df[column].value_counts().head(20)  # Limit to top 20
+    Get the ordered row positions for a sort/filter combination
     
-    fig = px.bar(
-        x=value_counts.index,
-        y=value_counts.values,
-        title=f"Value Counts for {column} (Top 20)",
-        labels={'x': column, 'y': 'Count'},
-        color_discrete_sequence=['#ff7f0e']
-    )
+    Sort indexes, filter masks and the combined view are memoized in `cache`,
+    so after the first request each page flip only slices the view. Each of
+    them is a full-length array, so only the most recent BROWSER_CACHED_VIEWS
+    of each kind are kept.
     
-    fig.update_layout(
-        showlegend=False,
-        height=400,
-        xaxis_tickangle=-45
-    )
+    Args:
+        df: pandas DataFrame
+        cache: dict kept across reruns for the same dataset
+        sort_column: column to sort by, or None for file order
+        ascending: sort direction
+        filters: list of (column, operator, value) tuples
+        
+    Returns:
+        numpy array of row positions
+    """
+    filters = tuple(filters)
+    view_key = (sort_column, ascending, filters)
+    views = cache.setdefault('views', {})
+    if view_key in views:
+        return views[view_key]
     
-    return fig
+    if sort_column is None:
+        order = np.arange(len(df))
+    else:
+        sort_key = (sort_column, ascending)
+        sort_indexes = cache.setdefault('sort_indexes', {})
+        order = sort_indexes.get(sort_key)
+        if order is None:
+            order = _remember_recent(sort_indexes, sort_key, compute_sort_index(df[sort_column], ascending))
+    
+    if filters:
+        masks = cache.setdefault('filter_masks', {})
+        mask = masks.get(filters)
+        if mask is None:
+            mask = _remember_recent(masks, filters, compute_filter_mask(df, filters))
+        order = order[mask[order]]
+    
+    return _remember_recent(views, view_key, order)
 
 
-def plot_missing_values(df):
+def factorize_column(series):
     """
-    Create bar chart for missing values
+    Encode a column as integer codes plus the array of distinct values
+    
+    Args:
+        series: pandas Series
+        
+    Returns:
+        dict: 'codes' (-1 for missing values), 'uniques' and per-code 'counts'
+    """
+    codes, uniques = pd.factorize(series)
+    return {
+        'codes': codes,
+        'uniques': np.asarray(uniques),
+        'counts': np.bincount(codes[codes >= 0], minlength=len(uniques))
+    }
+
+
+def get_group_index(df, column, cache):
+    """
+    Return the factorized codes of a column, computing them at most once
     
     Args:
         df: pandas DataFrame
+        column: column to factorize
+        cache: dict kept with the dataset, mapping column -> factorize_column result
         
     Returns:
-        plotly figure
+        dict returned by factorize_column
     """
-    missing_counts = df.isnull().sum()
-    missing_counts = missing_counts[missing_counts > 0].sort_values(ascending=False)
+    if column not in cache:
+        cache[column] = factorize_column(df[column])
+    return cache[column]
+
+
+def first_occurrence_mask(codes):
+    """
+    Mark the first row of every code, like drop_duplicates on the column
     
-    if len(missing_counts) == 0:
-        return None
+    Args:
+        codes: integer codes from factorize_column (-1 for missing values)
+        
+    Returns:
+        numpy boolean array
+    """
+    # Shift so missing values form their own group, as drop_duplicates does
+    shifted = codes + 1
+    first_row = np.full(shifted.max(initial=0) + 1, codes.size, dtype=np.int64)
+    # Writing positions in reverse leaves the smallest position per code
+    first_row[shifted[::-1]] = np.arange(codes.size - 1, -1, -1)
+    mask = np.zeros(codes.size, dtype=bool)
+    mask[first_row[first_row < codes.size]] = True
+    return mask
+
+
+def top_group_codes(codes, n_groups, top_n):
+    """
+    Return the codes of the most frequent groups, most frequent first
     
-    fig = px.bar(
-        x=missing_counts.index,
-        y=missing_counts.values,
-        title="Missing Values by Column",
-        labels={'x': 'Column', 'y': 'Missing Count'},
-        color_discrete_sequence=['#d62728']
+    Args:
+        codes: integer codes (-1 for missing values)
+        n_groups: number of distinct values
+        top_n: number of groups to keep
+        
+    Returns:
+        tuple: (array of codes, number of non-empty groups)
+    """
+    counts = np.bincount(codes[codes >= 0], minlength=n_groups)
+    non_empty = int(np.count_nonzero(counts))
+    order = np.argsort(-counts, kind='stable')[:min(top_n, non_empty)]
+    return order, non_empty
+
+
+def compute_group_statistics(codes, values, group_codes):
+    """
+    Compute per-group statistics of a numerical column from factorized codes
+    
+    Counts, means and squared deviations from the group means come from
+    np.bincount; quantiles, min and max are read from one sort of the rows by
+    (group, value).
+    
+    Args:
+        codes: integer codes of the grouping column (-1 for missing values)
+        values: float array of the numerical column
+        group_codes: codes of the groups to report, in output order
+        
+    Returns:
+        dict of arrays aligned with group_codes: 'count', 'mean', 'median',
+        'std', 'min', 'max', 'q1', 'q3', 'lower_fence', 'upper_fence'
+    """
+    n_groups = len(group_codes)
+    # Map selected codes to output positions; every other row is dropped
+    position = np.full(codes.max(initial=-1) + 2, -1, dtype=np.int64)
+    position[np.asarray(group_codes) + 1] = np.arange(n_groups)
+    group = position[codes + 1]
+    valid = (group >= 0) & np.isfinite(values)
+    group, values = group[valid], values[valid]
+    
+    count = np.bincount(group, minlength=n_groups)
+    total = np.bincount(group, weights=values, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+    
+    # Second pass over deviations: sums of squares cancel when the mean dwarfs the spread
+    deviations = values - mean[group]
+    squared = np.bincount(group, weights=deviations * deviations, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = squared / (count - 1)
+    std = np.where(count > 1, np.sqrt(variance), np.nan)
+    
+    if values.size == 0:
+        empty = np.full(n_groups, np.nan)
+        return {'count': count, 'mean': empty, 'median': empty, 'std': empty, 'min': empty, 'max': empty,
+                'q1': empty, 'q3': empty, 'lower_fence': empty, 'upper_fence': empty}
+    
+    order = np.lexsort((values, group))
+    sorted_values, sorted_group = values[order], group[order]
+    starts = np.concatenate([[0], np.cumsum(count)[:-1]])
+    
+    def quantile(q):
+        # Linear interpolation within each group's sorted block
+        pos = starts + q * np.maximum(count - 1, 0)
+        low = np.minimum(np.floor(pos).astype(np.int64), values.size - 1)
+        high = np.minimum(np.ceil(pos).astype(np.int64), values.size - 1)
+        result = sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+        return np.where(count > 0, result, np.nan)
+    
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    minimum, maximum = quantile(0.0), quantile(1.0)
+    
+    # Whiskers end at the most extreme values inside 1.5 IQR of each group
+    iqr = q3 - q1
+    inside = (sorted_values >= (q1 - 1.5 * iqr)[sorted_group]) & (sorted_values <= (q3 + 1.5 * iqr)[sorted_group])
+    inside_group = sorted_group[inside]
+    inside_values = sorted_values[inside]
+    lower_fence = np.full(n_groups, np.nan)
+    upper_fence = np.full(n_groups, np.nan)
+    if inside_values.size:
+        # Blocks stay sorted, so the first and last inside value bound each group
+        boundaries = np.flatnonzero(np.diff(inside_group)) + 1
+        block_starts = np.concatenate([[0], boundaries])
+        block_ends = np.concatenate([boundaries, [inside_group.size]]) - 1
+        lower_fence[inside_group[block_starts]] = inside_values[block_starts]
+        upper_fence[inside_group[block_ends]] = inside_values[block_ends]
+    
+    return {
+        'count': count, 'mean': mean, 'median': median, 'std': std,
+        'min': minimum, 'max': maximum, 'q1': q1, 'q3': q3,
+        'lower_fence': lower_fence, 'upper_fence': upper_fence
+    }
+
+
+def make_cleaning_step(df, column, method):
+    """
+    Turn a "Handle Missing Values" choice into a replayable cleaning step
+    
+    Fill values for mean/median/mode are resolved now, so replaying the step
+    on another file uses the same value.
+    
+    Args:
+        df: pandas DataFrame
+        column: target column
+        method: strategy label chosen in the UI
+        
+    Returns:
+        dict: {'action', 'column', 'value'}
+        
+    Raises:
+        ValueError: if the method needs a value computed from a column with
+                    no non-null values
+    """
+    if any(label in method for label in ("Mean", "Median", "Mode")) and not df[column].notna().any():
+        raise ValueError(f"'{column}' has no non-null values to compute a fill value from")
+    if "Dropping Rows" in method:
+        return {'action': 'drop_rows', 'column': column, 'value': None}
+    elif "Drop Column" in method:
+        return {'action': 'drop_column', 'column': column, 'value': None}
+    elif "0" in method:
+        return {'action': 'fill_zero', 'column': column, 'value': 0}
+    elif "Mean" in method:
+        return {'action': 'fill_mean', 'column': column, 'value': _to_builtin(df[column].mean())}
+    elif "Median" in method:
+        return {'action': 'fill_median', 'column': column, 'value': _to_builtin(df[column].median())}
+    elif "Mode" in method:
+        return {'action': 'fill_mode', 'column': column, 'value': _to_builtin(df[column].mode()[0])}
+    elif "Unknown" in method:
+        return {'action': 'fill_unknown', 'column': column, 'value': "Unknown"}
+    raise ValueError(f"Unknown cleaning method: {method}")
+
+
+def describe_cleaning_step(step):
+    """Return a human readable description of a cleaning step"""
+    action, column, value = step['action'], step.get('column'), step.get('value')
+    if action == 'drop_rows':
+        return f"Remove rows with missing values in '{column}'"
+    elif action == 'drop_column':
+        return f"Drop column '{column}'"
+    elif action == 'drop_duplicates':
+        return "Remove duplicate rows"
+    elif action.startswith('fill_') and value is None:
+        return f"Fill missing values in '{column}' (no fill value)"
+    elif action in ('fill_mean', 'fill_median'):
+        return f"Fill missing values in '{column}' with {action[5:].title()} ({value:.2f})"
+    elif action == 'fill_mode':
+        return f"Fill missing values in '{column}' with Mode ('{value}')"
+    return f"Fill missing values in '{column}' with {value!r}"
+
+
+class SeenRows:
+    """
+    Hashes of the rows kept so far by a streamed duplicate removal
+    
+    The hashes are held as one sorted uint64 array, 8 bytes per distinct row,
+    and each chunk's new hashes are merged in with a single insert.
+    """
+    
+    def __init__(self):
+        self.hashes = np.zeros(0, dtype=np.uint64)
+    
+    def mark_duplicates(self, row_hashes):
+        """
+        Flag rows seen before, in this or an earlier chunk, and remember the rest
+        
+        Args:
+            row_hashes: uint64 array of row hashes in chunk order
+            
+        Returns:
+            np.ndarray: boolean mask, True for every occurrence after the first
+        """
+        unique, first = np.unique(row_hashes, return_index=True)
+        positions = np.searchsorted(self.hashes, unique)
+        seen = np.zeros(len(unique), dtype=bool)
+        if len(self.hashes):
+            seen = self.hashes[np.minimum(positions, len(self.hashes) - 1)] == unique
+        duplicated = np.ones(len(row_hashes), dtype=bool)
+        duplicated[first[~seen]] = False
+        self.hashes = np.insert(self.hashes, positions[~seen], unique[~seen])
+        return duplicated
+
+
+def apply_cleaning_pipeline(df, steps, seen_rows=None):
+    """
+    Apply a list of cleaning steps in a single pass
+    
+    Untouched columns are passed through without copying; filled columns are
+    replaced individually and row drops are combined into one mask that is
+    applied at the end.
+    
+    Args:
+        df: pandas DataFrame
+        steps: list of cleaning step dicts
+        seen_rows: optional SeenRows from earlier chunks, used to drop
+                   duplicates across chunks when streaming
+        
+    Returns:
+        tuple: (cleaned DataFrame, list of messages)
+    """
+    columns = {col: df[col] for col in df.columns}
+    keep = np.ones(len(df), dtype=bool)
+    messages = []
+    
+    for step in steps:
+        action, column = step['action'], step.get('column')
+        if column is not None and column not in columns:
+            messages.append(f"Skipped: {describe_cleaning_step(step)} (column not found)")
+            continue
+        
+        if action.startswith('fill_'):
+            value = step['value']
+            if value is None:
+                # Pipelines exported before fills on all-null columns were refused
+                messages.append(f"Skipped: {describe_cleaning_step(step)}")
+                continue
+            if pd.api.types.is_datetime64_any_dtype(columns[column]):
+                # Datetime fill values are stored as ISO strings
+                value = pd.Timestamp(value)
+            elif isinstance(columns[column].dtype, pd.CategoricalDtype) and value not in columns[column].cat.categories:
+                columns[column] = columns[column].cat.add_categories([value])
+            columns[column] = columns[column].fillna(value)
+        elif action == 'drop_rows':
+            keep &= columns[column].notna().to_numpy()
+        elif action == 'drop_column':
+            del columns[column]
+        elif action == 'drop_duplicates':
+            frame = pd.DataFrame(columns, copy=False)
+            kept = np.flatnonzero(keep)
+            if len(kept) < len(frame):
+                frame = frame.take(kept)
+            if seen_rows is None:
+                duplicated = frame.duplicated().to_numpy()
+            else:
+                # Row hashes stand in for rows so earlier chunks need not be kept
+                duplicated = seen_rows.mark_duplicates(pd.util.hash_pandas_object(frame, index=False).to_numpy())
+            keep[kept[duplicated]] = False
+        else:
+            raise ValueError(f"Unknown cleaning action: {action}")
+        messages.append(describe_cleaning_step(step))
+    
+    cleaned = pd.DataFrame(columns, copy=False)
+    if not keep.all():
+        cleaned = cleaned[keep]
+    return cleaned, messages
+
+
+def apply_cleaning_pipeline_to_chunks(chunks, steps):
+    """
+    Replay a cleaning pipeline on a stream of DataFrame chunks
+    
+    Removing duplicates keeps an 8-byte hash of every distinct row seen so
+    far, so its memory grows with the number of distinct rows (about 80 MB
+    per 10 million), not with the file size.
+    
+    Args:
+        chunks: iterable of pandas DataFrames
+        steps: list of cleaning step dicts
+        
+    Yields:
+        cleaned pandas DataFrame chunks
+    """
+    seen_rows = SeenRows() if any(step['action'] == 'drop_duplicates' for step in steps) else None
+    for chunk in chunks:
+        cleaned, _ = apply_cleaning_pipeline(chunk, steps, seen_rows=seen_rows)
+        yield cleaned
+
+
+def export_cleaning_pipeline(steps, source_name=None):
+    """
+    Serialize cleaning steps to JSON
+    
+    Args:
+        steps: list of cleaning step dicts
+        source_name: name of the file the pipeline was built on
+        
+    Returns:
+        str: JSON document
+    """
+    return json.dumps({
+        'version': CLEANING_PIPELINE_VERSION,
+        'source_file': source_name,
+        'created_at': pd.Timestamp.now().isoformat(),
+        'steps': steps
+    }, indent=2, default=str)
+
+
+def load_cleaning_pipeline(source):
+    """
+    Load cleaning steps written by export_cleaning_pipeline
+    
+    Args:
+        source: file-like object or JSON string
+        
+    Returns:
+        list of cleaning step dicts
+    """
+    payload = json.loads(source if isinstance(source, (str, bytes)) else source.read())
+    if payload.get('version') != CLEANING_PIPELINE_VERSION:
+        raise ValueError(f"Unsupported pipeline version: {payload.get('version')}")
+    return payload['steps']
+
+
+def export_diagnostics(diagnostics):
+    """
+    Serialize diagnostics to JSON for attaching to performance tickets
+    
+    Args:
+        diagnostics: dict with 'context' and 'stages'
+        
+    Returns:
+        str: JSON document
+    """
+    return json.dumps({
+        'created_at': pd.Timestamp.now().isoformat(),
+        'environment': {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'streamlit': st.__version__
+        },
+        'context': diagnostics['context'],
+        'stages': diagnostics['stages'],
+        'totals': {
+            'wall_ms': round(sum(s['wall_ms'] for s in diagnostics['stages']), 2),
+            'cpu_ms': round(sum(s['cpu_ms'] for s in diagnostics['stages']), 2),
+            'payload_bytes': sum(s['payload_bytes'] or 0 for s in diagnostics['stages'])
+        }
+    }, indent=2, default=str)
+
+
+def render_diagnostics_panel(diagnostics):
+    """
+    Render the optional diagnostics panel in the sidebar
+    
+    Args:
+        diagnostics: dict with 'context' and 'stages', or None when disabled
+    """
+    st.markdown("---")
+    st.checkbox(
+        "🩺 Diagnostics",
+        key="diagnostics_enabled",
+        help="Record time, CPU, memory and browser payload for every stage and chart"
+    )
+    
+    if diagnostics is None:
+        return
+    
+    if not diagnostics['stages']:
+        st.caption("Diagnostics will be recorded on the next run")
+        return
+    
+    stages_df = pd.DataFrame(diagnostics['stages'])
+    stages_df['payload_kb'] = (stages_df['payload_bytes'].astype('float64') / 1024).round(1)
+    st.dataframe(
+        stages_df[['stage', 'kind', 'wall_ms', 'cpu_ms', 'tracemalloc_peak_mb', 'rss_delta_mb', 'payload_kb']],
+        use_container_width=True
     )
+    st.download_button(
+        label="📥 Download Diagnostics (JSON)",
+        data=export_diagnostics(diagnostics).encode('utf-8'),
+        file_name=f"diagnostics_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json"
+    )
+
+
+def run_duckdb_profile(uploaded_file, file_hash, sql_filter, diagnostics=None):
+    """
+    Profile an upload out of core, reusing this session's profile of the same file and filter
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object (CSV or Parquet)
+        file_hash: content hash of the file
+        sql_filter: WHERE condition, or an empty string
+        diagnostics: optional diagnostics dict
+        
+    Returns:
+        tuple: (profile, staged file path), or (None, None) after showing an error
+    """
+    # SQL profiles depend on the filter, so they are kept for the session instead of the disk cache
+    profile_key = (file_hash, sql_filter)
+    duckdb_profile = st.session_state.get('duckdb_profile')
+    if duckdb_profile is not None and duckdb_profile['key'] == profile_key:
+        profile, duckdb_source = duckdb_profile['profile'], duckdb_profile['path']
+        if not os.path.exists(duckdb_source):
+            # Deleted while this session showed another dataset
+            duckdb_source = duckdb_profile['path'] = stage_duckdb_source(uploaded_file, file_hash)
+        track_duckdb_source(duckdb_source)
+    else:
+        file_extension, _ = split_file_name(uploaded_file.name)
+        with st.spinner("🦆 Profiling your dataset with DuckDB..."):
+            try:
+                with measure_stage(diagnostics, "Stage file for DuckDB"):
+                    duckdb_source = stage_duckdb_source(uploaded_file, file_hash)
+                    track_duckdb_source(duckdb_source)
+                profile = build_profile_duckdb(
+                    duckdb_source, DUCKDB_FILE_TYPES[file_extension], file_name=uploaded_file.name,
+                    file_hash=file_hash, sql_filter=sql_filter or None, diagnostics=diagnostics
+                )
+            except Exception as e:
+                st.error(f"❌ Error profiling with DuckDB: {str(e)}")
+                return None, None
+        st.session_state['duckdb_profile'] = {'key': profile_key, 'profile': profile, 'path': duckdb_source}
+    
+    if profile['n_rows'] == 0:
+        st.error("❌ No rows match the SQL filter." if sql_filter else "❌ The uploaded file is empty.")
+        return None, None
+    st.info("🦆 Out-of-core profile: quantiles are approximate, memory usage shows the file size, "
+            "and row-level views need the raw data")
+    return profile, duckdb_source
+
+
+def render_load_plan(load_plan, estimate, diagnostics=None):
+    """
+    Show which load path admission control took and why, with the per-column estimate
+    
+    Args:
+        load_plan: dict returned by choose_load_strategy
+        estimate: dict returned by estimate_memory_usage
+        diagnostics: optional diagnostics dict
+    """
+    message = f"🧮 **{LOAD_STRATEGY_LABELS[load_plan['strategy']]}**: {load_plan['reason']}"
+    if load_plan['strategy'] == 'full':
+        st.caption(message.replace('**', ''))
+    else:
+        st.info(message)
+    with st.expander("Memory estimate"):
+        rows_label = f"{estimate['rows']:,}" if estimate['rows_exact'] else f"~{estimate['rows']:,}"
+        st.caption(
+            f"{rows_label} rows · {estimate['memory_mb']:,.1f} MB as parsed · {estimate['optimized_mb']:,.1f} MB "
+            f"with categoricals · measured on {estimate['sample_rows']:,} sampled rows; working memory is "
+            f"taken as {MEMORY_LOAD_OVERHEAD:g}× the loaded size"
+        )
+        show_table(estimate['columns'].round(2), diagnostics, "Memory estimate table")
+
+
+def render_partition_view(partition_files, partition_dir, flag_partitions, diagnostics=None):
+    """
+    Render the merged profile of a partitioned dataset and the partition comparison
+    
+    Args:
+        partition_files: uploaded part files
+        partition_dir: local directory holding the part files (used when nothing is uploaded)
+        flag_partitions: compare every partition with the whole dataset
+        diagnostics: optional diagnostics dict to record per-stage timings
+    """
+    st.header("📚 Partitioned Dataset")
+    
+    if partition_files:
+        sources = list(partition_files)
+        names = [part.name for part in sources]
+        partition_key = tuple((part.name, part.size) for part in sources)
+    elif partition_dir:
+        if not os.path.isdir(partition_dir):
+            st.error(f"❌ Directory not found: {partition_dir}")
+            return
+        sources = list_partition_files(partition_dir)
+        names = [os.path.relpath(path, partition_dir) for path in sources]
+        partition_key = tuple((path, os.path.getmtime(path), os.path.getsize(path)) for path in sources)
+    else:
+        st.info("👈 Upload the part files or enter the directory that holds them")
+        return
+    
+    if not sources:
+        st.warning("⚠️ No CSV, Excel or Parquet files found in this directory")
+        return
+    
+    # Sketches are kept for the session, keyed by the part names and sizes
+    partition_profile = st.session_state.get('partition_profile')
+    if partition_profile is not None and partition_profile['key'] == partition_key:
+        sketches, merged = partition_profile['sketches'], partition_profile['merged']
+    else:
+        with st.spinner(f"🔄 Summarizing {len(sources)} partitions..."):
+            try:
+                with measure_stage(diagnostics, "Partition sketches"):
+                    sketches, merged = profile_partitions(sources)
+            except Exception as e:
+                st.error(f"❌ Error loading partitions: {str(e)}")
+                return
+        st.session_state['partition_profile'] = {'key': partition_key, 'sketches': sketches, 'merged': merged}
+    
+    if diagnostics is not None:
+        diagnostics['context'].update({'partitions': len(sources), 'rows': merged['n_rows'],
+                                       'columns': len(merged['columns'])})
+    
+    if merged['n_rows'] == 0:
+        st.error("❌ All partitions are empty.")
+        return
+    
+    partitions_df = None
+    if flag_partitions:
+        with measure_stage(diagnostics, "Partition comparison"):
+            partitions_df, drift_tables = compare_partitions(names, sketches, merged)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Partitions", f"{len(sources):,}")
+    
+    with col2:
+        st.metric("Total Rows", f"{merged['n_rows']:,}")
+    
+    with col3:
+        st.metric("Total Columns", f"{len(merged['columns']):,}")
+    
+    with col4:
+        st.metric("Flagged Partitions", int((partitions_df['Drift'] == 'High').sum()) if partitions_df is not None else "-")
+    
+    st.subheader("Merged Column Summary")
+    with measure_stage(diagnostics, "Merged summary"):
+        summary_df = summarize_dataset_sketch(merged)
+    show_paginated_table(summary_df, diagnostics, "Merged summary table", style=highlight_missing_styles,
+                         key="partition_summary")
+    st.caption("Counts, nulls, means, standard deviations and ranges are exact; unique counts, medians "
+               "and most frequent values are estimated from the merged sketches.")
+    
+    corr_matrix = comoment_correlation(merged['comoments'])
+    if len(corr_matrix.columns) >= 2:
+        st.subheader("Merged Correlation Matrix")
+        show_chart(plot_correlation_heatmap(corr_matrix), diagnostics, "Merged correlation heatmap")
+    
+    if partitions_df is None:
+        return
+    
+    st.subheader("Partition Comparison")
+    show_paginated_table(partitions_df, diagnostics, "Partition table", style=highlight_drift_styles,
+                         key="partition_table")
+    st.caption(f"Every partition is compared with the whole dataset. Partitions are flagged for high drift "
+               f"(PSI ≥ 0.2 or KS > 0.1), a different schema, or a row count more than "
+               f"{PARTITION_ROW_DEVIATION:.0%} away from the median partition.")
     
-    fig.update_layout(
-        showlegend=False,
-        height=400,
-        xaxis_tickangle=-45
+    st.download_button(
+        label="📥 Download Partition Report",
+        data=partitions_df.to_csv(index=False).encode('utf-8'),
+        file_name="partition_report.csv",
+        mime="text/csv",
     )
     
-    return fig
-
+    # Flagged partitions are listed first
+    order = partitions_df.sort_values('Drift', key=lambda drift: drift.map({'High': 0, 'Moderate': 1, 'Stable': 2}),
+                                      kind='stable')['Partition'].tolist()
+    selected = st.selectbox("Inspect a partition", options=order, key="partition_inspect")
+    show_paginated_table(drift_tables[selected], diagnostics, "Partition drift table", style=highlight_drift_styles,
+                         key="partition_drift")
 
 
-
-def generate_comprehensive_report(df, file_type, summary_df, quality_report, stats_df, corr_matrix):
-    """Generate a comprehensive Excel report with all analysis results"""
-    output = BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Sheet 1: Overview
-        overview_data = {
-            'Metric': ['File Type', 'Total Rows', 'Total Columns', 'Memory Usage (MB)', 
-                      'Duplicate Rows', 'Columns with Missing Values'],
-            'Value': [
-                file_type,
-                len(df),
-                len(df.columns),
-                f"{df.memory_usage(deep=True).sum() / 1024**2:.2f}",
-                quality_report['duplicate_rows'],
-                len(quality_report['columns_with_missing'])
-            ]
-        }
-        pd.DataFrame(overview_data).to_excel(writer, sheet_name='Overview', index=False)
-        
-        # Sheet 2: Feature Summary
-        summary_df.to_excel(writer, sheet_name='Feature Summary', index=False)
-        
-        # Sheet 3: Data Quality Issues
-        quality_data = []
-        for col, count, pct in quality_report['columns_with_missing']:
-            quality_data.append({'Issue Type': 'Missing Values', 'Column': col, 'Details': f"{count} missing ({pct:.2f}%)"})
-        for col in quality_report['constant_features']:
-            quality_data.append({'Issue Type': 'Constant Feature', 'Column': col, 'Details': 'Only 1 unique value'})
-        for col in quality_report['columns_all_zeros']:
-            quality_data.append({'Issue Type': 'All Zeros', 'Column': col, 'Details': 'All values are zero'})
-        for col in quality_report['type_mismatch']:
-            quality_data.append({'Issue Type': 'Type Mismatch', 'Column': col, 'Details': 'Numeric stored as categorical'})
-        
-        if quality_data:
-            pd.DataFrame(quality_data).to_excel(writer, sheet_name='Quality Issues', index=False)
-        
-        # Sheet 4: Descriptive Statistics
-        if stats_df is not None:
-            stats_df.to_excel(writer, sheet_name='Descriptive Stats')
-        
-        # Sheet 5: Correlation Matrix
-        if corr_matrix is not None:
-            corr_matrix.to_excel(writer, sheet_name='Correlation Matrix')
-        
-        # Sheet 6: Data Preview
-        df.head(100).to_excel(writer, sheet_name='Data Preview', index=False)
+def render_dashboard(diagnostics=None):
+    """
+    Render the full dashboard
     
-    output.seek(0)
-    return output
-
-
-def main():
-    """Main application function"""
+    Args:
+        diagnostics: optional diagnostics dict to record per-stage timings
+    """
     
     # Title and description with better styling
     st.markdown("""
@@ -609,9 +5754,10 @@ def main():
         st.markdown("<h2 style='color: white; text-align: center;'>📁 Upload Dataset</h2>", unsafe_allow_html=True)
         
         uploaded_file = st.file_uploader(
-            "Choose a CSV or Excel file",
-            type=['csv', 'xlsx', 'xls'],
-            help="Upload your dataset for analysis"
+            "Choose a CSV, Excel or Parquet file",
+            type=[*DATA_FILE_TYPES, *COMPRESSION_CODECS, PROFILE_ARTIFACT_EXTENSION],
+            help="Upload your dataset for analysis (CSV may be gzip/bz2/xz/zstd-compressed or zipped), "
+                 "or a saved profile (.dpz) to reopen it instantly"
         )
         
         st.markdown("---")
@@ -634,9 +5780,86 @@ def main():
             
             st.markdown("---")
         
+        # Compare mode: profile drift against a baseline file or saved profile
+        compare_mode = st.checkbox(
+            "🔀 Compare with a baseline",
+            value=False,
+            help="Report per-column drift between the uploaded dataset and a baseline"
+        )
+        baseline_file = None
+        if compare_mode:
+            baseline_file = st.file_uploader(
+                "Choose the baseline file",
+                type=[*DATA_FILE_TYPES, *COMPRESSION_CODECS, PROFILE_ARTIFACT_EXTENSION],
+                help="An earlier extract or a saved profile (.dpz)",
+                key="baseline_file"
+            )
+        
+        # Partitioned datasets: many part files profiled as one
+        partition_mode = st.checkbox(
+            "📚 Partitioned dataset (many files)",
+            value=False,
+            help="Profile many part files as one dataset without concatenating them"
+        )
+        partition_files = []
+        partition_dir = ""
+        flag_partitions = False
+        if partition_mode:
+            partition_files = st.file_uploader(
+                "Choose the part files",
+                type=[*PARTITION_FILE_TYPES, *COMPRESSION_CODECS],
+                accept_multiple_files=True,
+                key="partition_files"
+            ) or []
+            partition_dir = st.text_input(
+                "...or a local directory",
+                value="",
+                placeholder="/data/exports/orders",
+                help="Every CSV, Excel and Parquet file under this directory is profiled",
+                key="partition_dir"
+            ).strip()
+            flag_partitions = st.checkbox(
+                "Flag deviating partitions",
+                value=True,
+                help="Compare every partition with the whole dataset"
+            )
+        
+        backends = available_backends()
+        backend = st.selectbox(
+            "⚙️ Compute engine",
+            options=backends,
+            index=backends.index(PROFILE_BACKEND) if PROFILE_BACKEND in backends else 0,
+            help="Engine for the summary, quality, statistics and correlation tables. "
+                 "Polars runs them as one multi-threaded query; results are identical.",
+            key="profile_backend"
+        )
+        
+        duckdb_mode = False
+        sql_filter = ""
+        if duckdb is not None:
+            duckdb_mode = st.checkbox(
+                "🦆 Out-of-core mode (DuckDB)",
+                value=False,
+                help="Profile CSV and Parquet files with SQL aggregates streamed from disk, "
+                     "without loading the rows into memory",
+                key="duckdb_mode"
+            )
+            if duckdb_mode:
+                sql_filter = st.text_area(
+                    "SQL filter (optional)",
+                    value="",
+                    placeholder="amount > 0 AND region = 'EU'",
+                    help="A WHERE condition; only matching rows are profiled",
+                    key="duckdb_filter"
+                ).strip()
+        
 
     
     # Main content
+    if partition_mode:
+        render_partition_view(partition_files, partition_dir, flag_partitions, diagnostics)
+        return
+    
     if uploaded_file is None:
         # Welcome screen with feature cards
         st.markdown("<br>", unsafe_allow_html=True)
@@ -678,16 +5901,192 @@ def main():
         
         return
     
-    # Load data
-    with st.spinner("🔄 Loading and analyzing your dataset..."):
-        df, file_type, error = load_data(uploaded_file)
-    
-    if error:
-        st.error(f"❌ {error}")
+    # ===== COMPARE MODE: DATASET DRIFT =====
+    if compare_mode:
+        st.header("🔀 Dataset Drift")
+        
+        if baseline_file is None:
+            st.info("👈 Upload a baseline file or saved profile to compare against")
+            return
+        
+        with st.spinner("🔄 Summarizing both datasets..."):
+            with measure_stage(diagnostics, "Baseline sketch"):
+                baseline_sketch, error = load_dataset_sketch(baseline_file)
+            if not error:
+                with measure_stage(diagnostics, "Current sketch"):
+                    current_sketch, error = load_dataset_sketch(uploaded_file)
+        
+        if error:
+            st.error(f"❌ {error}")
+            return
+        
+        with measure_stage(diagnostics, "Drift comparison"):
+            drift_df, corr_changes_df = compare_dataset_sketches(baseline_sketch, current_sketch)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Baseline Rows", f"{baseline_sketch['n_rows']:,}")
+        
+        with col2:
+            st.metric("Current Rows", f"{current_sketch['n_rows']:,}", delta=f"{current_sketch['n_rows'] - baseline_sketch['n_rows']:,}")
+        
+        with col3:
+            schema_changes = int((drift_df['Status'] != 'Both').sum())
+            st.metric("Added/Removed/Retyped Columns", schema_changes)
+        
+        with col4:
+            st.metric("Columns with High Drift", int((drift_df['Drift'] == 'High').sum()))
+        
+        st.subheader("Per-Column Drift")
+        
+        show_paginated_table(drift_df, diagnostics, "Drift table", style=highlight_drift_styles, key="drift_table")
+        st.caption("PSI < 0.1 stable, 0.1-0.2 moderate shift, > 0.2 major shift. Unique counts and categories are estimated from sketches.")
+        
+        st.download_button(
+            label="📥 Download Drift Report",
+            data=drift_df.to_csv(index=False).encode('utf-8'),
+            file_name="drift_report.csv",
+            mime="text/csv",
+        )
+        
+        st.subheader("Correlation Changes")
+        if not corr_changes_df.empty:
+            st.dataframe(corr_changes_df, use_container_width=True)
+            for _, row in corr_changes_df.head(5).iterrows():
+                st.markdown(f"- Correlation between **{row['Feature 1']}** and **{row['Feature 2']}** moved from {row['r (Baseline)']:.2f} to {row['r (Current)']:.2f}")
+        else:
+            st.success(f"✅ No correlation changed by more than {CORRELATION_DRIFT_THRESHOLD}")
+        
         return
     
+    # Load a saved profile, a cached profile, or profile the raw data
+    df = None
+    duckdb_source = None
+    file_extension, codec = split_file_name(uploaded_file.name)
+    # DuckDB reads gzip and zstd CSV natively; other codecs are decompressed by pandas
+    duckdb_readable = file_extension in DUCKDB_FILE_TYPES and (
+        codec is None or (file_extension == 'csv' and codec in DUCKDB_CSV_CODECS))
+    
+    if file_extension == PROFILE_ARTIFACT_EXTENSION and codec is None:
+        try:
+            with measure_stage(diagnostics, "Load profile artifact"):
+                profile = load_profile_artifact(uploaded_file)
+        except Exception as e:
+            st.error(f"❌ Error loading profile: {str(e)}")
+            return
+        st.info("📦 Showing a saved profile - raw data is not available for cleaning or comparisons")
+    elif duckdb_mode and duckdb_readable:
+        with measure_stage(diagnostics, "Hash"):
+            file_hash = get_uploaded_file_hash(uploaded_file)
+        profile, duckdb_source = run_duckdb_profile(uploaded_file, file_hash, sql_filter, diagnostics)
+        if profile is None:
+            return
+    else:
+        if duckdb_mode:
+            st.warning("⚠️ Out-of-core mode supports CSV (plain, gzip or zstd) and Parquet files - "
+                       "loading this file with pandas")
+        
+        with measure_stage(diagnostics, "Hash & cache lookup"):
+            file_hash = get_uploaded_file_hash(uploaded_file)
+            
+            working = st.session_state.get('working_dataset')
+            if working is not None and working['file_hash'] != file_hash:
+                working = st.session_state['working_dataset'] = None
+            profile = None if working is not None else load_cached_profile(file_hash)
+        
+        if working is not None:
+            # Rows loaded earlier in this session, including any applied fixes
+            df, profile = working['df'], working['profile']
+            update_memory_ledger(profile['memory_mb'])
+            render_load_plan(working['load_plan'], st.session_state['memory_estimate'], diagnostics)
+        else:
+            load_raw = st.session_state.get('raw_loaded_hash') == file_hash
+            if profile is not None and not load_raw:
+                st.info("⚡ This file was profiled before - showing the saved profile")
+                with st.sidebar:
+                    load_raw = st.checkbox(
+                        "Load raw data",
+                        value=False,
+                        help="Load the rows to enable cleaning, duplicate handling and category comparisons"
+                    )
+            
+            if profile is None or load_raw:
+                # Admission control: decide how to load before reading the rows
+                with measure_stage(diagnostics, "Memory estimate"):
+                    estimate = st.session_state.get('memory_estimate')
+                    if estimate is None or estimate['file_hash'] != file_hash:
+                        try:
+                            estimate = {'file_hash': file_hash, **estimate_memory_usage(uploaded_file)}
+                        except Exception as e:
+                            st.error(f"❌ Error loading file: {str(e)}")
+                            return
+                        st.session_state['memory_estimate'] = estimate
+                    budget_mb = memory_budget_mb(update_memory_ledger(0.0))
+                    load_plan = choose_load_strategy(estimate, budget_mb, duckdb is not None and duckdb_readable)
+                render_load_plan(load_plan, estimate, diagnostics)
+                
+                if load_plan['strategy'] == 'streaming' and profile is not None:
+                    st.warning("⚠️ This file is too large to load the raw data - showing the saved profile")
+                elif load_plan['strategy'] == 'streaming':
+                    profile, duckdb_source = run_duckdb_profile(uploaded_file, file_hash, "", diagnostics)
+                    if profile is None:
+                        return
+                else:
+                    with st.spinner("🔄 Loading and analyzing your dataset..."):
+                        with measure_stage(diagnostics, "Parse"):
+                            if load_plan['strategy'] == 'sampled':
+                                df, file_type, error = load_sampled_data(uploaded_file, load_plan['sample_fraction'])
+                            else:
+                                categories = estimate['categories'] if load_plan['strategy'] == 'optimized' else None
+                                df, file_type, error = load_data(uploaded_file, categories=categories)
+                        
+                        sampled = load_plan['strategy'] == 'sampled'
+                        if not error and (profile is None or sampled):
+                            profile = build_profile(df, file_type, file_name=uploaded_file.name, file_hash=file_hash,
+                                                    diagnostics=diagnostics, backend=backend)
+                            # A sample's profile must not stand in for the whole file
+                            if not sampled:
+                                with measure_stage(diagnostics, "Cache write"):
+                                    save_cached_profile(profile)
+                    
+                    if error:
+                        st.error(f"❌ {error}")
+                        return
+                    
+                    st.session_state['raw_loaded_hash'] = file_hash
+                    st.session_state['working_dataset'] = {
+                        'file_hash': file_hash,
+                        'df': df,
+                        'profile': profile,
+                        'load_plan': load_plan,
+                        'version': 0,
+                        'applied_steps': [],
+                        'queued_steps': [],
+                        'group_index': {}
+                    }
+                    update_memory_ledger(profile['memory_mb'])
+    
+    if duckdb_source is None:
+        # Lets a file staged for an earlier dataset of this session be deleted
+        track_duckdb_source(None)
+    
+    file_type = profile['file_type']
+    if diagnostics is not None:
+        diagnostics['context'].update({
+            'file_name': uploaded_file.name,
+            'file_bytes': uploaded_file.size,
+            'rows': profile['n_rows'],
+            'columns': profile['n_cols'],
+            'from_cache': df is None and duckdb_source is None,
+            'backend': 'duckdb' if duckdb_source is not None else backend,
+            'load_strategy': (st.session_state['working_dataset']['load_plan']['strategy'] if df is not None
+                              else 'streaming' if duckdb_source is not None and not duckdb_mode else None)
+        })
+    
     # Store in session state
-    st.session_state['df'] = df
+    if df is not None:
+        st.session_state['df'] = df
     st.session_state['file_type'] = file_type
     
     # Quick Stats Bar at the top
@@ -703,25 +6102,82 @@ def main():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Rows", f"{len(df):,}")
+        st.metric("Total Rows", f"{profile['n_rows']:,}")
     
     with col2:
-        st.metric("Total Columns", f"{len(df.columns):,}")
+        st.metric("Total Columns", f"{profile['n_cols']:,}")
     
     with col3:
         st.metric("File Type", file_type)
     
     with col4:
-        memory_usage = df.memory_usage(deep=True).sum() / 1024**2
-        st.metric("Memory Usage", f"{memory_usage:.2f} MB")
+        st.metric("Memory Usage", f"{profile['memory_mb']:.2f} MB")
     
     st.subheader("Dataset Preview (First 5 Rows)")
-    st.dataframe(df.head(), use_container_width=True)
+    show_paginated_table(profile['preview'].head(), diagnostics, "Preview table", key="preview_table")
+    
+    # Full dataset browser: sort/filter indexes are built once, pages are sliced
+    with st.expander("🔎 Browse Full Dataset", expanded=False):
+        if df is None:
+            st.info("💡 Load the raw data to browse all rows")
+        else:
+            browser_key = (file_hash, st.session_state['working_dataset']['version'])
+            if st.session_state.get('browser_cache', {}).get('dataset') != browser_key:
+                st.session_state['browser_cache'] = {'dataset': browser_key}
+            browser_cache = st.session_state['browser_cache']
+            
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                sort_column = st.selectbox("Sort by", options=["None"] + list(df.columns), key="browser_sort")
+            with col2:
+                sort_order = st.radio("Order", options=["Ascending", "Descending"], horizontal=True, key="browser_order")
+            with col3:
+                page_size = st.selectbox("Rows per page", options=[25, 50, 100, 500], index=1, key="browser_page_size")
+            
+            filter_columns = st.multiselect("Filter columns", options=list(df.columns), key="browser_filter_columns")
+            filters = []
+            for col in filter_columns:
+                if col in profile['numeric_aggregates']:
+                    aggregates = profile['numeric_aggregates'][col]
+                    low_col, high_col = st.columns(2)
+                    with low_col:
+                        low = st.number_input(f"{col} ≥", value=float(aggregates['min']), key=f"browser_low_{col}")
+                    with high_col:
+                        high = st.number_input(f"{col} ≤", value=float(aggregates['max']), key=f"browser_high_{col}")
+                    filters.append((col, 'between', (low, high)))
+                elif col in profile['temporal_aggregates']:
+                    aggregates = profile['temporal_aggregates'][col]
+                    date_range = st.date_input(
+                        f"{col} between",
+                        value=(pd.Timestamp(aggregates['min']).date(), pd.Timestamp(aggregates['max']).date()),
+                        key=f"browser_dates_{col}"
+                    )
+                    if len(date_range) == 2:
+                        # Include the whole end day
+                        low, high = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]) + pd.Timedelta(days=1, microseconds=-1)
+                        filters.append((col, 'between', (low, high)))
+                else:
+                    text = st.text_input(f"{col} contains", key=f"browser_text_{col}")
+                    filters.append((col, 'contains', text) if text else (col, 'not_null', None))
+            
+            with measure_stage(diagnostics, "Data browser view"):
+                view = get_browser_view(
+                    df, browser_cache,
+                    sort_column=None if sort_column == "None" else sort_column,
+                    ascending=sort_order == "Ascending",
+                    filters=filters
+                )
+            
+            n_pages = max(1, -(-len(view) // page_size))
+            page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1, key="browser_page")
+            start = (page - 1) * page_size
+            show_paginated_table(df.iloc[view[start:start + page_size]], diagnostics, "Data browser page", key="browser_table")
+            st.caption(f"Rows {min(start + 1, len(view)):,}-{min(start + page_size, len(view)):,} of {len(view):,} matching ({len(df):,} total)")
     
     # ===== SECTION 2: FEATURE SUMMARY =====
     st.header("2️⃣ Feature Summary")
     
-    summary_df = create_feature_summary(df)
+    summary_df = profile['summary_df']
     
     # Add download button
     col1, col2 = st.columns([3, 1])
@@ -737,16 +6193,8 @@ def main():
         )
     
     # Highlight rows with issues
-    def highlight_issues(row):
-        if row['Null %'] > 30:
-            return ['background-color: #f8d7da'] * len(row)
-        elif row['Null %'] > 0:
-            return ['background-color: #fff3cd'] * len(row)
-        else:
-            return [''] * len(row)
-    
-    styled_summary = summary_df.style.apply(highlight_issues, axis=1)
-    st.dataframe(styled_summary, use_container_width=True)
+    show_paginated_table(summary_df, diagnostics, "Feature summary table (styled)",
+                         style=highlight_missing_styles, key="summary_table")
     
     # Summary statistics in colored cards
     st.markdown("<br>", unsafe_allow_html=True)
@@ -791,7 +6239,7 @@ def main():
     # ===== SECTION 3: DATA QUALITY CHECKS =====
     st.header("3️⃣ Data Quality Checks")
     
-    quality_report = perform_data_quality_checks(df)
+    quality_report = profile['quality_report']
     
     # Quality summary cards
     col1, col2, col3, col4 = st.columns(4)
@@ -853,6 +6301,23 @@ def main():
                 🚨 <strong>High Missing Data (>30%):</strong> {', '.join([col for col, _ in quality_report['columns_high_missing']])}
                 </div>
                 """, unsafe_allow_html=True)
+            
+            # Which columns go missing together (from packed null bitmaps)
+            missingness = profile['missingness']
+            show_chart(plot_nullity_heatmap(missingness), diagnostics, "Nullity heatmap")
+            if len(missingness['columns']) > 1:
+                show_chart(plot_null_cooccurrence(missingness), diagnostics, "Null co-occurrence")
+            
+            st.markdown("**Most Common Missingness Patterns**")
+            patterns_df = pd.DataFrame([
+                {
+                    'Missing Columns': ', '.join(str(col) for col in missing) or '(none)',
+                    'Rows': count,
+                    '% of Rows': round(count / missingness['n_rows'] * 100, 2)
+                }
+                for missing, count in missingness['patterns']
+            ])
+            st.dataframe(patterns_df, use_container_width=True)
         else:
             st.success("✅ No missing values detected")
     
@@ -891,138 +6356,277 @@ def main():
     with st.expander("🛠️ Data Actions", expanded=False):
         st.markdown("**Quick data cleaning operations**")
         
-        col1, col2 = st.columns(2)
+        if df is None:
+            st.info("💡 Load the raw data to use cleaning operations")
+        else:
+            working = st.session_state['working_dataset']
+            queued_steps = working['queued_steps']
+            
+            for msg in st.session_state.pop('cleaning_messages', []):
+                st.success(f"✅ Applied: {msg}")
+            
+            col1, col2 = st.columns(2)
         
-        with col1:
-            # Remove duplicates button
-            if quality_report['duplicate_rows'] > 0:
-                if st.button(f"🗑️ Remove {quality_report['duplicate_rows']} Duplicate Rows", key="remove_dups"):
-                    df_cleaned = df.drop_duplicates()
-                    st.session_state['df'] = df_cleaned
-                    st.success(f"✅ Removed {quality_report['duplicate_rows']} duplicate rows!")
-                    st.info("💡 Refresh the page (F5) to see updated analysis")
-            else:
-                st.info("✅ No duplicate rows to remove")
+            with col1:
+                # Queue duplicate removal
+                if quality_report['duplicate_rows'] > 0:
+                    if st.button(f"🗑️ Remove {quality_report['duplicate_rows']} Duplicate Rows", key="remove_dups"):
+                        queued_steps.append({'action': 'drop_duplicates', 'column': None, 'value': None})
+                else:
+                    st.info("✅ No duplicate rows to remove")
         
-        with col2:
-            # Download cleaned data
-            csv = df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Download Current Dataset",
-                data=csv,
-                file_name=f"cleaned_data_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                help="Download the current state of the dataset"
-            )
+            with col2:
+                # Download cleaned data
+                csv = df.to_csv(index=False).encode('utf-8')
+                st.download_button(
+                    label="📥 Download Current Dataset",
+                    data=csv,
+                    file_name=f"cleaned_data_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv",
+                    help="Download the current state of the dataset"
+                )
 
-        # Missing Value Handling Tool
-        st.markdown("---")
-        st.subheader("🧩 Handle Missing Values")
+            # Missing Value Handling Tool
+            st.markdown("---")
+            st.subheader("🧩 Handle Missing Values")
         
-        # Identify columns with missing values
-        missing_cols = [col for col in df.columns if df[col].isnull().sum() > 0]
+            # Columns with missing values come from the profile, no rescan needed
+            missing_cols = [col for col, _, _ in quality_report['columns_with_missing']]
         
-        if missing_cols:
-            check_col1, check_col2, check_col3 = st.columns([1, 1, 1])
+            if missing_cols:
+                check_col1, check_col2, check_col3 = st.columns([1, 1, 1])
             
-            with check_col1:
-                target_col = st.selectbox(
-                    "Select Column with Missing Values", 
-                    options=missing_cols,
-                    key="missing_target"
-                )
+                with check_col1:
+                    target_col = st.selectbox(
+                        "Select Column with Missing Values", 
+                        options=missing_cols,
+                        key="missing_target"
+                    )
                 
-            with check_col2:
-                # determine options based on column type
-                if pd.api.types.is_numeric_dtype(df[target_col]):
-                    method_options = [
-                        "Fill with 0 (e.g., No Sales)",
-                        "Fill with Mean (Average)", 
-                        "Fill with Median (Middle Value)",
-                        "Dropping Rows",
-                        "Drop Column"
-                    ]
-                else:
-                    method_options = [
-                        "Fill with Mode (Most Frequent)", 
-                        "Fill with 'Unknown'", 
-                        "Dropping Rows",
-                        "Drop Column"
-                    ]
+                with check_col2:
+                    # determine options based on column type
+                    if pd.api.types.is_numeric_dtype(df[target_col]):
+                        method_options = [
+                            "Fill with 0 (e.g., No Sales)",
+                            "Fill with Mean (Average)", 
+                            "Fill with Median (Middle Value)",
+                            "Dropping Rows",
+                            "Drop Column"
+                        ]
+                    elif pd.api.types.is_datetime64_any_dtype(df[target_col]):
+                        method_options = [
+                            "Fill with Mode (Most Frequent)",
+                            "Dropping Rows",
+                            "Drop Column"
+                        ]
+                    else:
+                        method_options = [
+                            "Fill with Mode (Most Frequent)", 
+                            "Fill with 'Unknown'", 
+                            "Dropping Rows",
+                            "Drop Column"
+                        ]
                 
-                fill_method = st.selectbox(
-                    "Choose Strategy", 
-                    options=method_options,
-                    key="fill_strategy"
-                )
+                    if not df[target_col].notna().any():
+                        # Nothing to take a mean, median or mode of
+                        method_options = [m for m in method_options
+                                          if not any(label in m for label in ("Mean", "Median", "Mode"))]
                 
-            with check_col3:
-                st.write("") # Spacer text for alignment
-                st.write("") 
-                if st.button("Apply Fix", key="apply_fill"):
-                    if "Dropping Rows" in fill_method:
-                        df_cleaned = df.dropna(subset=[target_col])
-                        msg = f"Removed rows with missing values in '{target_col}'"
-                    elif "Drop Column" in fill_method:
-                        df_cleaned = df.drop(columns=[target_col])
-                        msg = f"Dropped column '{target_col}'"
-                    elif "0" in fill_method:
-                        df_cleaned = df.copy()
-                        df_cleaned[target_col] = df_cleaned[target_col].fillna(0)
-                        msg = f"Filled missing values in '{target_col}' with 0"
-                    elif "Mean" in fill_method:
-                        val = df[target_col].mean()
-                        df_cleaned = df.copy()
-                        df_cleaned[target_col] = df_cleaned[target_col].fillna(val)
-                        msg = f"Filled missing values in '{target_col}' with Mean ({val:.2f})"
-                    elif "Median" in fill_method:
-                        val = df[target_col].median()
-                        df_cleaned = df.copy()
-                        df_cleaned[target_col] = df_cleaned[target_col].fillna(val)
-                        msg = f"Filled missing values in '{target_col}' with Median ({val:.2f})"
-                    elif "Mode" in fill_method:
-                        val = df[target_col].mode()[0]
-                        df_cleaned = df.copy()
-                        df_cleaned[target_col] = df_cleaned[target_col].fillna(val)
-                        msg = f"Filled missing values in '{target_col}' with Mode ('{val}')"
-                    elif "Unknown" in fill_method:
-                        df_cleaned = df.copy()
-                        df_cleaned[target_col] = df_cleaned[target_col].fillna("Unknown")
-                        msg = f"Filled missing values in '{target_col}' with 'Unknown'"
-                    
-                    st.session_state['df'] = df_cleaned
-                    st.success(f"✅ Success! {msg}")
-                    st.info("🔄 Refresh (F5) to update all analysis charts")
-        else:
-            st.success("✨ Great! No missing values detected in the dataset.")
+                    fill_method = st.selectbox(
+                        "Choose Strategy", 
+                        options=method_options,
+                        key="fill_strategy"
+                    )
+                
+                with check_col3:
+                    st.write("") # Spacer text for alignment
+                    st.write("") 
+                    if st.button("➕ Add to Queue", key="apply_fill"):
+                        queued_steps.append(make_cleaning_step(df, target_col, fill_method))
+            else:
+                st.success("✨ Great! No missing values detected in the dataset.")
+            
+            # Queued fixes are applied together in one pass
+            st.markdown("---")
+            st.subheader("📋 Queued Fixes")
+            
+            if queued_steps:
+                for i, step in enumerate(queued_steps, 1):
+                    st.markdown(f"{i}. {describe_cleaning_step(step)}")
+                
+                queue_col1, queue_col2 = st.columns(2)
+                with queue_col1:
+                    if st.button("✅ Apply Queued Fixes", key="apply_queue"):
+                        with st.spinner("🔄 Applying fixes and updating analysis..."):
+                            with measure_stage(diagnostics, "Apply cleaning pipeline"):
+                                df_cleaned, messages = apply_cleaning_pipeline(df, queued_steps)
+                            # Cleaned data is not the uploaded file, so it is not cached by hash
+                            cleaned_profile = build_profile(df_cleaned, file_type, file_name=uploaded_file.name,
+                                                            diagnostics=diagnostics, backend=backend)
+                        working.update({
+                            'df': df_cleaned,
+                            'profile': cleaned_profile,
+                            'version': working['version'] + 1,
+                            'applied_steps': working['applied_steps'] + queued_steps,
+                            'queued_steps': [],
+                            'group_index': {}
+                        })
+                        st.session_state['df'] = df_cleaned
+                        st.session_state['cleaning_messages'] = messages
+                        st.rerun()
+                with queue_col2:
+                    if st.button("🧹 Clear Queue", key="clear_queue"):
+                        working['queued_steps'] = []
+                        st.rerun()
+            else:
+                st.info("💡 Add fixes above, then apply them together")
+            
+            # Applied fixes can be saved and replayed on new files
+            if working['applied_steps']:
+                st.markdown(f"**Applied fixes:** {len(working['applied_steps'])}")
+                pipeline_col1, pipeline_col2 = st.columns(2)
+                with pipeline_col1:
+                    st.download_button(
+                        label="💾 Download Cleaning Pipeline",
+                        data=export_cleaning_pipeline(working['applied_steps'], uploaded_file.name),
+                        file_name="cleaning_pipeline.json",
+                        mime="application/json",
+                        help="Replay these fixes on new files here or with replay_pipeline.py"
+                    )
+                with pipeline_col2:
+                    if st.button("↩️ Reset to Original Data", key="reset_cleaning"):
+                        st.session_state['working_dataset'] = None
+                        st.rerun()
+            
+            pipeline_file = st.file_uploader("Replay a saved cleaning pipeline", type=['json'], key="pipeline_file")
+            if pipeline_file is not None and st.button("📥 Queue Pipeline Steps", key="queue_pipeline"):
+                try:
+                    queued_steps.extend(load_cleaning_pipeline(pipeline_file))
+                    st.rerun()
+                except (ValueError, KeyError) as e:
+                    st.error(f"❌ Error loading pipeline: {str(e)}")
     
     # ===== SECTION 4: DESCRIPTIVE STATISTICS =====
     st.header("4️⃣ Descriptive Statistics")
     
-    stats_df = get_descriptive_statistics(df)
+    stats_df = profile['stats_df']
     
     if stats_df is not None:
-        st.dataframe(stats_df, use_container_width=True)
+        show_paginated_table(stats_df, diagnostics, "Descriptive statistics table", key="stats_table")
     else:
         st.warning("⚠️ No numerical columns found in the dataset")
     
     # ===== SECTION 5: CORRELATION ANALYSIS =====
     st.header("5️⃣ Correlation Analysis")
     
-    corr_matrix, strong_corr, insights = compute_correlation_analysis(df)
+    corr_matrix = profile['corr_matrix']
     
     if corr_matrix is not None:
         # Display correlation table
         st.subheader("Correlation Matrix")
-        st.dataframe(corr_matrix.style.background_gradient(cmap='RdBu', vmin=-1, vmax=1), use_container_width=True)
+        show_paginated_table(corr_matrix, diagnostics, "Correlation matrix table (styled)",
+                             style=correlation_gradient_styles, key="corr_table")
         
         # Display heatmap
         st.subheader("Correlation Heatmap")
         fig = plot_correlation_heatmap(corr_matrix)
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, diagnostics, "Correlation heatmap")
+        
+        # Density of one numerical pair, binned on the server so any row count draws the same grid
+        st.subheader("🔍 Numerical Pair Explorer")
+        if df is None and duckdb_source is None:
+            st.warning("⚠️ Load the raw data to explore pairs of numerical columns")
+        else:
+            strong_correlations = profile['strong_correlations'] or []
+            if strong_correlations:
+                st.selectbox(
+                    "Jump to a strong correlation",
+                    options=[None] + [(col1, col2) for col1, col2, _ in strong_correlations],
+                    format_func=lambda pair: "Choose a strong pair..." if pair is None else f"{pair[1]} vs {pair[0]}",
+                    key="density_pair",
+                    on_change=_select_density_pair
+                )
+            
+            pair_cols = corr_matrix.columns.tolist()
+            if st.session_state.get('density_x') not in pair_cols:
+                st.session_state['density_x'] = pair_cols[0]
+            if st.session_state.get('density_y') not in pair_cols:
+                st.session_state['density_y'] = pair_cols[1]
+            col1, col2 = st.columns(2)
+            with col1:
+                x_col = st.selectbox("X-axis", options=pair_cols, key="density_x")
+            with col2:
+                y_col = st.selectbox("Y-axis", options=pair_cols, key="density_y")
+            
+            # Zooming re-bins the window at full grid resolution
+            ranges = []
+            for axis, col, column in (("X", x_col, col1), ("Y", y_col, col2)):
+                aggregates = profile['numeric_aggregates'].get(col)
+                low, high = (aggregates['min'], aggregates['max']) if aggregates else (np.nan, np.nan)
+                if not (np.isfinite(low) and np.isfinite(high) and low < high):
+                    ranges.append(None)
+                    continue
+                with column:
+                    ranges.append(st.slider(
+                        f"{axis} range", min_value=float(low), max_value=float(high),
+                        value=(float(low), float(high)), step=(float(high) - float(low)) / 1000,
+                        key=f"density_range_{axis}_{col}"
+                    ))
+            
+            with measure_stage(diagnostics, "Density grid"):
+                if df is None:
+                    grid = duckdb_density_grid(duckdb_source, sql_filter or None, x_col, y_col,
+                                               x_range=ranges[0], y_range=ranges[1])
+                else:
+                    grid = compute_density_grid(
+                        df[x_col].to_numpy(dtype='float64', na_value=np.nan),
+                        df[y_col].to_numpy(dtype='float64', na_value=np.nan),
+                        x_range=ranges[0], y_range=ranges[1]
+                    )
+            
+            if grid is None:
+                st.warning(f"⚠️ No rows have values in both {x_col} and {y_col}")
+            else:
+                show_chart(plot_density_grid(grid, x_col, y_col), diagnostics, "Density heatmap")
+                points_note = (
+                    "individual rows are drawn on top" if grid['points'] is not None
+                    else f"zoom in to at most {DENSITY_MAX_POINTS:,} rows to see individual rows"
+                )
+                st.caption(f"{grid['n_points']:,} rows in view, binned into a "
+                           f"{DENSITY_GRID_BINS}×{DENSITY_GRID_BINS} grid; {points_note}")
     else:
         st.warning("⚠️ Not enough numerical columns for correlation analysis (minimum 2 required)")
     
+    categorical_association = profile['categorical_association']
+    if categorical_association['cramers_v'] is not None:
+        st.subheader("Categorical Associations")
+        measure = st.radio(
+            "Association measure",
+            options=["Cramér's V", "Theil's U"],
+            horizontal=True,
+            help="Cramér's V is symmetric. Theil's U (row given column) is the share of the row "
+                 "feature's uncertainty explained by knowing the column feature.",
+            key="association_measure"
+        )
+        if measure == "Cramér's V":
+            fig = plot_association_heatmap(categorical_association['cramers_v'], "Cramér's V Heatmap", "Cramér's V")
+        else:
+            fig = plot_association_heatmap(categorical_association['theils_u'], "Theil's U Heatmap", "U(row | column)")
+        show_chart(fig, diagnostics, "Categorical association heatmap")
+        
+        for insight in categorical_association['insights']:
+            st.markdown(f"- {insight}")
+        notes = []
+        if categorical_association['capped']:
+            notes.append(
+                f"Only the top {CATEGORICAL_ASSOCIATION_MAX_CATEGORIES - 1} categories are kept (the rest are pooled) for: "
+                f"{', '.join(map(str, categorical_association['capped']))}"
+            )
+        if categorical_association['sampled_rows']:
+            notes.append(f"Measured on a random sample of {categorical_association['sampled_rows']:,} rows")
+        if notes:
+            st.caption(" · ".join(notes))
+    
     # Generate and offer download of comprehensive report
     # Add this in sidebar after all analysis is done
     with st.sidebar:
@@ -1030,14 +6634,15 @@ def main():
         st.markdown("<h3 style='color: white;'>📊 Download Report</h3>", unsafe_allow_html=True)
         
         # Generate the report
-        report_excel = generate_comprehensive_report(
-            df, 
-            file_type, 
-            summary_df, 
-            quality_report, 
-            stats_df, 
-            corr_matrix
-        )
+        with measure_stage(diagnostics, "Report writing", kind='download') as record:
+            report_excel = generate_comprehensive_report(profile)
+            if record is not None:
+                record['payload_bytes'] = report_excel.getbuffer().nbytes
+        
+        with measure_stage(diagnostics, "Profile artifact", kind='download') as record:
+            profile_artifact = save_profile_artifact(profile)
+            if record is not None:
+                record['payload_bytes'] = profile_artifact.getbuffer().nbytes
         
         st.download_button(
             label="📥 Download Full Analysis Report",
@@ -1046,47 +6651,156 @@ def main():
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             help="Download comprehensive Excel report with all analysis results"
         )
+        
+        st.download_button(
+            label="📦 Download Profile",
+            data=profile_artifact,
+            file_name=f"data_profile_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.{PROFILE_ARTIFACT_EXTENSION}",
+            mime="application/zip",
+            help="Save this profile to reopen the dashboard later without the raw data"
+        )
 
     
-    # ===== SECTION 6: DISTRIBUTION & OUTLIER ANALYSIS =====
-    st.header("6️⃣ Distribution & Outlier Analysis")
+    # ===== SECTION 6: TIME SERIES ANALYSIS =====
+    st.header("6️⃣ Time Series Analysis")
+    
+    temporal_aggregates = profile['temporal_aggregates']
+    if temporal_aggregates:
+        time_column = st.selectbox("Select a date/time column", options=list(temporal_aggregates), key="ts_column")
+        aggregates = temporal_aggregates[time_column]
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Start", aggregates['min'] or "-")
+        with col2:
+            st.metric("End", aggregates['max'] or "-")
+        with col3:
+            st.metric("Span", str(pd.Timedelta(seconds=aggregates['span_seconds'])))
+        with col4:
+            st.metric("Frequency", aggregates['frequency'] or "Irregular")
+        
+        if aggregates['gap_count'] > 0:
+            st.markdown(f"""
+            <div class="highlight-warning">
+            ⚠️ <strong>{aggregates['gap_count']} gaps</strong> longer than 1.5x the typical step
+            ({pd.Timedelta(seconds=aggregates['median_step_seconds'])}). Largest gap:
+            {pd.Timedelta(seconds=aggregates['largest_gap_seconds'])} starting {aggregates['largest_gap_start']}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Rows are aggregated per period before plotting, so charts stay small
+        profile_rule = aggregates['resample_rule']
+        if df is not None:
+            rule_options = [rule for rule, (_, rule_seconds) in TIME_SERIES_RULES.items()
+                            if aggregates['span_seconds'] / rule_seconds + 1 <= TIME_SERIES_MAX_POINTS]
+            value_options = ["Row count"] + list(profile['numeric_aggregates'])
+        else:
+            rule_options = [profile_rule]
+            value_options = ["Row count"]
+        
+        ts_col1, ts_col2 = st.columns(2)
+        with ts_col1:
+            rule = st.selectbox(
+                "Resolution",
+                options=rule_options,
+                index=rule_options.index(profile_rule) if profile_rule in rule_options else 0,
+                format_func=lambda rule: TIME_SERIES_RULES[rule][0],
+                key="ts_rule"
+            )
+        with ts_col2:
+            value_column = st.selectbox("Value", options=value_options, key="ts_value")
+        
+        if value_column == "Row count" and rule == profile_rule:
+            series_df = pd.DataFrame({'count': aggregates['period_counts']},
+                                     index=pd.DatetimeIndex(aggregates['period_starts']))
+        else:
+            with measure_stage(diagnostics, "Time series aggregation"):
+                series_df = aggregate_time_series(df, time_column, rule,
+                                                  None if value_column == "Row count" else value_column)
+        
+        show_chart(plot_time_series(series_df, time_column, value_column), diagnostics, "Time series")
+    else:
+        st.info("💡 No date/time columns detected in the dataset")
+    
+    # ===== SECTION 7: DISTRIBUTION & OUTLIER ANALYSIS =====
+    st.header("7️⃣ Distribution & Outlier Analysis")
     
     # Advanced settings for unique ID handling
-    with st.expander("⚙️ Analysis Settings (Handle Duplicates/Repeated Items)", expanded=False):
+    unique_id_col = "None"
+    if df is not None:
+        with st.expander("⚙️ Analysis Settings (Handle Duplicates/Repeated Items)", expanded=False):
 
-        unique_id_col = st.selectbox(
-            "Select Unique ID Column (e.g., Product ID, SKU):",
-            options=["None"] + list(df.columns),
-            index=0,
-            help="Select a column to drop duplicate values based on this identifier."
-        )
+            unique_id_col = st.selectbox(
+                "Select Unique ID Column (e.g., Product ID, SKU):",
+                options=["None"] + list(df.columns),
+                index=0,
+                help="Select a column to drop duplicate values based on this identifier."
+            )
     
     # Determine the dataframe to analyze
+    # Columns are factorized once per dataset; codes serve deduplication and grouping
+    dedup_mask = None
     if unique_id_col != "None":
-        plot_df = df.drop_duplicates(subset=unique_id_col)
+        group_cache = st.session_state['working_dataset']['group_index']
+        dedup_mask = first_occurrence_mask(get_group_index(df, unique_id_col, group_cache)['codes'])
+        plot_df = df[dedup_mask]
         st.success(
             f"✅ Analyzing **{len(plot_df)}** unique entries based on '{unique_id_col}' "
             f"(Excluded {len(df) - len(plot_df)} duplicate rows)"
         )
     else:
         plot_df = df
+    
+    # Dataset-wide outlier scan, computed once during profiling
+    outlier_scan = profile['outlier_scan']
+    if not outlier_scan['summary'].empty:
+        st.subheader("🚨 Outlier Scan (All Numerical Columns)")
+        st.caption(
+            f"IQR: outside 1.5 × IQR fences · Z-Score: |z| > {OUTLIER_Z_THRESHOLD:g} · "
+            f"MAD: modified z-score > {OUTLIER_MAD_THRESHOLD:g} (counts cover all rows)"
+        )
+        show_table(outlier_scan['summary'], diagnostics, "Outlier scan table")
+        
+        score_counts = outlier_scan['score_counts']
+        flagged_rows = int(score_counts[1:].sum())
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Rows with Outliers", f"{flagged_rows:,}")
+        with col2:
+            st.metric("Rows with Outliers %", f"{flagged_rows / max(profile['n_rows'], 1) * 100:.2f}%")
+        with col3:
+            st.metric("Max Outlier Score", int(np.flatnonzero(score_counts)[-1]))
+        
+        if df is not None and len(outlier_scan['top_rows']) > 0:
+            with st.expander(f"🔎 Most Unusual Rows (top {len(outlier_scan['top_rows'])})", expanded=False):
+                st.caption("Outlier score = number of numerical columns in which the row is flagged by any method")
+                top_rows = df.iloc[outlier_scan['top_rows']]
+                top_rows.insert(0, 'Outlier Score', outlier_scan['top_scores'])
+                show_table(top_rows, diagnostics, "Top outlier rows table")
 
     # Analysis Section (Single Column Only)
+    # Datetime columns are covered by the time series section
     selected_column = st.selectbox(
         "Select a column to analyze",
-        options=plot_df.columns,
+        options=[col for col in summary_df['Column Name'] if col not in profile['temporal_aggregates']],
         help="Choose a column to view its distribution",
         key="single_col"
     )
     
-    if selected_column:
-        feature_type = classify_feature_type(plot_df[selected_column])
+    if selected_column is not None:
+        feature_type = 'Numerical' if selected_column in profile['numeric_aggregates'] else 'Categorical'
         
         st.subheader(f"Analysis of: {selected_column} ({feature_type})")
         
         if feature_type == 'Numerical':
+            # Reuse the profiled aggregates unless rows were deduplicated
+            if unique_id_col != "None":
+                aggregates = compute_numeric_aggregates(plot_df[selected_column])
+            else:
+                aggregates = profile['numeric_aggregates'][selected_column]
+            
             # Display combined distribution and box plot
-            st.plotly_chart(plot_histogram(plot_df, selected_column), use_container_width=True)
+            show_chart(plot_histogram_from_aggregates(aggregates, selected_column), diagnostics, "Histogram")
             
             
             # Additional statistics
@@ -1094,47 +6808,125 @@ def main():
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Mean", f"{plot_df[selected_column].mean():.2f}")
+                st.metric("Mean", f"{aggregates['mean']:.2f}")
             
             with col2:
-                st.metric("Median", f"{plot_df[selected_column].median():.2f}")
+                st.metric("Median", f"{aggregates['median']:.2f}")
             
             with col3:
-                st.metric("Std Dev", f"{plot_df[selected_column].std():.2f}")
+                st.metric("Std Dev", f"{aggregates['std']:.2f}")
             
             with col4:
-                # Calculate outliers using IQR method
-                Q1 = plot_df[selected_column].quantile(0.25)
-                Q3 = plot_df[selected_column].quantile(0.75)
-                IQR = Q3 - Q1
-                outliers = plot_df[(plot_df[selected_column] < (Q1 - 1.5 * IQR)) | (plot_df[selected_column] > (Q3 + 1.5 * IQR))]
-                st.metric("Outliers", len(outliers))
+                # Outliers using IQR method
+                st.metric("Outliers", aggregates['outliers'])
         
         else:  # Categorical
-            st.plotly_chart(plot_categorical_bar(plot_df, selected_column), use_container_width=True)
+            if unique_id_col != "None":
+                aggregates = compute_categorical_aggregates(plot_df[selected_column])
+            else:
+                aggregates = profile['categorical_aggregates'][selected_column]
+            
+            show_chart(plot_categorical_bar_from_aggregates(aggregates, selected_column), diagnostics, "Value counts bar")
             
             # Additional statistics
             st.markdown("#### Statistics")
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.metric("Unique Values", plot_df[selected_column].nunique())
+                st.metric("Unique Values", aggregates['unique'])
+            
+            with col2:
+                st.metric("Most Frequent", str(aggregates['mode']) if aggregates['mode'] is not None else "N/A")
+            
+            with col3:
+                st.metric("Frequency", aggregates['mode_count'])
+            
+            if aggregates['count_error'] > 0:
+                st.caption(f"Counts come from merged frequent-item summaries and may be up to {aggregates['count_error']:,} lower than the exact counts")
+            
+            # Text profile
+            if unique_id_col != "None":
+                text_aggregates = compute_text_aggregates(plot_df[selected_column])
+            else:
+                text_aggregates = profile['text_aggregates'][selected_column]
+            
+            st.markdown("#### 📝 Text Profile")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Detected Type", text_aggregates['semantic_type'])
             
             with col2:
-                st.metric("Most Frequent", plot_df[selected_column].mode()[0] if len(plot_df[selected_column].mode()) > 0 else "N/A")
+                st.metric("Avg Length", f"{text_aggregates['mean_length']:.1f}")
             
             with col3:
-                most_frequent_count = plot_df[selected_column].value_counts().iloc[0] if len(plot_df[selected_column]) > 0 else 0
-                st.metric("Frequency", most_frequent_count)
+                st.metric("Empty / Whitespace", text_aggregates['empty'] + text_aggregates['whitespace_only'])
+            
+            with col4:
+                st.metric("Distinct Patterns", text_aggregates['pattern_count'])
+            
+            if text_aggregates['padded'] > 0:
+                st.markdown(f"""
+                <div class="highlight-warning">
+                ⚠️ <strong>{text_aggregates['padded']} values</strong> have leading or trailing whitespace
+                </div>
+                """, unsafe_allow_html=True)
+            
+            text_col1, text_col2 = st.columns(2)
+            
+            with text_col1:
+                show_chart(plot_text_length_histogram(text_aggregates, selected_column), diagnostics, "Text length histogram")
+            
+            with text_col2:
+                count = max(text_aggregates['count'], 1)
+                patterns_df = pd.DataFrame({
+                    'Pattern': text_aggregates['top_patterns'],
+                    'Count': text_aggregates['top_pattern_counts'],
+                    '%': [round(c / count * 100, 2) for c in text_aggregates['top_pattern_counts']]
+                })
+                st.markdown("**Most Common Patterns** (A = uppercase, a = lowercase, 9 = digit)")
+                show_table(patterns_df, diagnostics, "Text patterns table")
+                st.caption(
+                    f"Emails: {text_aggregates['email']:,} · URLs: {text_aggregates['url']:,} · "
+                    f"Numbers: {text_aggregates['numeric']:,} of {text_aggregates['count']:,} values"
+                )
     
-    # ===== SECTION 7: NUMERICAL VS CATEGORICAL COMPARISON =====
-    st.header("7️⃣ Compare Numerical vs Categorical")
+    # ===== SECTION 8: NUMERICAL VS CATEGORICAL COMPARISON =====
+    st.header("8️⃣ Compare Numerical vs Categorical")
     
     st.info("💡 **Use this to understand**: How does a numerical value (e.g., Sales, Price) vary across different categories (e.g., Product Type, Region)?")
     
+    associations = profile['associations']
+    if not associations.empty:
+        st.subheader("🏆 Strongest Numerical–Categorical Associations")
+        st.caption("Eta² is the share of a numerical column's variance explained by the categories (0 = none, 1 = fully)")
+        show_paginated_table(associations.round(4), diagnostics, "Association ranking table", key="associations")
+        if df is not None or duckdb_source is not None:
+            top_pairs = associations.head(ASSOCIATION_TOP_PAIRS)
+            st.selectbox(
+                "Jump to a pair",
+                options=[None] + list(zip(top_pairs['Numerical'], top_pairs['Categorical'])),
+                format_func=lambda pair: "Choose a ranked pair..." if pair is None else f"{pair[0]} by {pair[1]}",
+                key="association_pair",
+                on_change=_select_association_pair
+            )
+    if profile['association_skipped']:
+        st.caption(
+            f"Skipped categorical columns with more than {ASSOCIATION_MAX_CATEGORIES} categories: "
+            f"{', '.join(map(str, profile['association_skipped']))}"
+        )
+    
+    if df is None and duckdb_source is None:
+        st.warning("⚠️ Load the raw data to compare numerical values across categories")
+        return
+    
     # Get numerical and categorical columns
-    numerical_cols = plot_df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = plot_df.select_dtypes(include=['object', 'category']).columns.tolist()
+    if df is not None:
+        numerical_cols = plot_df.select_dtypes(include=[np.number]).columns.tolist()
+        categorical_cols = [col for col in plot_df.columns if classify_feature_type(plot_df[col]) == 'Categorical']
+    else:
+        numerical_cols = [] if profile['stats_df'] is None else profile['stats_df'].index.tolist()
+        categorical_cols = list(profile['categorical_aggregates'])
     
     if len(numerical_cols) > 0 and len(categorical_cols) > 0:
         col1, col2 = st.columns(2)
@@ -1158,30 +6950,39 @@ def main():
         if num_col and cat_col:
             # Filter to top categories if too many
             top_n = 10
-            if plot_df[cat_col].nunique() > top_n:
-                st.warning(f"⚠️ Showing top {top_n} categories only (out of {plot_df[cat_col].nunique()} total)")
-                top_categories = plot_df[cat_col].value_counts().head(top_n).index.tolist()
-                compare_df = plot_df[plot_df[cat_col].isin(top_categories)]
+            if df is None:
+                # Out-of-core profile: group in SQL over the staged file
+                with measure_stage(diagnostics, "Group statistics"):
+                    labels, group_stats, n_categories = duckdb_group_statistics(
+                        duckdb_source, sql_filter or None, num_col, cat_col, top_n
+                    )
             else:
-                compare_df = plot_df
+                # Group by cached integer codes instead of rehashing the column
+                group_index = get_group_index(df, cat_col, st.session_state['working_dataset']['group_index'])
+                codes = group_index['codes'] if dedup_mask is None else group_index['codes'][dedup_mask]
+                group_codes, n_categories = top_group_codes(codes, len(group_index['uniques']), top_n)
+                
+                with measure_stage(diagnostics, "Group statistics"):
+                    group_stats = compute_group_statistics(
+                        codes, plot_df[num_col].to_numpy(dtype='float64', na_value=np.nan), group_codes
+                    )
+                labels = [str(value) for value in group_index['uniques'][group_codes]]
+            if n_categories > top_n:
+                st.warning(f"⚠️ Showing top {top_n} categories only (out of {n_categories} total)")
             
             # Box Plot - Distribution per category
             st.subheader(f"📊 Distribution of {num_col} by {cat_col}")
-            fig_box = px.box(
-                compare_df,
-                x=cat_col,
-                y=num_col,
-                title=f"{num_col} Distribution Across {cat_col}",
-                color=cat_col,
-                height=500
-            )
-            fig_box.update_layout(showlegend=False, xaxis_tickangle=-45)
-            st.plotly_chart(fig_box, use_container_width=True)
+            fig_box = plot_group_boxplot(group_stats, labels, num_col, cat_col)
+            show_chart(fig_box, diagnostics, "Category box plot")
             
             # Bar Chart - Mean per category
             st.subheader(f"📈 Average {num_col} by {cat_col}")
-            grouped_stats = compare_df.groupby(cat_col)[num_col].agg(['mean', 'median', 'count']).reset_index()
-            grouped_stats = grouped_stats.sort_values('mean', ascending=False)
+            grouped_stats = pd.DataFrame({
+                cat_col: labels,
+                'mean': group_stats['mean'],
+                'median': group_stats['median'],
+                'count': group_stats['count']
+            }).sort_values('mean', ascending=False)
             
             fig_bar = px.bar(
                 grouped_stats,
@@ -1194,20 +6995,21 @@ def main():
                 height=400
             )
             fig_bar.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_bar, use_container_width=True)
+            show_chart(fig_bar, diagnostics, "Category mean bar")
             
             # Statistics Table
             st.subheader("📋 Detailed Statistics by Category")
-            stats_table = compare_df.groupby(cat_col)[num_col].agg([
-                ('Count', 'count'),
-                ('Mean', 'mean'),
-                ('Median', 'median'),
-                ('Std Dev', 'std'),
-                ('Min', 'min'),
-                ('Max', 'max')
-            ]).round(2).reset_index()
+            stats_table = pd.DataFrame({
+                cat_col: labels,
+                'Count': group_stats['count'],
+                'Mean': group_stats['mean'],
+                'Median': group_stats['median'],
+                'Std Dev': group_stats['std'],
+                'Min': group_stats['min'],
+                'Max': group_stats['max']
+            }).round(2)
             stats_table = stats_table.sort_values('Mean', ascending=False)
-            st.dataframe(stats_table, use_container_width=True)
+            show_table(stats_table, diagnostics, "Category statistics table")
             
     elif len(numerical_cols) == 0:
         st.warning("⚠️ No numerical columns found in the dataset")
@@ -1219,5 +7021,61 @@ def main():
 
 
 
+def load_deferred_modules():
+    """
+    Import every module that is otherwise loaded at first use
+    
+    Returns:
+        list of module names that were imported
+    """
+    loaded = []
+    for value in list(globals().values()):
+        if isinstance(value, _LazyModule):
+            value._load()
+            loaded.append(value._name)
+    return loaded
+
+
+def start_prewarm():
+    """
+    Load the deferred parsing and plotting modules on a background thread
+    
+    The landing page renders while the imports run, so the first upload does
+    not pay for them. Imports are shared by every session of the server
+    process, so the thread starts at most once while any module is missing.
+    
+    Returns:
+        threading.Thread or None: the started thread, or None when nothing
+        is left to load or a prewarm is already running
+    """
+    pending = [value for value in globals().values()
+               if isinstance(value, _LazyModule) and value._name not in sys.modules]
+    if not pending or any(thread.name == PREWARM_THREAD_NAME for thread in threading.enumerate()):
+        return None
+    thread = threading.Thread(target=load_deferred_modules, name=PREWARM_THREAD_NAME, daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    """Main application function"""
+    if PREWARM_IMPORTS:
+        start_prewarm()
+    
+    diagnostics = None
+    if st.session_state.get('diagnostics_enabled'):
+        diagnostics = {'context': {}, 'stages': []}
+    
+    try:
+        if diagnostics is None:
+            render_dashboard(diagnostics)
+        else:
+            with tracemalloc_session():
+                render_dashboard(diagnostics)
+    finally:
+        with st.sidebar:
+            render_diagnostics_panel(diagnostics)
+
+
 if __name__ == "__main__":
     main()
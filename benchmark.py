@@ -0,0 +1,247 @@
+"""
+Benchmark suite for the Data Profiling & EDA App
+Times and memory-profiles the core profiling functions on deterministic
+synthetic datasets, and compares results against a stored baseline.
+
+Usage:
+    python benchmark.py --preset quick
+    python benchmark.py --rows 10000 1000000 --cols 30 --compare benchmark_results/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Importing the app outside `streamlit run` logs bare-mode warnings
+logging.disable(logging.WARNING)
+import app  # noqa: E402
+logging.disable(logging.NOTSET)
+
+
+PRESETS = {
+    'quick': [10_000, 100_000],
+    'standard': [10_000, 100_000, 1_000_000],
+    'full': [10_000, 100_000, 1_000_000, 10_000_000, 50_000_000]
+}
+DEFAULT_RESULTS_DIR = 'benchmark_results'
+REGRESSION_THRESHOLD = 0.2
+
+
+def generate_synthetic_dataset(n_rows, n_cols=20, numeric_ratio=0.5, cardinality=50,
+                               null_rate=0.05, duplicate_rate=0.01, seed=42):
+    """
+    Generate a deterministic synthetic dataset
+
+    Args:
+        n_rows: number of rows
+        n_cols: number of columns
+        numeric_ratio: fraction of numerical columns
+        cardinality: number of distinct values per categorical column
+        null_rate: fraction of missing values per column
+        duplicate_rate: fraction of rows that duplicate another row
+        seed: random seed
+
+    Returns:
+        pandas DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    n_numeric = int(round(n_cols * numeric_ratio))
+
+    # Rows that copy an earlier row, applied identically to every column
+    take = np.arange(n_rows)
+    n_duplicates = int(n_rows * duplicate_rate)
+    if n_duplicates and n_rows > 1:
+        positions = rng.choice(np.arange(1, n_rows), size=n_duplicates, replace=False)
+        take[positions] = (rng.random(n_duplicates) * positions).astype(np.int64)
+
+    columns = {}
+    for i in range(n_cols):
+        null_mask = rng.random(n_rows) < null_rate
+        if i < n_numeric:
+            # Mix of distributions so histograms and outliers are non-trivial
+            if i % 3 == 0:
+                values = rng.normal(100, 15, n_rows)
+            elif i % 3 == 1:
+                values = rng.lognormal(3, 1, n_rows)
+            else:
+                values = rng.integers(0, 1000, n_rows).astype(np.float64)
+            values[null_mask] = np.nan
+            columns[f'num_{i}'] = values[take]
+        else:
+            uniques = np.array([f'cat{i}_{k}' for k in range(cardinality)], dtype=object)
+            # Zipf-like frequencies so top-k views are meaningful
+            probabilities = 1.0 / np.arange(1, cardinality + 1)
+            codes = rng.choice(cardinality, size=n_rows, p=probabilities / probabilities.sum())
+            values = uniques[codes]
+            values[null_mask] = None
+            columns[f'cat_{i}'] = values[take]
+
+    return pd.DataFrame(columns)
+
+
+def _run(diagnostics, name, func, repeat, figure=False):
+    """
+    Run func `repeat` times under measure_stage and keep the fastest run
+
+    When `figure` is True the returned plotly figure is serialized inside the
+    measured block, as Streamlit would, and its payload size is recorded.
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        trial = {'context': {}, 'stages': []}
+        with app.measure_stage(trial, name) as record:
+            result = func()
+            if figure and result is not None:
+                record['payload_bytes'] = len(result.to_json())
+        runs.append(trial['stages'][0])
+
+    best = min(runs, key=lambda r: r['wall_ms'])
+    best['repeat'] = repeat
+    diagnostics['stages'].append(best)
+    return result
+
+
+def benchmark_scale(n_rows, args, workdir):
+    """
+    Benchmark every core function on one synthetic dataset
+
+    Returns:
+        list of result dicts
+    """
+    df = generate_synthetic_dataset(
+        n_rows, n_cols=args.cols, numeric_ratio=args.numeric_ratio, cardinality=args.cardinality,
+        null_rate=args.null_rate, duplicate_rate=args.duplicate_rate, seed=args.seed
+    )
+    csv_path = os.path.join(workdir, f'synthetic_{n_rows}.csv')
+    df.to_csv(csv_path, index=False)
+
+    diagnostics = {'context': {}, 'stages': []}
+    repeat = args.repeat
+
+    def parse():
+        uploaded = app.LocalFile(csv_path)
+        try:
+            return app.load_data(uploaded)
+        finally:
+            uploaded.close()
+
+    _run(diagnostics, 'load_data', parse, repeat)
+    _run(diagnostics, 'create_feature_summary', lambda: app.create_feature_summary(df), repeat)
+    _run(diagnostics, 'perform_data_quality_checks', lambda: app.perform_data_quality_checks(df), repeat)
+    _run(diagnostics, 'get_descriptive_statistics', lambda: app.get_descriptive_statistics(df), repeat)
+    corr_matrix, _, _ = _run(diagnostics, 'compute_correlation_analysis', lambda: app.compute_correlation_analysis(df), repeat)
+    profile = _run(diagnostics, 'build_profile', lambda: app.build_profile(df, 'CSV'), repeat)
+    _run(diagnostics, 'generate_comprehensive_report', lambda: app.generate_comprehensive_report(profile), repeat)
+
+    numeric_col = next((c for c in df.columns if c.startswith('num_')), None)
+    categorical_col = next((c for c in df.columns if c.startswith('cat_')), None)
+    if numeric_col is not None:
+        _run(diagnostics, 'plot_histogram', lambda: app.plot_histogram(df, numeric_col), repeat, figure=True)
+    if categorical_col is not None:
+        _run(diagnostics, 'plot_categorical_bar', lambda: app.plot_categorical_bar(df, categorical_col), repeat, figure=True)
+    if corr_matrix is not None:
+        _run(diagnostics, 'plot_correlation_heatmap', lambda: app.plot_correlation_heatmap(corr_matrix), repeat, figure=True)
+    _run(diagnostics, 'plot_missing_values', lambda: app.plot_missing_values(df), repeat, figure=True)
+
+    os.remove(csv_path)
+
+    results = []
+    for stage in diagnostics['stages']:
+        results.append({'rows': n_rows, 'function': stage.pop('stage'), **{k: v for k, v in stage.items() if k != 'kind'}})
+    return results
+
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare benchmark results against a baseline run
+
+    Args:
+        current: list of result dicts from this run
+        baseline: list of result dicts from the baseline run
+        threshold: relative wall-time increase that counts as a regression
+
+    Returns:
+        tuple: (comparison DataFrame, number of regressions)
+    """
+    current_df = pd.DataFrame(current).set_index(['rows', 'function'])
+    baseline_df = pd.DataFrame(baseline).set_index(['rows', 'function'])
+    common = current_df.index.intersection(baseline_df.index)
+
+    comparison = pd.DataFrame({
+        'baseline_ms': baseline_df.loc[common, 'wall_ms'],
+        'current_ms': current_df.loc[common, 'wall_ms'],
+        'baseline_peak_mb': baseline_df.loc[common, 'tracemalloc_peak_mb'],
+        'current_peak_mb': current_df.loc[common, 'tracemalloc_peak_mb']
+    })
+    comparison['change_%'] = ((comparison['current_ms'] / comparison['baseline_ms'] - 1) * 100).round(1)
+    comparison['regression'] = comparison['change_%'] > threshold * 100
+    return comparison, int(comparison['regression'].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data profiling functions")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick', help="Scale points to run")
+    parser.add_argument('--rows', type=int, nargs='+', help="Explicit scale points (overrides --preset)")
+    parser.add_argument('--cols', type=int, default=20, help="Number of columns")
+    parser.add_argument('--numeric-ratio', type=float, default=0.5, help="Fraction of numerical columns")
+    parser.add_argument('--cardinality', type=int, default=50, help="Distinct values per categorical column")
+    parser.add_argument('--null-rate', type=float, default=0.05, help="Fraction of missing values")
+    parser.add_argument('--duplicate-rate', type=float, default=0.01, help="Fraction of duplicated rows")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per function (fastest is kept)")
+    parser.add_argument('--output', default=DEFAULT_RESULTS_DIR, help="Directory for result files")
+    parser.add_argument('--compare', help="Baseline result file to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    scale_points = args.rows or PRESETS[args.preset]
+    tracemalloc.start()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in scale_points:
+            print(f"Benchmarking {n_rows:,} rows x {args.cols} columns...", flush=True)
+            results.extend(benchmark_scale(n_rows, args, workdir))
+
+    results_df = pd.DataFrame(results)
+    print(results_df[['rows', 'function', 'wall_ms', 'cpu_ms', 'tracemalloc_peak_mb', 'payload_bytes']].to_string(index=False))
+
+    os.makedirs(args.output, exist_ok=True)
+    timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+    output_path = os.path.join(args.output, f'benchmark_{timestamp}.json')
+    with open(output_path, 'w') as f:
+        json.dump({
+            'created_at': pd.Timestamp.now().isoformat(),
+            'environment': {
+                'python': sys.version.split()[0],
+                'platform': sys.platform,
+                'pandas': pd.__version__,
+                'numpy': np.__version__
+            },
+            'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+            'results': results
+        }, f, indent=2, default=str)
+    print(f"\nResults written to {output_path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        comparison, regressions = compare_results(results, baseline, args.threshold)
+        print(f"\nComparison against {args.compare}:")
+        print(comparison.to_string())
+        if regressions:
+            print(f"\n{regressions} regression(s) slower than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Startup benchmark for the Data Profiling & EDA App
+Measures the cold start of a fresh Python process: importing the app module
+and running the script once up to the landing page (no file uploaded), and
+reports which heavy modules were imported on the way.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --repeat 10 --prewarm --max-landing-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+HEAVY_MODULES = ['numpy', 'pandas', 'pyarrow', 'plotly.express', 'polars', 'duckdb']
+
+# Runs in a fresh interpreter so nothing is already imported
+IMPORT_PROBE = """
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_ms': elapsed * 1000, 'modules': [m for m in {modules!r} if m in sys.modules]}}))
+"""
+
+LANDING_PROBE = """
+import json, logging, sys, threading, time
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ms = (time.perf_counter() - start) * 1000
+at = AppTest.from_file({app_path!r}, default_timeout=120)
+start = time.perf_counter()
+at.run()
+landing_ms = (time.perf_counter() - start) * 1000
+modules = [m for m in {modules!r} if m in sys.modules]
+start = time.perf_counter()
+for thread in threading.enumerate():
+    if thread.name == 'eda-prewarm':
+        thread.join()
+prewarm_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    'streamlit_ms': streamlit_ms, 'landing_ms': landing_ms, 'prewarm_wait_ms': prewarm_ms,
+    'modules': modules, 'modules_after_prewarm': [m for m in {modules!r} if m in sys.modules],
+    'exceptions': len(at.exception)
+}}))
+"""
+
+
+def run_probe(code, prewarm=False):
+    """
+    Run a probe script in a fresh interpreter and parse its JSON result
+
+    Args:
+        code: Python source printing one JSON line
+        prewarm: set EDA_PREWARM for the child process
+
+    Returns:
+        dict
+    """
+    env = dict(os.environ)
+    env.pop('EDA_PREWARM', None)
+    if prewarm:
+        env['EDA_PREWARM'] = '1'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's cold start")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh processes per measurement (median is reported)")
+    parser.add_argument('--prewarm', action='store_true', help="Also measure with EDA_PREWARM=1")
+    parser.add_argument('--max-landing-ms', type=float, help="Exit with status 1 if the median landing page time is slower")
+    args = parser.parse_args()
+
+    import_code = IMPORT_PROBE.format(app_dir=os.path.dirname(APP_PATH), modules=HEAVY_MODULES)
+    landing_code = LANDING_PROBE.format(app_path=APP_PATH, modules=HEAVY_MODULES)
+
+    imports = [run_probe(import_code) for _ in range(args.repeat)]
+    print(f"import app:    {statistics.median(r['import_ms'] for r in imports):8.0f} ms (median of {args.repeat})")
+    print(f"  heavy modules loaded: {', '.join(imports[-1]['modules']) or 'none'}")
+
+    failed = False
+    for prewarm in ([False, True] if args.prewarm else [False]):
+        runs = [run_probe(landing_code, prewarm) for _ in range(args.repeat)]
+        landing_ms = statistics.median(r['landing_ms'] for r in runs)
+        label = "landing page" + (" (prewarm)" if prewarm else "")
+        print(f"{label + ':':<26}{landing_ms:8.0f} ms (median of {args.repeat}, "
+              f"streamlit import {statistics.median(r['streamlit_ms'] for r in runs):.0f} ms)")
+        print(f"  heavy modules loaded: {', '.join(runs[-1]['modules']) or 'none'}")
+        if prewarm:
+            print(f"  prewarm finished {statistics.median(r['prewarm_wait_ms'] for r in runs):.0f} ms after the landing page; "
+                  f"loaded: {', '.join(runs[-1]['modules_after_prewarm']) or 'none'}")
+        if any(r['exceptions'] for r in runs):
+            print("  the landing page raised an exception")
+            failed = True
+        if args.max_landing_ms is not None and landing_ms > args.max_landing_ms:
+            print(f"  slower than {args.max_landing_ms:.0f} ms")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Backend parity check for the Data Profiling & EDA App
+Builds the core profile tables with every available compute backend on
+deterministic synthetic datasets and reports any difference from pandas.
+
+Usage:
+    python check_backend_parity.py
+    python check_backend_parity.py --rows 1000 100000 --cols 30
+"""
+
+import argparse
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Importing the app outside `streamlit run` logs bare-mode warnings
+logging.disable(logging.WARNING)
+import app  # noqa: E402
+from benchmark import generate_synthetic_dataset  # noqa: E402
+logging.disable(logging.NOTSET)
+
+
+def add_edge_case_columns(df, seed=42):
+    """
+    Add columns that exercise every branch of the quality checks
+
+    Args:
+        df: pandas DataFrame from generate_synthetic_dataset
+        seed: random seed
+
+    Returns:
+        pandas DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = len(df)
+    df = df.copy()
+    df['all_null'] = np.nan
+    df['all_zeros'] = 0.0
+    df['constant'] = 'same'
+    df['mostly_null'] = np.where(rng.random(n_rows) < 0.4, np.nan, rng.normal(size=n_rows))
+    df['flag'] = rng.random(n_rows) < 0.5
+    df['numeric_text'] = pd.Series(rng.integers(0, 100, n_rows).astype(str), dtype=object)
+    df['mixed'] = pd.Series(np.where(rng.random(n_rows) < 0.5, np.array('a', dtype=object), 1), dtype=object)
+    df['timestamp'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 1000, n_rows), unit='D')
+    return df
+
+
+def compare_core_tables(expected, actual, rtol=1e-9):
+    """
+    Compare two compute_core_tables results
+
+    Returns:
+        list of difference descriptions (empty when the backends agree)
+    """
+    names = ['summary_df', 'quality_report', 'stats_df', 'corr_matrix', 'strong_correlations', 'insights']
+    differences = []
+    for name, left, right in zip(names, expected, actual):
+        if isinstance(left, pd.DataFrame) or isinstance(right, pd.DataFrame):
+            try:
+                pd.testing.assert_frame_equal(left, right, check_dtype=False, rtol=rtol)
+            except AssertionError as exc:
+                differences.append(f"{name}: {exc}")
+        elif name == 'quality_report':
+            for key in left:
+                if key in ('columns_with_missing', 'columns_high_missing'):
+                    same = [item[0] for item in left[key]] == [item[0] for item in right[key]] and np.allclose(
+                        [item[1:] for item in left[key]], [item[1:] for item in right[key]], rtol=rtol
+                    )
+                else:
+                    same = left[key] == right[key]
+                if not same:
+                    differences.append(f"quality_report['{key}']: {left[key]} != {right[key]}")
+        elif name == 'strong_correlations' and left is not None and right is not None:
+            if [pair[:2] for pair in left] != [pair[:2] for pair in right] or not np.allclose(
+                    [pair[2] for pair in left], [pair[2] for pair in right], rtol=rtol):
+                differences.append(f"{name}: {left} != {right}")
+        elif left != right:
+            differences.append(f"{name}: {left} != {right}")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every compute backend matches pandas")
+    parser.add_argument('--rows', type=int, nargs='+', default=[0, 1, 1_000, 100_000], help="Dataset sizes")
+    parser.add_argument('--cols', type=int, default=20, help="Number of synthetic columns")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    backends = [backend for backend in app.available_backends() if backend != 'pandas']
+    if not backends:
+        print("Only the pandas backend is installed; nothing to compare")
+        return
+
+    failures = 0
+    for n_rows in args.rows:
+        df = add_edge_case_columns(generate_synthetic_dataset(n_rows, n_cols=args.cols, seed=args.seed), args.seed)
+        expected = app.compute_core_tables(df, 'pandas')
+        for backend in backends:
+            differences = compare_core_tables(expected, app.compute_core_tables(df, backend))
+            status = "OK" if not differences else f"{len(differences)} difference(s)"
+            print(f"{n_rows:>10,} rows  {backend:<8} {status}")
+            for difference in differences:
+                print(f"    {difference}")
+            failures += bool(differences)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
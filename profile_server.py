@@ -0,0 +1,595 @@
+"""
+Local profiling service for the Data Profiling & EDA App
+Serves the Feature Summary, Quality Checks, Descriptive Statistics and
+Correlation results over HTTP, without the Streamlit UI. Jobs run on a
+bounded worker pool, report their progress as a stream of JSON lines, and
+results are keyed by file content hash: the app's profile cache directory
+is shared, so files profiled by either side are served without recomputing.
+
+Usage:
+    python profile_server.py
+    python profile_server.py --port 8765 --workers 2 --max-queue 16 --data-root /data
+
+    curl -X POST localhost:8765/jobs -d '{"path": "/data/sales.csv"}'
+    curl -X POST 'localhost:8765/jobs?name=sales.csv.gz' --data-binary @sales.csv.gz
+    curl localhost:8765/jobs/<job_id>/events
+    curl localhost:8765/profiles/<file_hash>
+    curl 'localhost:8765/profiles/<file_hash>?format=arrow&table=descriptive_statistics' -o stats.arrow
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Importing the app outside `streamlit run` logs bare-mode warnings
+logging.disable(logging.WARNING)
+import app  # noqa: E402
+logging.disable(logging.NOTSET)
+
+
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_CACHE_ENTRIES = 32
+DEFAULT_MAX_UPLOAD_MB = 2048
+MAX_FINISHED_JOBS = 1000
+EVENT_HEARTBEAT_SECONDS = 15
+ARROW_TABLES = {
+    'feature_summary': 'summary_df',
+    'descriptive_statistics': 'stats_df',
+    'correlation': 'corr_matrix'
+}
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+class _ProgressStages(list):
+    """Diagnostics stage list that reports every finished stage to its job"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+
+    def append(self, record):
+        super().append(record)
+        self._callback(record)
+
+
+def profile_to_json(profile):
+    """
+    Encode the core sections of a profile as a JSON-compatible dict
+
+    Tables use the same 'split' layout as profile artifacts.
+
+    Args:
+        profile: dict returned by build_profile or build_profile_duckdb
+
+    Returns:
+        dict
+    """
+    return {
+        'file_name': profile['file_name'],
+        'file_hash': profile['file_hash'],
+        'file_type': profile['file_type'],
+        'n_rows': profile['n_rows'],
+        'n_cols': profile['n_cols'],
+        'memory_mb': profile['memory_mb'],
+        'feature_summary': app._frame_to_json(profile['summary_df']),
+        'quality_checks': profile['quality_report'],
+        'descriptive_statistics': app._frame_to_json(profile['stats_df']),
+        'correlation': {
+            'matrix': app._frame_to_json(profile['corr_matrix']),
+            'strong_correlations': profile['strong_correlations'],
+            'insights': profile['insights']
+        }
+    }
+
+
+def frame_to_arrow(frame):
+    """
+    Encode a DataFrame as an Arrow IPC stream
+
+    Object columns that Arrow cannot type (e.g. mixed values) are sent as text.
+
+    Args:
+        frame: pandas DataFrame
+
+    Returns:
+        bytes
+    """
+    try:
+        table = app.pa.Table.from_pandas(frame, preserve_index=True)
+    except (app.pa.ArrowInvalid, app.pa.ArrowTypeError):
+        frame = frame.copy()
+        for col in frame.columns[frame.dtypes == object]:
+            frame[col] = frame[col].map(lambda value: None if value is None else str(value))
+        table = app.pa.Table.from_pandas(frame, preserve_index=True)
+    sink = app.pa.BufferOutputStream()
+    with app.pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class ProfilingService:
+    """
+    Job queue, worker pool and result cache behind the HTTP handler
+
+    Submissions of a file whose hash is cached complete immediately; a file
+    that is already queued or running joins the existing job instead of
+    starting another one.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE, cache_entries=DEFAULT_CACHE_ENTRIES,
+                 cache_dir=app.PROFILE_CACHE_DIR, job_memory_mb=app.SESSION_MEMORY_BUDGET_MB,
+                 global_memory_mb=app.GLOBAL_MEMORY_BUDGET_MB, data_root=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.cache_entries = cache_entries
+        self.cache_dir = cache_dir
+        self.job_memory_mb = job_memory_mb
+        self.global_memory_mb = global_memory_mb
+        self.data_root = os.path.realpath(data_root or os.getcwd())
+        self.upload_dir = tempfile.mkdtemp(prefix='eda-uploads-')
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='eda-profile')
+        self._changed = threading.Condition()
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._results = OrderedDict()
+        self._path_hashes = {}
+        self._running_mb = {}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    # Result cache
+
+    def get_result(self, file_hash):
+        """
+        Return the cached result for a file hash, from memory or the profile cache directory
+
+        Returns:
+            dict or None: 'profile' (core sections) and 'json' (encoded bytes)
+        """
+        with self._changed:
+            result = self._results.get(file_hash)
+            if result is not None:
+                self._results.move_to_end(file_hash)
+                return result
+        profile = app.load_cached_profile(file_hash, self.cache_dir)
+        return None if profile is None else self._remember(profile)
+
+    def _remember(self, profile):
+        # Only the sections the API serves are kept in memory
+        core = {key: profile[key] for key in (
+            'file_name', 'file_hash', 'file_type', 'n_rows', 'n_cols', 'memory_mb', 'summary_df',
+            'quality_report', 'stats_df', 'corr_matrix', 'strong_correlations', 'insights')}
+        result = {
+            'profile': core,
+            'json': json.dumps(profile_to_json(core), default=app._to_builtin).encode()
+        }
+        with self._changed:
+            self._results[profile['file_hash']] = result
+            self._results.move_to_end(profile['file_hash'])
+            while len(self._results) > self.cache_entries:
+                self._results.popitem(last=False)
+        return result
+
+    # Sources
+
+    def resolve_path(self, path):
+        """
+        Validate a server-side file path
+
+        Returns:
+            str: absolute path
+
+        Raises:
+            ValueError: if the path is not a readable file under the data root
+        """
+        real_path = os.path.realpath(path)
+        if os.path.commonpath([real_path, self.data_root]) != self.data_root:
+            raise ValueError(f"{path} is outside the data root")
+        if not os.path.isfile(real_path):
+            raise ValueError(f"{path} is not a file")
+        return real_path
+
+    def hash_path(self, path):
+        """Content hash of a file, memoized by path, size and modification time"""
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        file_hash = self._path_hashes.get(key)
+        if file_hash is None:
+            with open(path, 'rb') as f:
+                file_hash = app.compute_file_hash(f)
+            self._path_hashes[key] = file_hash
+        return file_hash
+
+    def store_upload(self, stream, length, name):
+        """
+        Copy a request body to the upload directory, hashing it on the way
+
+        The file keeps the name's suffix so the readers (and DuckDB) detect its
+        format and compression.
+
+        Returns:
+            tuple: (path, file hash)
+        """
+        _, codec = app.split_file_name(name)
+        suffix = '.'.join(name.lower().rsplit('.', 2 if codec else 1)[1:])
+        fd, path = tempfile.mkstemp(suffix=f'.{suffix}', dir=self.upload_dir)
+        hasher = hashlib.sha256()
+        remaining = length
+        with os.fdopen(fd, 'wb') as f:
+            while remaining > 0:
+                chunk = stream.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                f.write(chunk)
+                remaining -= len(chunk)
+        if remaining:
+            os.remove(path)
+            raise ValueError("The upload ended before Content-Length bytes were received")
+        return path, hasher.hexdigest()
+
+    # Jobs
+
+    def submit(self, path, name, file_hash, owned=False):
+        """
+        Queue a profiling job, or answer it from the cache or a job in flight
+
+        Args:
+            path: file to profile
+            name: original file name
+            file_hash: content hash of the file
+            owned: delete the file when the job no longer needs it (uploads)
+
+        Returns:
+            tuple: (job snapshot, HTTP status), or (None, 503) when the queue is full
+        """
+        cached = self.get_result(file_hash) is not None
+        with self._changed:
+            active_id = None if cached else self._active.get(file_hash)
+            if cached or active_id is not None:
+                if owned:
+                    os.remove(path)
+                if active_id is not None:
+                    return self._snapshot(self._jobs[active_id], deduplicated=True), HTTPStatus.ACCEPTED
+            elif len(self._active) >= self.max_queue:
+                if owned:
+                    os.remove(path)
+                return None, HTTPStatus.SERVICE_UNAVAILABLE
+
+            now = time.time()
+            job = {
+                'job_id': uuid.uuid4().hex, 'file_name': name, 'file_hash': file_hash,
+                'status': 'done' if cached else 'queued', 'stage': None, 'stages': [],
+                'load_strategy': None, 'cached': cached, 'error': None,
+                'submitted_at': now, 'started_at': None, 'finished_at': now if cached else None,
+                'version': 0
+            }
+            self._jobs[job['job_id']] = job
+            self._prune_jobs()
+            if not cached:
+                self._active[file_hash] = job['job_id']
+                self._executor.submit(self._run_job, job, path, owned)
+            return self._snapshot(job), HTTPStatus.OK if cached else HTTPStatus.ACCEPTED
+
+    def _prune_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in ('done', 'failed')]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    def _update(self, job, **changes):
+        with self._changed:
+            job.update(changes)
+            job['version'] += 1
+            self._changed.notify_all()
+
+    def _record_stage(self, job, record):
+        with self._changed:
+            job['stages'].append({'stage': record['stage'], 'wall_ms': record['wall_ms']})
+            job['version'] += 1
+            self._changed.notify_all()
+
+    def _snapshot(self, job, **extra):
+        snapshot = {key: value for key, value in job.items() if key != 'version'}
+        snapshot['stages'] = list(job['stages'])
+        snapshot['result_url'] = f"/profiles/{job['file_hash']}" if job['status'] == 'done' else None
+        snapshot.update(extra)
+        return snapshot
+
+    def get_job(self, job_id):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return None if job is None else self._snapshot(job)
+
+    def wait_for_change(self, job_id, version, timeout=EVENT_HEARTBEAT_SECONDS):
+        """
+        Block until a job changes after `version`, or the timeout passes
+
+        Returns:
+            tuple: (job snapshot or None, current version)
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: job_id not in self._jobs or self._jobs[job_id]['version'] > version, timeout)
+            job = self._jobs.get(job_id)
+            return (None, version) if job is None else (self._snapshot(job), job['version'])
+
+    def _memory_budget(self, job_id):
+        # Jobs running at the same time share the global budget, like Streamlit sessions
+        with self._changed:
+            others_mb = sum(mb for other_id, mb in self._running_mb.items() if other_id != job_id)
+        return app.memory_budget_mb(others_mb, self.job_memory_mb, self.global_memory_mb)
+
+    def _run_job(self, job, path, owned):
+        """Profile one file on a worker thread and cache the result"""
+        self._update(job, status='running', started_at=time.time(), stage="Memory estimate")
+        diagnostics = {'context': {}, 'stages': _ProgressStages(lambda record: self._record_stage(job, record))}
+        source = None
+        try:
+            source = app.LocalFile(path, job['file_name'])
+            file_extension, codec = app.split_file_name(job['file_name'])
+            streaming_available = app.duckdb is not None and file_extension in app.DUCKDB_FILE_TYPES and (
+                codec is None or (file_extension == 'csv' and codec in app.DUCKDB_CSV_CODECS))
+            with app.measure_stage(diagnostics, "Memory estimate"):
+                estimate = app.estimate_memory_usage(source)
+            source.seek(0)
+            plan = app.choose_load_strategy(estimate, self._memory_budget(job['job_id']), streaming_available)
+            if plan['strategy'] == 'sampled':
+                # A sample would change the results, so the service does not fall back to one
+                raise MemoryError(plan['reason'])
+            self._update(job, load_strategy=plan['strategy'])
+            with self._changed:
+                self._running_mb[job['job_id']] = estimate['memory_mb'] * app.MEMORY_LOAD_OVERHEAD
+
+            if plan['strategy'] == 'streaming':
+                self._update(job, stage="Profiling with DuckDB")
+                profile = app.build_profile_duckdb(
+                    path, app.DUCKDB_FILE_TYPES[file_extension], file_name=job['file_name'],
+                    file_hash=job['file_hash'], diagnostics=diagnostics
+                )
+                if profile['n_rows'] == 0:
+                    raise ValueError("The uploaded file is empty.")
+            else:
+                self._update(job, stage="Loading")
+                with app.measure_stage(diagnostics, "Load data"):
+                    categories = estimate['categories'] if plan['strategy'] == 'optimized' else None
+                    df, file_type, error = app.load_data(source, categories)
+                if error:
+                    raise ValueError(error)
+                self._update(job, stage="Profiling")
+                profile = app.build_profile(
+                    df, file_type, file_name=job['file_name'], file_hash=job['file_hash'],
+                    diagnostics=diagnostics, backend=app.PROFILE_BACKEND
+                )
+                del df
+                # Only in-memory profiles go to the shared cache; out-of-core ones have approximate quantiles
+                app.save_cached_profile(profile, self.cache_dir)
+            self._remember(profile)
+            self._update(job, status='done', stage=None, finished_at=time.time())
+        except Exception as e:
+            self._update(job, status='failed', stage=None, error=f"{type(e).__name__}: {e}", finished_at=time.time())
+        finally:
+            if source is not None:
+                source.close()
+            if owned and os.path.exists(path):
+                os.remove(path)
+            with self._changed:
+                self._running_mb.pop(job['job_id'], None)
+                self._active.pop(job['file_hash'], None)
+                self._changed.notify_all()
+
+
+class ProfileRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the profiling service
+
+    POST /jobs                       JSON {"path": ...} or a raw file body with ?name=<file name>
+    GET  /jobs/<id>                  job status
+    GET  /jobs/<id>/events           job status as JSON lines until it finishes
+    GET  /profiles/<hash>            profile as JSON, or ?format=arrow&table=<name> as an Arrow stream
+    GET  /health                     worker, queue and cache counts
+    """
+
+    server_version = 'EDAProfileServer/1.0'
+    service = None
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, default=app._to_builtin).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send(status, {'error': message}, headers=headers)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/jobs':
+            return self._error(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+        service = self.server.service
+        query = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+
+        try:
+            if 'name' in query:
+                name = os.path.basename(query['name'][0])
+                if length > self.server.max_upload_mb * 1024 ** 2:
+                    return self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                       f"Uploads are limited to {self.server.max_upload_mb:,} MB")
+                path, file_hash = service.store_upload(self.rfile, length, name)
+                owned = True
+            else:
+                try:
+                    request = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    return self._error(HTTPStatus.BAD_REQUEST, "The body must be JSON or the request must have ?name=")
+                if not isinstance(request, dict) or not request.get('path'):
+                    return self._error(HTTPStatus.BAD_REQUEST, "Send {\"path\": ...} or upload a file with ?name=")
+                path = service.resolve_path(request['path'])
+                name = os.path.basename(path)
+                file_hash = service.hash_path(path)
+                owned = False
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+
+        file_extension, _ = app.split_file_name(name)
+        if file_extension not in app.DATA_FILE_TYPES:
+            if owned:
+                os.remove(path)
+            return self._error(HTTPStatus.BAD_REQUEST, "Unsupported file format. Please send CSV, Excel or Parquet files.")
+
+        job, status = service.submit(path, name, file_hash, owned)
+        if job is None:
+            return self._error(status, f"The queue is full ({service.max_queue} jobs); retry later",
+                               headers={'Retry-After': '5'})
+        self._send(status, job, headers={'Location': f"/jobs/{job['job_id']}"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = parse_qs(url.query)
+        service = self.server.service
+
+        if parts == ['health']:
+            return self._send(HTTPStatus.OK, {
+                'workers': service.workers,
+                'active_jobs': len(service._active),
+                'max_queue': service.max_queue,
+                'cached_results': len(service._results)
+            })
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            if len(parts) == 3 and parts[2] == 'events':
+                return self._stream_events(parts[1])
+            job = service.get_job(parts[1]) if len(parts) == 2 else None
+            if job is None:
+                return self._error(HTTPStatus.NOT_FOUND, "Unknown job")
+            return self._send(HTTPStatus.OK, job)
+        if len(parts) == 2 and parts[0] == 'profiles':
+            return self._send_profile(parts[1], query)
+        self._error(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+
+    def _send_profile(self, file_hash, query):
+        result = self.server.service.get_result(file_hash)
+        if result is None:
+            return self._error(HTTPStatus.NOT_FOUND, "No profile for this file hash")
+        output_format = query.get('format', ['json'])[0]
+        if output_format == 'json':
+            return self._send(HTTPStatus.OK, result['json'])
+        if output_format != 'arrow':
+            return self._error(HTTPStatus.BAD_REQUEST, "format must be 'json' or 'arrow'")
+
+        table = query.get('table', [None])[0]
+        if table not in ARROW_TABLES:
+            return self._error(HTTPStatus.BAD_REQUEST, f"table must be one of {', '.join(ARROW_TABLES)}")
+        frame = result['profile'][ARROW_TABLES[table]]
+        if frame is None:
+            return self._error(HTTPStatus.NOT_FOUND, f"This profile has no {table} table")
+        self._send(HTTPStatus.OK, frame_to_arrow(frame), content_type=ARROW_MEDIA_TYPE)
+
+    def _stream_events(self, job_id):
+        """Write a JSON line per job update until the job finishes or the client leaves"""
+        service = self.server.service
+        job = service.get_job(job_id)
+        if job is None:
+            return self._error(HTTPStatus.NOT_FOUND, "Unknown job")
+
+        # HTTP/1.0 without Content-Length: the body ends when the connection closes
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True
+        version = -1
+        try:
+            while job is not None:
+                job, version = service.wait_for_change(job_id, version)
+                if job is None:
+                    break
+                self.wfile.write(json.dumps(job, default=app._to_builtin).encode() + b'\n')
+                self.wfile.flush()
+                if job['status'] in ('done', 'failed'):
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def create_server(host='127.0.0.1', port=DEFAULT_PORT, max_upload_mb=DEFAULT_MAX_UPLOAD_MB, verbose=False, **service_options):
+    """
+    Create the HTTP server and its profiling service
+
+    Args:
+        host: interface to bind; the default only accepts local connections
+        port: TCP port (0 picks a free one)
+        max_upload_mb: largest accepted upload
+        verbose: log every request
+        service_options: keyword arguments for ProfilingService
+
+    Returns:
+        ThreadingHTTPServer with a `service` attribute
+    """
+    server = ThreadingHTTPServer((host, port), ProfileRequestHandler)
+    server.daemon_threads = True
+    server.service = ProfilingService(**service_options)
+    server.max_upload_mb = max_upload_mb
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve data profiles over a local HTTP API")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Jobs profiled at the same time")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Queued and running jobs before new ones are refused")
+    parser.add_argument('--cache-entries', type=int, default=DEFAULT_CACHE_ENTRIES, help="Profiles kept in memory")
+    parser.add_argument('--cache-dir', default=app.PROFILE_CACHE_DIR, help="Profile cache directory (shared with the app)")
+    parser.add_argument('--job-memory-mb', type=float, default=app.SESSION_MEMORY_BUDGET_MB,
+                        help="Memory budget per job (0 for no limit)")
+    parser.add_argument('--data-root', help="Only profile server-side paths under this directory (default: the working directory)")
+    parser.add_argument('--max-upload-mb', type=int, default=DEFAULT_MAX_UPLOAD_MB, help="Largest accepted upload")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+
+    server = create_server(
+        args.host, args.port, max_upload_mb=args.max_upload_mb, verbose=args.verbose, workers=args.workers,
+        max_queue=args.max_queue, cache_entries=args.cache_entries, cache_dir=args.cache_dir,
+        job_memory_mb=args.job_memory_mb, data_root=args.data_root
+    )
+    app.start_prewarm()
+    print(f"Profiling service on http://{args.host}:{server.server_address[1]} "
+          f"({args.workers} workers, cache: {args.cache_dir})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()